@@ -13,7 +13,10 @@ Cloud Object Storage or any other S3 compatible object storage can be used.
 This module allows a Streams application to create objects in parquet format :py:class:`WriteParquet <WriteParquet>` or
 to write string messages with :py:class:`Write <Write>` from a stream
 of tuples.
-Objects can be listed with :py:class:`Scan <Scan>` and read with :py:class:`Read <Read>`.
+Objects can be listed with :py:class:`Scan <Scan>` and read with :py:class:`Read <Read>`, or with :py:class:`ParallelRead <ParallelRead>` by several readers in parallel.
+Objects in parquet format are read with :py:class:`ReadParquet <ReadParquet>`.
+Small objects are merged into large objects with :py:class:`Compact <Compact>`.
+Objects are copied to another bucket with server-side copy by :py:class:`Copy <Copy>` and :py:class:`Sync <Sync>`.
 
 Credentials
 +++++++++++
@@ -64,6 +67,12 @@ To access any other Amazon S3 compatible object storage server you need set the
 
     endpoint='play.min.io:9000'
 
+For development and load tests without network latency or request charges, :py:class:`LocalObjectStorage <LocalObjectStorage>` serves the buckets in a local directory with an S3 compatible server running in the Python process. Set its ``endpoint`` and ``credentials`` with ``ssl_enabled=False`` to run a topology in standalone mode against local disk::
+
+    with cos.LocalObjectStorage('/tmp/cos', buckets=['sample']) as local:
+        scanned = topo.source(cos.Scan(bucket='sample', endpoint=local.endpoint, credentials=local.credentials, ssl_enabled=False))
+        submit('STANDALONE', topo)
+
 Sample
 ++++++
 
@@ -106,6 +115,7 @@ an object. Scan for created object and read the content::
 
 __version__='1.5.6'
 
-__all__ = ['Scan', 'Read', 'Write', 'WriteParquet', 'download_toolkit', 'configure_connection', 'scan', 'read', 'write', 'write_parquet']
-from streamsx.objectstorage._objectstorage import Scan, Read, Write, WriteParquet, download_toolkit, configure_connection, scan, read, write, write_parquet
+__all__ = ['Scan', 'Read', 'ParallelRead', 'ReadParquet', 'Write', 'WriteParquet', 'Compact', 'Copy', 'Sync', 'LocalObjectStorage', 'download_toolkit', 'configure_connection', 'scan', 'read', 'write', 'write_parquet']
+from streamsx.objectstorage._objectstorage import Scan, Read, ParallelRead, ReadParquet, Write, WriteParquet, Compact, Copy, Sync, download_toolkit, configure_connection, scan, read, write, write_parquet
+from streamsx.objectstorage._local import LocalObjectStorage
 
@@ -0,0 +1,880 @@
+# coding=utf-8
+# Licensed Materials - Property of IBM
+# Copyright IBM Corp. 2020
+
+# Callables executed as Python operators by the composites.
+# Dependencies (pyarrow, boto3) are imported in the processing element only.
+
+import base64
+import bz2
+import concurrent.futures
+import gzip
+import json
+import logging
+import operator
+import re
+import threading
+import time
+import uuid
+import zlib
+
+import streamsx.objectstorage._s3 as _s3
+
+_FILTER_OPS = {
+    '=': operator.eq,
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': lambda value, values: value in values,
+}
+
+
+def _check_filters(filters):
+    if filters is None:
+        return []
+    result = []
+    for f in filters:
+        if not isinstance(f, (tuple, list)) or len(f) != 3:
+            raise TypeError(f)
+        column, op, value = f
+        if op not in _FILTER_OPS:
+            raise ValueError("Invalid filter operator '" + str(op) + "'. Supported operators: " + ', '.join(_FILTER_OPS))
+        result.append((column, op, value))
+    return result
+
+
+def _range_matches(op, value, min_value, max_value):
+    # False only if no value in [min_value, max_value] can satisfy the predicate
+    try:
+        if op in ('=', '=='):
+            return min_value <= value <= max_value
+        if op == '<':
+            return min_value < value
+        if op == '<=':
+            return min_value <= value
+        if op == '>':
+            return max_value > value
+        if op == '>=':
+            return max_value >= value
+        if op == 'in':
+            return any(min_value <= v <= max_value for v in value)
+    except TypeError:
+        pass
+    return True
+
+
+def _row_group_matches(row_group, filters):
+    """Checks the min/max statistics of a parquet row group against the filters."""
+    if not filters:
+        return True
+    stats = {}
+    for i in range(row_group.num_columns):
+        column = row_group.column(i)
+        stats[column.path_in_schema] = column.statistics
+    for column, op, value in filters:
+        s = stats.get(column)
+        if s is None or not s.has_min_max:
+            continue
+        if not _range_matches(op, value, s.min, s.max):
+            return False
+    return True
+
+
+def _row_matches(row, filters):
+    for column, op, value in filters:
+        v = row.get(column)
+        if v is None or not _FILTER_OPS[op](v, value):
+            return False
+    return True
+
+
+def _join_lines(batch):
+    # a batch of lines is appended to the object with a single tuple
+    if isinstance(batch, str):
+        return batch
+    if not batch:
+        return None
+    return '\n'.join(batch)
+
+
+def _iter_lines(body, chunk_size=1024*1024):
+    # yields the byte offset and the content of each line without line terminator
+    offset = 0
+    pending = b''
+    for chunk in iter(lambda: body.read(chunk_size), b''):
+        lines = (pending + chunk).split(b'\n')
+        pending = lines.pop()
+        for line in lines:
+            yield offset, line[:-1] if line.endswith(b'\r') else line
+            offset += len(line) + 1
+    if pending:
+        yield offset, pending[:-1] if pending.endswith(b'\r') else pending
+
+
+def _detect_compression(head):
+    # codec of an object from its first bytes, None for uncompressed content
+    if head.startswith(b'\x1f\x8b\x08'):
+        return 'gzip'
+    if head.startswith(b'BZh') and head[3:4] in [b'1', b'2', b'3', b'4', b'5', b'6', b'7', b'8', b'9']:
+        return 'bz2'
+    if head.startswith(b'\x28\xb5\x2f\xfd'):
+        return 'zstd'
+    return None
+
+
+class _Prefixed(object):
+    # body returning the bytes read ahead to detect the compression first
+    def __init__(self, head, body):
+        self._head = head
+        self._body = body
+
+    def read(self, size=-1):
+        if not self._head:
+            return self._body.read() if size is None or size < 0 else self._body.read(size)
+        if size is None or size < 0:
+            data = self._head + self._body.read()
+            self._head = b''
+        else:
+            data = self._head[:size]
+            self._head = self._head[size:]
+        return data
+
+    def close(self):
+        self._body.close()
+
+
+def _decompressed(body, compression):
+    # streams the decompressed content, concatenated gzip members,
+    # bz2 streams and zstd frames as created by appends are read in sequence
+    if compression == 'auto':
+        head = body.read(4)
+        compression = _detect_compression(head)
+        body = _Prefixed(head, body)
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=body, mode='rb')
+    if compression == 'bz2':
+        return bz2.BZ2File(body, mode='rb')
+    if compression == 'zstd':
+        import zstandard
+        return zstandard.ZstdDecompressor().stream_reader(body, read_across_frames=True)
+    return body
+
+
+def _compressor(compression):
+    if compression == 'gzip':
+        return zlib.compressobj(wbits=31)
+    if compression == 'bz2':
+        return bz2.BZ2Compressor()
+    import zstandard
+    return zstandard.ZstdCompressor().compressobj()
+
+
+class _ObjectReader(object):
+    def __init__(self, bucket, endpoint, credentials, ssl_enabled):
+        self.bucket = bucket
+        self.endpoint = endpoint
+        self.credentials = credentials
+        self.ssl_enabled = ssl_enabled
+
+    def __enter__(self):
+        self._client = _s3.create_client(self.endpoint, self.credentials, self.ssl_enabled)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+class _LineReader(_ObjectReader):
+    def __init__(self, bucket, endpoint, credentials, ssl_enabled, encoding, compression=None, structured=True):
+        super(_LineReader, self).__init__(bucket, endpoint, credentials, ssl_enabled)
+        self.encoding = encoding
+        self.compression = compression
+        self.structured = structured
+
+    def _open(self, object_name):
+        body = self._client.get_object(Bucket=self.bucket, Key=_s3._object_key(object_name))['Body']
+        return body if self.compression is None else _decompressed(body, self.compression)
+
+    def __call__(self, object_name):
+        # offsets are positions in the decompressed content
+        for line_number, (offset, line) in enumerate(_iter_lines(self._open(object_name)), start=1):
+            line = line.decode(self.encoding, errors='replace')
+            yield {'object_name': object_name, 'line_number': line_number, 'offset': offset, 'line': line} if self.structured else line
+
+
+class _BatchReader(_LineReader):
+    def __init__(self, bucket, endpoint, credentials, ssl_enabled, encoding, batch_lines, batch_bytes, compression=None):
+        super(_BatchReader, self).__init__(bucket, endpoint, credentials, ssl_enabled, encoding, compression)
+        self.batch_lines = batch_lines
+        self.batch_bytes = batch_bytes
+
+    def _full(self, lines, size, line):
+        if self.batch_lines is not None and len(lines) >= self.batch_lines:
+            return True
+        return self.batch_bytes is not None and size + len(line) > self.batch_bytes
+
+    def _batch(self, object_name, lines):
+        if self.batch_bytes is None:
+            return [line.decode(self.encoding, errors='replace') for line in lines]
+        # lines separated by a newline, offsets are the start of each line in the blob
+        offsets = []
+        position = 0
+        for line in lines:
+            offsets.append(position)
+            position += len(line) + 1
+        return {'object_name': object_name, 'data': b'\n'.join(lines), 'offsets': offsets}
+
+    def __call__(self, object_name):
+        # consecutive lines of an object, a batch is emitted when it is full
+        # or the object ends, a single line larger than batch_bytes is a batch
+        lines = []
+        size = 0
+        for offset, line in _iter_lines(self._open(object_name)):
+            if lines and self._full(lines, size, line):
+                yield self._batch(object_name, lines)
+                lines = []
+                size = 0
+            lines.append(line)
+            size += len(line) + 1
+        if lines:
+            yield self._batch(object_name, lines)
+
+
+def _wait(seconds):
+    # returns True when the processing element is shut down
+    import streamsx.ec
+    return streamsx.ec.shutdown().wait(seconds)
+
+
+def _shutting_down():
+    import streamsx.ec
+    return streamsx.ec.shutdown().is_set()
+
+
+def _not_found(e):
+    return getattr(e, 'response', {}).get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound')
+
+
+def _invalid_range(e):
+    return getattr(e, 'response', {}).get('Error', {}).get('Code') in ('416', 'InvalidRange')
+
+
+class _ObjectScanner(_ObjectReader):
+    def __init__(self, bucket, endpoint, credentials, ssl_enabled, directory, pattern, sleep_time, max_sleep_time, init_delay, strict_mode, recursive=False, max_depth=None, listing_threads=1, manifest=None, metadata=False):
+        super(_ObjectScanner, self).__init__(bucket, endpoint, credentials, ssl_enabled)
+        self.directory = directory
+        self.pattern = pattern
+        self.sleep_time = sleep_time
+        self.max_sleep_time = max_sleep_time
+        self.init_delay = init_delay
+        self.strict_mode = strict_mode
+        self.recursive = recursive
+        self.max_depth = max_depth
+        self.listing_threads = listing_threads
+        self.manifest = manifest
+        self.metadata = metadata
+        # object key -> (ETag, last modified)
+        self._seen = {}
+        self._start_after = None
+
+    def _prefix(self):
+        prefix = _s3._object_key(self.directory).rstrip('/')
+        return prefix + '/' if prefix else ''
+
+    def _list_directory(self, prefix):
+        # objects and subdirectory prefixes of a single directory
+        objects = []
+        prefixes = []
+        args = {'Bucket': self.bucket, 'Prefix': prefix, 'Delimiter': '/'}
+        if self._start_after is not None:
+            args['StartAfter'] = self._start_after
+        while True:
+            page = self._client.list_objects_v2(**args)
+            objects.extend(page.get('Contents', []))
+            prefixes.extend(p['Prefix'] for p in page.get('CommonPrefixes', []))
+            if not page.get('IsTruncated'):
+                return objects, prefixes
+            args['ContinuationToken'] = page['NextContinuationToken']
+
+    def _list(self, prefix):
+        if not self.recursive:
+            for o in self._list_directory(prefix)[0]:
+                yield o
+            return
+        # sibling directories of a level are listed concurrently,
+        # the number of sequential listings grows with the depth only
+        directories = [prefix]
+        depth = 0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.listing_threads) as executor:
+            while directories:
+                subdirectories = []
+                for objects, prefixes in executor.map(self._list_directory, directories):
+                    for o in objects:
+                        yield o
+                    subdirectories.extend(prefixes)
+                depth += 1
+                if self.max_depth is not None and depth > self.max_depth:
+                    return
+                directories = subdirectories
+
+    def _load_manifest(self):
+        # any failure other than a missing manifest would emit all objects again
+        try:
+            body = self._client.get_object(Bucket=self.bucket, Key=_s3._object_key(self.manifest))['Body'].read()
+        except Exception as e:
+            if not _not_found(e):
+                raise
+            logging.getLogger(__name__).info('Scan manifest %s not found, scanning all objects.', self.manifest)
+            return
+        try:
+            manifest = json.loads(gzip.decompress(body).decode('utf-8'))
+            seen = {key: tuple(value) for key, value in manifest['objects'].items()}
+        except (OSError, EOFError, ValueError, KeyError, TypeError, AttributeError) as e:
+            raise ValueError('Scan manifest ' + self.manifest + ' is corrupt, delete it to scan all objects.') from e
+        self._seen = seen
+        self._start_after = manifest.get('start_after')
+
+    def _save_manifest(self):
+        manifest = {'start_after': max(self._seen) if self._seen else None, 'objects': self._seen}
+        body = gzip.compress(json.dumps(manifest, separators=(',', ':')).encode('utf-8'))
+        self._client.put_object(Bucket=self.bucket, Key=_s3._object_key(self.manifest), Body=body)
+
+    def _scan(self):
+        """Emits the new or modified objects of a single listing."""
+        prefix = self._prefix()
+        pattern = re.compile(self.pattern)
+        manifest_key = None if self.manifest is None else _s3._object_key(self.manifest)
+        # a listing after the last known key only adds objects
+        listed = {} if self._start_after is None else dict(self._seen)
+        for o in self._list(prefix):
+            key = o['Key']
+            if key == manifest_key or not pattern.fullmatch(key[len(prefix):]):
+                continue
+            last_modified = o.get('LastModified')
+            listed[key] = (o.get('ETag'), None if last_modified is None else str(last_modified))
+            if key not in self._seen or self._seen[key][0] != listed[key][0]:
+                yield o
+        self._start_after = None
+        # forget deleted objects
+        changed = listed != self._seen
+        self._seen = listed
+        if changed and self.manifest is not None:
+            self._save_manifest()
+
+    def _next_sleep_time(self, sleep_time, found):
+        # poll fast while objects arrive, back off exponentially while idle
+        if found:
+            return self.sleep_time
+        return min(sleep_time * 2, self.max_sleep_time)
+
+    def _object(self, o):
+        if not self.metadata:
+            return '/' + o['Key']
+        # attributes returned by the listing, no extra request per object
+        last_modified = o.get('LastModified')
+        return {'object_name': '/' + o['Key'], 'size': o.get('Size'), 'etag': o.get('ETag', '').strip('"'), 'last_modified': None if last_modified is None else last_modified.timestamp(), 'storage_class': o.get('StorageClass')}
+
+    def _scanned(self):
+        # tuples emitted by subclasses after each scan
+        return ()
+
+    def __call__(self):
+        if self.init_delay and _wait(self.init_delay):
+            return
+        sleep_time = self.sleep_time
+        while self.manifest is not None:
+            try:
+                self._load_manifest()
+                break
+            except Exception:
+                if self.strict_mode:
+                    raise
+                logging.getLogger(__name__).warning('Loading scan manifest %s failed, retrying in %s seconds.', self.manifest, sleep_time, exc_info=True)
+            if _wait(sleep_time):
+                return
+            sleep_time = self._next_sleep_time(sleep_time, False)
+        sleep_time = self.sleep_time
+        while True:
+            found = False
+            try:
+                for o in self._scan():
+                    found = True
+                    yield self._object(o)
+                for t in self._scanned():
+                    yield t
+            except Exception:
+                if self.strict_mode:
+                    raise
+                logging.getLogger(__name__).warning('Scan of %s failed, retrying in %s seconds.', self.directory, sleep_time, exc_info=True)
+            sleep_time = self._next_sleep_time(sleep_time, found)
+            if _wait(sleep_time):
+                return
+
+
+class _ObjectSplitter(_ObjectReader):
+    def __init__(self, bucket, endpoint, credentials, ssl_enabled, split_size):
+        super(_ObjectSplitter, self).__init__(bucket, endpoint, credentials, ssl_enabled)
+        self.split_size = split_size
+
+    def __call__(self, tuple_):
+        # object name or tuple with the object_name and size listed by Scan
+        if isinstance(tuple_, dict):
+            object_name = tuple_['object_name']
+            size = tuple_.get('size')
+        else:
+            object_name = tuple_
+            size = None
+        if size is None:
+            size = self._client.head_object(Bucket=self.bucket, Key=_s3._object_key(object_name))['ContentLength']
+        for start in range(0, max(size, 1), self.split_size):
+            yield {'object_name': object_name, 'start': start, 'end': min(start + self.split_size, size), 'size': size}
+
+
+class _RangeLineReader(_LineReader):
+    # bytes requested after the end of a split for the line crossing the end
+    _SLACK = 64 * 1024
+
+    def __init__(self, bucket, endpoint, credentials, ssl_enabled, encoding, structured):
+        super(_RangeLineReader, self).__init__(bucket, endpoint, credentials, ssl_enabled, encoding, structured=structured)
+
+    def _ranges(self, object_name, begin, end, size, chunk_size=1024*1024):
+        # content of bounded ranged GETs, the first one covers [begin, end + slack),
+        # the following ones are requested only while the consumer needs more bytes
+        key = _s3._object_key(object_name)
+        position = begin
+        length = end + self._SLACK - begin
+        while size is None or position < size:
+            last = position + length - 1 if size is None else min(position + length, size) - 1
+            try:
+                body = self._client.get_object(Bucket=self.bucket, Key=key, Range='bytes=%d-%d' % (position, last))['Body']
+            except Exception as e:
+                if _invalid_range(e):
+                    return
+                raise
+            received = 0
+            try:
+                for chunk in iter(lambda: body.read(chunk_size), b''):
+                    received += len(chunk)
+                    yield chunk
+            finally:
+                body.close()
+            if received <= last - position:
+                return
+            position += received
+            length = self._SLACK
+
+    def _line(self, object_name, offset, line):
+        line = (line[:-1] if line.endswith(b'\r') else line).decode(self.encoding, errors='replace')
+        return {'object_name': object_name, 'offset': offset, 'line': line} if self.structured else line
+
+    def __call__(self, split):
+        # emits the lines starting in [start, end), a line crossing end is read
+        # to its terminator, the partial line at start belongs to the previous split
+        object_name, start, end = split['object_name'], split['start'], split['end']
+        if start >= end:
+            return
+        offset = max(start - 1, 0)
+        pending = b''
+        chunks = self._ranges(object_name, offset, end, split.get('size'))
+        try:
+            for chunk in chunks:
+                lines = (pending + chunk).split(b'\n')
+                pending = lines.pop()
+                for line in lines:
+                    if offset >= start:
+                        yield self._line(object_name, offset, line)
+                    offset += len(line) + 1
+                    if offset >= end:
+                        return
+        finally:
+            chunks.close()
+        if pending and offset >= start:
+            yield self._line(object_name, offset, pending)
+
+
+class _CompressedWriter(_ObjectReader):
+    # attributes of the processing element not saved by a checkpoint
+    _RUNTIME_ATTRIBUTES = ['_client', '_lock', '_writer', '_timer', '_compressor', '_tuples', '_object']
+
+    def __init__(self, bucket, endpoint, credentials, ssl_enabled, object, compression, header, time_per_object, bytes_per_object, tuples_per_object, consistent=False):
+        super(_CompressedWriter, self).__init__(bucket, endpoint, credentials, ssl_enabled)
+        self.object = object
+        self.compression = compression
+        self.header = header
+        self.time_per_object = time_per_object
+        self.bytes_per_object = bytes_per_object
+        self.tuples_per_object = tuples_per_object
+        self.consistent = consistent
+        # restored from the checkpoint, tuples replayed after a reset are
+        # written to the object names they were written to before
+        self._object_number = 0
+
+    def __enter__(self):
+        super(_CompressedWriter, self).__enter__()
+        # the rollover timer closes objects concurrently to the tuple submission
+        self._lock = threading.Lock()
+        self._writer = None
+        self._timer = None
+        self._object = self.object
+        if '%CHANNEL' in self._object:
+            import streamsx.ec
+            self._object = self._object.replace('%CHANNEL', str(streamsx.ec.channel(self)))
+        if self.consistent:
+            self._abort_uploads(self._object_name())
+
+    def __getstate__(self):
+        # the region is drained when the checkpoint is taken, the object with
+        # the tuples processed since the previous checkpoint is completed
+        if getattr(self, '_lock', None) is not None:
+            with self._lock:
+                if self._writer is not None:
+                    self._close()
+        return {k: v for k, v in self.__dict__.items() if k not in self._RUNTIME_ATTRIBUTES}
+
+    def _object_name(self):
+        return self._object.replace('%OBJECTNUM', str(self._object_number))
+
+    def _abort_uploads(self, name):
+        # parts uploaded after the checkpoint the region is reset to
+        key = _s3._object_key(name)
+        uploads = self._client.list_multipart_uploads(Bucket=self.bucket, Prefix=key).get('Uploads', [])
+        for upload in uploads:
+            if upload['Key'] == key:
+                self._client.abort_multipart_upload(Bucket=self.bucket, Key=key, UploadId=upload['UploadId'])
+
+    def _write(self, data):
+        self._writer.write(self._compressor.compress(data))
+
+    def _open(self):
+        name = self._object_name()
+        self._object_number += 1
+        # content is uploaded in parts while the object is written
+        self._writer = _s3.ObjectWriter(self._client, self.bucket, name)
+        self._compressor = _compressor(self.compression)
+        self._tuples = 0
+        if self.header is not None:
+            self._write((self.header + '\n').encode('utf-8'))
+        if self.time_per_object is not None:
+            self._timer = threading.Timer(self.time_per_object, self._expire, [self._writer])
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _close(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        writer, self._writer = self._writer, None
+        writer.write(self._compressor.flush())
+        writer.close()
+
+    def _expire(self, writer):
+        with self._lock:
+            if self._writer is writer:
+                self._close()
+
+    def __call__(self, line):
+        with self._lock:
+            if self._writer is None:
+                self._open()
+            self._write((line + '\n').encode('utf-8'))
+            self._tuples += 1
+            # compressed size, the compressor holds back data of the current block
+            if (self.tuples_per_object is not None and self._tuples >= self.tuples_per_object) or (self.bytes_per_object is not None and self._writer.tell() >= self.bytes_per_object):
+                self._close()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        with self._lock:
+            if self._writer is None:
+                return
+            # in a consistent region the operator is closed on a reset too, the tuples
+            # written since the last checkpoint are replayed after the reset
+            if exc_type is None and (not self.consistent or _shutting_down()):
+                self._close()
+                return
+            if self._timer is not None:
+                self._timer.cancel()
+            self._writer.abort()
+            self._writer = None
+
+
+_COMPACTED_PREFIX = 'compacted-'
+# user metadata of a compacted object with the names of the merged objects,
+# the user metadata of an object is limited to 2 KB
+_COMPACTED_SOURCES = 'compacted-sources'
+_COMPACTED_SOURCES_SIZE = 1800
+
+
+def _encode_sources(basenames):
+    return base64.b64encode(zlib.compress('\n'.join(basenames).encode('utf-8'))).decode('ascii')
+
+
+def _decode_sources(value):
+    return zlib.decompress(base64.b64decode(value)).decode('utf-8').split('\n')
+
+
+class _Compactor(_ObjectScanner):
+    def __init__(self, bucket, endpoint, credentials, ssl_enabled, directory, pattern, sleep_time, max_sleep_time, recursive, listing_threads, target_size, max_age, format, parquet_compression):
+        super(_Compactor, self).__init__(bucket, endpoint, credentials, ssl_enabled, directory, pattern, sleep_time, max_sleep_time, None, False, recursive, listing_threads=listing_threads, metadata=True)
+        self.target_size = target_size
+        self.max_age = max_age
+        self.format = format
+        self.parquet_compression = parquet_compression
+        # small objects per directory not compacted yet (name -> size) and the time the first
+        # one was found, rebuilt by the listing of all objects after a restart
+        self._pending = {}
+        self._pending_since = {}
+        self._deleting = []
+        # objects merged into the compacted objects found by the scans
+        self._covered = set()
+
+    def _object_name(self, directory, names):
+        if self.format == 'parquet':
+            extension = '.parquet'
+        else:
+            stem, dot, ext = names[0].rpartition('/')[2].rpartition('.')
+            extension = dot + ext if stem else ''
+        return '%s/%s%s-%s%s' % (directory, _COMPACTED_PREFIX, time.strftime('%Y%m%d%H%M%S', time.gmtime()), uuid.uuid4().hex[:8], extension)
+
+    def _merge_raw(self, f, names, chunk_size=8*1024*1024):
+        # content is streamed in chunks, a missing line terminator at the end is added
+        for name in names:
+            body = self._client.get_object(Bucket=self.bucket, Key=_s3._object_key(name))['Body']
+            last = b'\n'
+            try:
+                for chunk in iter(lambda: body.read(chunk_size), b''):
+                    f.write(chunk)
+                    last = chunk[-1:]
+            finally:
+                body.close()
+            if last != b'\n':
+                f.write(b'\n')
+
+    def _merge_parquet(self, f, names):
+        import pyarrow.parquet as pq
+        writer = None
+        for name in names:
+            with _s3.ObjectFile(self._client, self.bucket, name) as src:
+                table = pq.read_table(src)
+            if writer is None:
+                writer = pq.ParquetWriter(f, table.schema, compression=self.parquet_compression)
+            writer.write_table(table)
+        writer.close()
+
+    @staticmethod
+    def _sources(names):
+        # leading names whose list fits into the user metadata of the compacted object
+        count = len(names)
+        while count > 1:
+            size = len(_encode_sources([n.rpartition('/')[2] for n in names[:count]]))
+            if size <= _COMPACTED_SOURCES_SIZE:
+                break
+            count = min(count - 1, count * _COMPACTED_SOURCES_SIZE // size)
+        return names[:max(count, 1)]
+
+    def _compact(self, directory, names):
+        # the merged object is visible once complete, the originals are deleted afterwards,
+        # originals left by a failed delete are deleted when the object is found by a scan
+        object_name = self._object_name(directory, names)
+        metadata = {_COMPACTED_SOURCES: _encode_sources([n.rpartition('/')[2] for n in names])}
+        with _s3.ObjectWriter(self._client, self.bucket, object_name, metadata=metadata) as f:
+            if self.format == 'parquet':
+                self._merge_parquet(f, names)
+            else:
+                self._merge_raw(f, names)
+        return object_name
+
+    def _delete(self):
+        # the merged objects stay visible next to the compacted object until deleted
+        names, self._deleting = self._deleting, []
+        try:
+            _s3.delete_objects(self._client, self.bucket, names)
+        except Exception:
+            logging.getLogger(__name__).warning('Deleting %d compacted objects failed, retrying after the next scan.', len(names), exc_info=True)
+            self._deleting.extend(names)
+            return
+        # an object created again with the same name is compacted again
+        self._covered.difference_update(names)
+
+    def _remove_pending(self, directory, names):
+        pending = self._pending.get(directory, {})
+        for name in names:
+            pending.pop(name, None)
+        if directory in self._pending and not pending:
+            del self._pending[directory]
+            del self._pending_since[directory]
+
+    def _flush(self, directory):
+        # the pending objects are kept when the compaction fails and retried after the next scan
+        names = self._sources(sorted(self._pending[directory]))
+        object_name = self._compact(directory, names)
+        self._remove_pending(directory, names)
+        self._covered.update(names)
+        self._deleting.extend(names)
+        self._delete()
+        return object_name
+
+    def _add_compacted(self, object_name):
+        head = self._client.head_object(Bucket=self.bucket, Key=_s3._object_key(object_name))
+        value = head.get('Metadata', {}).get(_COMPACTED_SOURCES)
+        if value is None:
+            return
+        directory = object_name.rpartition('/')[0]
+        names = [directory + '/' + basename for basename in _decode_sources(value)]
+        self._covered.update(names)
+        # originals found before the compacted object by the same scan
+        pending = [name for name in names if name in self._pending.get(directory, {}) and name[1:] not in self._seen]
+        self._deleting.extend(pending)
+        self._remove_pending(directory, pending)
+
+    def _add(self, object_name, size):
+        directory, _, basename = object_name.rpartition('/')
+        if basename.startswith(_COMPACTED_PREFIX):
+            self._add_compacted(object_name)
+            return
+        if object_name in self._covered:
+            if object_name[1:] not in self._seen:
+                # merged before a failed delete and a restart
+                self._deleting.append(object_name)
+                return
+            # modified after it was merged
+            self._covered.discard(object_name)
+        if size >= self.target_size:
+            return
+        # objects of a failed scan are listed again
+        self._pending.setdefault(directory, {})[object_name] = size
+        self._pending_since.setdefault(directory, time.monotonic())
+
+    def _object(self, o):
+        o = super(_Compactor, self)._object(o)
+        self._add(o['object_name'], o['size'])
+        return None
+
+    def _scanned(self):
+        # compaction runs after a complete scan that found all compacted objects, directories
+        # that do not reach target_size within max_age are compacted as they are, a single
+        # small object is left unchanged
+        self._covered = set(name for name in self._covered if name[1:] in self._seen)
+        if self._deleting:
+            self._delete()
+        now = time.monotonic()
+        for directory, since in list(self._pending_since.items()):
+            # objects deleted since they were found
+            self._remove_pending(directory, [n for n in self._pending[directory] if n[1:] not in self._seen])
+            pending = self._pending.get(directory)
+            if pending is None:
+                continue
+            if sum(pending.values()) >= self.target_size or (now - since >= self.max_age and len(pending) > 1):
+                yield self._flush(directory)
+
+
+_MAX_PARTS = 10000
+_COPIED_HEADERS = ['ContentType', 'ContentEncoding', 'CacheControl', 'ContentDisposition', 'ContentLanguage']
+
+
+class _Copier(_ObjectReader):
+    def __init__(self, bucket, endpoint, credentials, ssl_enabled, target_bucket, directory, target_directory, part_size, max_concurrency, skip_unchanged):
+        super(_Copier, self).__init__(bucket, endpoint, credentials, ssl_enabled)
+        self.target_bucket = target_bucket
+        self.directory = directory
+        self.target_directory = target_directory
+        self.part_size = part_size
+        self.max_concurrency = max_concurrency
+        self.skip_unchanged = skip_unchanged
+
+    def _target_name(self, object_name):
+        if self.target_directory is None:
+            return object_name
+        directory = '/' + _s3._object_key(self.directory or '/').rstrip('/')
+        name = '/' + _s3._object_key(object_name)
+        if directory != '/' and not name.startswith(directory + '/'):
+            raise ValueError("Object " + object_name + " is not in directory " + self.directory)
+        relative = name[len(directory):].lstrip('/')
+        return '/' + _s3._object_key(self.target_directory).rstrip('/') + '/' + relative
+
+    def _unchanged(self, key, etag):
+        try:
+            head = self._client.head_object(Bucket=self.target_bucket, Key=key)
+        except Exception as e:
+            if _not_found(e):
+                return False
+            raise
+        # multipart copies have a different ETag, the source ETag is kept in the metadata
+        return head['ETag'].strip('"') == etag or head.get('Metadata', {}).get('source-etag') == etag
+
+    @staticmethod
+    def _copied_attributes(head, etag):
+        # content headers and user metadata of the source, replaced to add the source ETag
+        attributes = {name: head[name] for name in _COPIED_HEADERS if head.get(name)}
+        attributes['Metadata'] = dict(head.get('Metadata', {}), **{'source-etag': etag})
+        return attributes
+
+    def _copy_multipart(self, source, key, size, etag, attributes):
+        # larger parts for objects that would need more than the maximum number of parts
+        part_size = max(self.part_size, -(-size // _MAX_PARTS))
+        upload_id = self._client.create_multipart_upload(Bucket=self.target_bucket, Key=key, **attributes)['UploadId']
+
+        def copy_part(number):
+            start = (number - 1) * part_size
+            end = min(start + part_size, size) - 1
+            result = self._client.upload_part_copy(Bucket=self.target_bucket, Key=key, UploadId=upload_id, PartNumber=number, CopySource=source, CopySourceIfMatch='"' + etag + '"', CopySourceRange='bytes=%d-%d' % (start, end))
+            return {'PartNumber': number, 'ETag': result['CopyPartResult']['ETag']}
+
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                parts = list(executor.map(copy_part, range(1, (size + part_size - 1) // part_size + 1)))
+            self._client.complete_multipart_upload(Bucket=self.target_bucket, Key=key, UploadId=upload_id, MultipartUpload={'Parts': parts})
+        except Exception:
+            self._client.abort_multipart_upload(Bucket=self.target_bucket, Key=key, UploadId=upload_id)
+            raise
+
+    def __call__(self, tuple_):
+        # object name or tuple with object_name, size and etag listed by Scan
+        if isinstance(tuple_, dict):
+            object_name, size, etag = tuple_['object_name'], tuple_.get('size'), tuple_.get('etag')
+        else:
+            object_name, size, etag = tuple_, None, None
+        target = self._target_name(object_name)
+        key = _s3._object_key(target)
+        source = {'Bucket': self.bucket, 'Key': _s3._object_key(object_name)}
+        head = None
+        if size is None or not etag:
+            head = self._client.head_object(**source)
+            size, etag = head['ContentLength'], head['ETag'].strip('"')
+        if self.skip_unchanged and self._unchanged(key, etag):
+            return None
+        if head is None:
+            head = self._client.head_object(IfMatch='"' + etag + '"', **source)
+        attributes = self._copied_attributes(head, etag)
+        if size > self.part_size:
+            self._copy_multipart(source, key, size, etag, attributes)
+        else:
+            self._client.copy_object(Bucket=self.target_bucket, Key=key, CopySource=source, CopySourceIfMatch='"' + etag + '"', MetadataDirective='REPLACE', **attributes)
+        return target
+
+
+class _ParquetReader(_ObjectReader):
+    def __init__(self, bucket, endpoint, credentials, ssl_enabled, columns, filters):
+        super(_ParquetReader, self).__init__(bucket, endpoint, credentials, ssl_enabled)
+        self.columns = columns
+        self.filters = _check_filters(filters)
+
+    def _read_columns(self):
+        if self.columns is None:
+            return None
+        return list(self.columns) + [c for c, _, _ in self.filters if c not in self.columns]
+
+    def __call__(self, object_name):
+        import pyarrow.parquet as pq
+        with _s3.ObjectFile(self._client, self.bucket, object_name) as f:
+            pf = pq.ParquetFile(f)
+            for i in range(pf.metadata.num_row_groups):
+                if not _row_group_matches(pf.metadata.row_group(i), self.filters):
+                    continue
+                for row in pf.read_row_group(i, columns=self._read_columns()).to_pylist():
+                    if not _row_matches(row, self.filters):
+                        continue
+                    if self.columns is not None:
+                        row = {c: row[c] for c in self.columns}
+                    yield row
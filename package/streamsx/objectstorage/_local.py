@@ -0,0 +1,624 @@
+# coding=utf-8
+# Licensed Materials - Property of IBM
+# Copyright IBM Corp. 2020
+
+# S3 compatible server storing objects in a local directory.
+# Implements the subset of the S3 REST API used by the toolkit operators,
+# the Python operators of this package and the usual S3 SDKs.
+
+import email.utils
+import io
+import json
+import hashlib
+import os
+import shutil
+import socketserver
+import sys
+import threading
+import time
+import urllib.parse
+import uuid
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from xml.sax.saxutils import escape
+
+_XMLNS = 'http://s3.amazonaws.com/doc/2006-03-01/'
+# file name of the empty objects with a key ending with a slash
+_DIR_MARKER = '.s3-dir-marker'
+_UPLOADS = '.uploads'
+_METADATA = '.metadata'
+_COPY_BUFFER = 1024 * 1024
+# request headers stored with an object and returned by GET and HEAD, besides x-amz-meta-*
+_STORED_HEADERS = ['Content-Type', 'Content-Encoding', 'Cache-Control', 'Content-Disposition', 'Content-Language']
+
+
+class _S3Error(Exception):
+    def __init__(self, status, code, message=''):
+        super(_S3Error, self).__init__(message)
+        self.status = status
+        self.code = code
+
+
+def _iso_time(ts):
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(ts)) + '.%03dZ' % (int(ts * 1000) % 1000)
+
+
+def _xml(root, elements):
+    body = ''.join(elements)
+    return ('<?xml version="1.0" encoding="UTF-8"?><%s xmlns="%s">%s</%s>' % (root, _XMLNS, body, root)).encode('utf-8')
+
+
+def _element(name, value):
+    return '<%s>%s</%s>' % (name, escape(str(value)), name)
+
+
+class _Store(object):
+    """Buckets are the subdirectories of the root directory."""
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self._etags = {}
+        self._lock = threading.Lock()
+
+    def bucket_path(self, bucket, exists=True):
+        if not bucket or bucket.startswith('.') or '/' in bucket:
+            raise _S3Error(400, 'InvalidBucketName', bucket)
+        path = os.path.join(self.root, bucket)
+        if exists and not os.path.isdir(path):
+            raise _S3Error(404, 'NoSuchBucket', bucket)
+        return path
+
+    def object_path(self, bucket, key):
+        parts = key.split('/')
+        if not key or any(p in ('.', '..') for p in parts) or _DIR_MARKER in parts:
+            raise _S3Error(400, 'InvalidArgument', key)
+        path = os.path.join(self.bucket_path(bucket), *parts)
+        if key.endswith('/'):
+            path = os.path.join(path, _DIR_MARKER)
+        return path
+
+    def buckets(self):
+        return sorted(b for b in os.listdir(self.root) if not b.startswith('.') and os.path.isdir(os.path.join(self.root, b)))
+
+    def keys(self, bucket, prefix=''):
+        """All keys of a bucket starting with prefix in ascending order."""
+        base = self.bucket_path(bucket)
+        # only walk the directory that can contain the prefix
+        start = os.path.join(base, *prefix.split('/')[:-1])
+        result = []
+        for dirpath, dirnames, filenames in os.walk(start):
+            rel = os.path.relpath(dirpath, base)
+            rel = '' if rel == '.' else rel.replace(os.sep, '/') + '/'
+            for f in filenames:
+                key = rel if f == _DIR_MARKER else rel + f
+                if key and key.startswith(prefix):
+                    result.append(key)
+        return sorted(result)
+
+    def stat(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            raise _S3Error(404, 'NoSuchKey', path)
+        if not os.path.isfile(path):
+            raise _S3Error(404, 'NoSuchKey', path)
+        return st
+
+    def etag(self, path, st=None):
+        st = self.stat(path) if st is None else st
+        with self._lock:
+            cached = self._etags.get(path)
+        if cached is not None and cached[0] == (st.st_mtime_ns, st.st_size):
+            return cached[1]
+        md5 = hashlib.md5()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(_COPY_BUFFER), b''):
+                md5.update(chunk)
+        etag = '"' + md5.hexdigest() + '"'
+        with self._lock:
+            self._etags[path] = ((st.st_mtime_ns, st.st_size), etag)
+        return etag
+
+    def tmp_path(self):
+        tmp = os.path.join(self.root, _UPLOADS, 'tmp')
+        os.makedirs(tmp, exist_ok=True)
+        return os.path.join(tmp, uuid.uuid4().hex)
+
+    def commit(self, tmp, path):
+        """Moves a completely written file to the object path, readers never see partial objects."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp, path)
+
+    def upload_path(self, upload_id, part_number=None):
+        if not upload_id or not upload_id.isalnum():
+            raise _S3Error(404, 'NoSuchUpload', upload_id)
+        path = os.path.join(self.root, _UPLOADS, upload_id)
+        if part_number is None:
+            return path
+        if not os.path.isdir(path):
+            raise _S3Error(404, 'NoSuchUpload', upload_id)
+        return os.path.join(path, '%05d' % int(part_number))
+
+    def metadata_path(self, path):
+        return os.path.join(self.root, _METADATA, hashlib.md5(path.encode('utf-8')).hexdigest())
+
+    def metadata(self, path):
+        """Headers stored with the object at path."""
+        try:
+            with open(self.metadata_path(path)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_metadata(self, path, headers):
+        metadata_path = self.metadata_path(path)
+        if not headers:
+            self.delete_metadata(path)
+            return
+        os.makedirs(os.path.dirname(metadata_path), exist_ok=True)
+        with open(metadata_path, 'w') as f:
+            json.dump(headers, f)
+
+    def delete_metadata(self, path):
+        try:
+            os.remove(self.metadata_path(path))
+        except OSError:
+            pass
+
+    def create_upload(self, bucket, key, headers):
+        upload_id = uuid.uuid4().hex
+        path = self.upload_path(upload_id)
+        os.makedirs(path)
+        with open(os.path.join(path, 'upload'), 'w') as f:
+            json.dump({'bucket': bucket, 'key': key, 'initiated': time.time(), 'headers': headers}, f)
+        return upload_id
+
+    def upload(self, upload_id):
+        try:
+            with open(os.path.join(self.upload_path(upload_id), 'upload')) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            raise _S3Error(404, 'NoSuchUpload', upload_id)
+
+    def uploads(self, bucket, prefix=''):
+        """Multipart uploads in progress as (key, upload id, initiated) sorted by key."""
+        result = []
+        root = os.path.join(self.root, _UPLOADS)
+        for upload_id in os.listdir(root) if os.path.isdir(root) else []:
+            try:
+                with open(os.path.join(root, upload_id, 'upload')) as f:
+                    upload = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if upload['bucket'] == bucket and upload['key'].startswith(prefix):
+                result.append((upload['key'], upload_id, upload['initiated']))
+        return sorted(result)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # headers and body are written separately, avoid the delayed ACK stall on keep-alive connections
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def store(self):
+        return self.server.store
+
+    def _target(self):
+        url = urllib.parse.urlsplit(self.path)
+        self.query = dict(urllib.parse.parse_qsl(url.query, keep_blank_values=True))
+        path = urllib.parse.unquote(url.path)
+        host = self.headers.get('Host', '').split(':')[0]
+        # virtual hosted style requests carry the bucket in the host name
+        if host.endswith('.' + self.server.hostname):
+            return host[:-len(self.server.hostname) - 1], path[1:]
+        bucket, _, key = path[1:].partition('/')
+        return bucket, key
+
+    def _send(self, status, body=b'', headers=None, content_length=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if body and 'Content-Type' not in (headers or {}):
+            self.send_header('Content-Type', 'application/xml')
+        self.send_header('Content-Length', str(len(body) if content_length is None else content_length))
+        self.end_headers()
+        if body and self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _error(self, e):
+        body = b''
+        if self.command != 'HEAD':
+            # error documents have no namespace
+            body = ('<?xml version="1.0" encoding="UTF-8"?><Error>%s%s</Error>' % (_element('Code', e.code), _element('Message', str(e)))).encode('utf-8')
+        self._send(e.status, body, content_length=len(body))
+
+    def _read_body(self):
+        if 'chunked' in self.headers.get('Transfer-Encoding', ''):
+            data = self._read_chunks(self.rfile)
+        else:
+            data = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if 'aws-chunked' in self.headers.get('Content-Encoding', '') or self.headers.get('x-amz-content-sha256', '').startswith('STREAMING-'):
+            data = self._read_chunks(io.BytesIO(data))
+        return data
+
+    @staticmethod
+    def _read_chunks(stream):
+        # HTTP chunked and aws-chunked transfer encoding: size[;extension]\r\n data \r\n ... 0\r\n trailers \r\n
+        data = []
+        while True:
+            size = int(stream.readline().split(b';')[0].strip() or b'0', 16)
+            if size == 0:
+                while stream.readline() not in (b'\r\n', b'\n', b''):
+                    pass
+                return b''.join(data)
+            data.append(stream.read(size))
+            stream.readline()
+
+    def _dispatch(self):
+        try:
+            bucket, key = self._target()
+            if not bucket:
+                if self.command != 'GET':
+                    raise _S3Error(405, 'MethodNotAllowed')
+                return self._list_buckets()
+            handler = getattr(self, '_' + self.command.lower() + ('_object' if key else '_bucket'))
+            return handler(bucket, key)
+        except _S3Error as e:
+            self._error(e)
+        except (ET.ParseError, ValueError) as e:
+            self._error(_S3Error(400, 'MalformedXML' if isinstance(e, ET.ParseError) else 'InvalidArgument', str(e)))
+
+    do_GET = do_HEAD = do_PUT = do_POST = do_DELETE = _dispatch
+
+    def _list_buckets(self):
+        buckets = ''.join('<Bucket>%s%s</Bucket>' % (_element('Name', b), _element('CreationDate', _iso_time(os.stat(self.store.bucket_path(b)).st_mtime))) for b in self.store.buckets())
+        self._send(200, _xml('ListAllMyBucketsResult', ['<Owner><ID>local</ID></Owner><Buckets>', buckets, '</Buckets>']))
+
+    def _head_bucket(self, bucket, key):
+        self.store.bucket_path(bucket)
+        self._send(200)
+
+    def _put_bucket(self, bucket, key):
+        self._read_body()
+        os.makedirs(self.store.bucket_path(bucket, exists=False), exist_ok=True)
+        self._send(200, headers={'Location': '/' + bucket})
+
+    def _delete_bucket(self, bucket, key):
+        path = self.store.bucket_path(bucket)
+        if self.store.keys(bucket):
+            raise _S3Error(409, 'BucketNotEmpty', bucket)
+        shutil.rmtree(path)
+        self._send(204)
+
+    def _get_bucket(self, bucket, key):
+        if 'location' in self.query:
+            self.store.bucket_path(bucket)
+            return self._send(200, _xml('LocationConstraint', []))
+        if 'uploads' in self.query:
+            self.store.bucket_path(bucket)
+            uploads = ['<Upload>%s%s%s</Upload>' % (_element('Key', k), _element('UploadId', u), _element('Initiated', _iso_time(t))) for k, u, t in self.store.uploads(bucket, self.query.get('prefix', ''))]
+            return self._send(200, _xml('ListMultipartUploadsResult', [_element('Bucket', bucket), '<IsTruncated>false</IsTruncated>'] + uploads))
+        self._list_objects(bucket)
+
+    def _list_objects(self, bucket):
+        q = self.query
+        v2 = q.get('list-type') == '2'
+        prefix = q.get('prefix', '')
+        delimiter = q.get('delimiter', '')
+        max_keys = int(q.get('max-keys', 1000))
+        if v2:
+            marker = q.get('continuation-token') or q.get('start-after', '')
+        else:
+            marker = q.get('marker', '')
+        encode = (lambda v: urllib.parse.quote(v, safe='/')) if q.get('encoding-type') == 'url' else (lambda v: v)
+        contents = []
+        prefixes = []
+        truncated = False
+        last = None
+        for k in self.store.keys(bucket, prefix):
+            if k <= marker:
+                continue
+            common = None
+            if delimiter:
+                i = k.find(delimiter, len(prefix))
+                if i >= 0:
+                    common = k[:i + len(delimiter)]
+                    if (prefixes and prefixes[-1] == common) or common <= marker:
+                        continue
+            if len(contents) + len(prefixes) >= max_keys:
+                truncated = True
+                break
+            if common is not None:
+                prefixes.append(common)
+                last = common
+            else:
+                contents.append(k)
+                last = k
+        elements = [_element('Name', bucket), _element('Prefix', encode(prefix)), _element('MaxKeys', max_keys), _element('IsTruncated', 'true' if truncated else 'false')]
+        if delimiter:
+            elements.append(_element('Delimiter', encode(delimiter)))
+        if q.get('encoding-type') == 'url':
+            elements.append(_element('EncodingType', 'url'))
+        if v2:
+            elements.append(_element('KeyCount', len(contents) + len(prefixes)))
+            if 'continuation-token' in q:
+                elements.append(_element('ContinuationToken', q['continuation-token']))
+            if 'start-after' in q:
+                elements.append(_element('StartAfter', encode(q['start-after'])))
+            if truncated:
+                elements.append(_element('NextContinuationToken', last))
+        else:
+            elements.append(_element('Marker', encode(marker)))
+            if truncated:
+                elements.append(_element('NextMarker', encode(last)))
+        for k in contents:
+            path = self.store.object_path(bucket, k)
+            st = self.store.stat(path)
+            elements.append('<Contents>%s%s%s%s<StorageClass>STANDARD</StorageClass></Contents>' % (_element('Key', encode(k)), _element('LastModified', _iso_time(st.st_mtime)), _element('ETag', self.store.etag(path, st)), _element('Size', st.st_size)))
+        for p in prefixes:
+            elements.append('<CommonPrefixes>%s</CommonPrefixes>' % _element('Prefix', encode(p)))
+        self._send(200, _xml('ListBucketResult', elements))
+
+    def _post_bucket(self, bucket, key):
+        if 'delete' not in self.query:
+            raise _S3Error(400, 'InvalidRequest')
+        request = ET.fromstring(self._read_body())
+        deleted = []
+        for k in [e.text for e in request.iter() if e.tag.split('}')[-1] == 'Key']:
+            self._delete_file(self.store.object_path(bucket, k))
+            deleted.append('<Deleted>%s</Deleted>' % _element('Key', k))
+        self._send(200, _xml('DeleteResult', deleted))
+
+    def _object_headers(self, path, st):
+        headers = {'ETag': self.store.etag(path, st), 'Last-Modified': email.utils.formatdate(st.st_mtime, usegmt=True), 'Accept-Ranges': 'bytes', 'Content-Type': 'application/octet-stream'}
+        headers.update(self.store.metadata(path))
+        return headers
+
+    def _stored_headers(self):
+        # content headers and user metadata of a PUT, copy or multipart upload request
+        headers = {}
+        for name, value in self.headers.items():
+            if name.lower().startswith('x-amz-meta-'):
+                headers[name.lower()] = value
+        for name in _STORED_HEADERS:
+            if name in self.headers:
+                headers[name] = self.headers[name]
+        return headers
+
+    @staticmethod
+    def _range(value, size):
+        unit, _, spec = value.partition('=')
+        start, _, end = spec.partition('-')
+        if unit != 'bytes' or ',' in spec:
+            return None
+        if start == '':
+            start, end = max(size - int(end), 0), size - 1
+        else:
+            start, end = int(start), min(int(end), size - 1) if end else size - 1
+        if start >= size or start > end:
+            raise _S3Error(416, 'InvalidRange', value)
+        return start, end
+
+    def _head_object(self, bucket, key):
+        path = self.store.object_path(bucket, key)
+        st = self.store.stat(path)
+        self._send(200, headers=self._object_headers(path, st), content_length=st.st_size)
+
+    def _get_object(self, bucket, key):
+        if 'uploadId' in self.query:
+            return self._send(200, _xml('ListPartsResult', [_element('Bucket', bucket), _element('Key', key), _element('UploadId', self.query['uploadId'])]))
+        path = self.store.object_path(bucket, key)
+        st = self.store.stat(path)
+        headers = self._object_headers(path, st)
+        status = 200
+        start, end = 0, st.st_size - 1
+        r = self.headers.get('Range')
+        if r and st.st_size > 0:
+            parsed = self._range(r, st.st_size)
+            if parsed is not None:
+                start, end = parsed
+                status = 206
+                headers['Content-Range'] = 'bytes %d-%d/%d' % (start, end, st.st_size)
+        length = end - start + 1
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(length))
+        self.end_headers()
+        with open(path, 'rb') as f:
+            f.seek(start)
+            while length > 0:
+                chunk = f.read(min(length, _COPY_BUFFER))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                length -= len(chunk)
+
+    def _copy_source(self):
+        source = urllib.parse.unquote(self.headers['x-amz-copy-source'].split('?')[0]).lstrip('/')
+        bucket, _, key = source.partition('/')
+        path = self.store.object_path(bucket, key)
+        return path, self.store.stat(path)
+
+    def _put_object(self, bucket, key):
+        if 'partNumber' in self.query:
+            return self._upload_part(bucket, key)
+        path = self.store.object_path(bucket, key)
+        tmp = self.store.tmp_path()
+        if 'x-amz-copy-source' in self.headers:
+            source, _ = self._copy_source()
+            self._read_body()
+            shutil.copyfile(source, tmp)
+            self.store.commit(tmp, path)
+            replace = self.headers.get('x-amz-metadata-directive', 'COPY').upper() == 'REPLACE'
+            self.store.save_metadata(path, self._stored_headers() if replace else self.store.metadata(source))
+            st = self.store.stat(path)
+            return self._send(200, _xml('CopyObjectResult', [_element('LastModified', _iso_time(st.st_mtime)), _element('ETag', self.store.etag(path, st))]))
+        with open(tmp, 'wb') as f:
+            f.write(self._read_body())
+        self.store.commit(tmp, path)
+        self.store.save_metadata(path, self._stored_headers())
+        self._send(200, headers={'ETag': self.store.etag(path)})
+
+    def _upload_part(self, bucket, key):
+        part = self.store.upload_path(self.query.get('uploadId'), self.query['partNumber'])
+        if 'x-amz-copy-source' in self.headers:
+            source, st = self._copy_source()
+            self._read_body()
+            r = self.headers.get('x-amz-copy-source-range')
+            start, end = self._range(r, st.st_size) if r else (0, st.st_size - 1)
+            with open(source, 'rb') as src, open(part, 'wb') as dst:
+                src.seek(start)
+                remaining = end - start + 1
+                while remaining > 0:
+                    chunk = src.read(min(remaining, _COPY_BUFFER))
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+                    remaining -= len(chunk)
+            etag = self.store.etag(part)
+            return self._send(200, _xml('CopyPartResult', [_element('LastModified', _iso_time(time.time())), _element('ETag', etag)]))
+        with open(part, 'wb') as f:
+            f.write(self._read_body())
+        self._send(200, headers={'ETag': self.store.etag(part)})
+
+    def _post_object(self, bucket, key):
+        path = self.store.object_path(bucket, key)
+        if 'uploads' in self.query:
+            self._read_body()
+            upload_id = self.store.create_upload(bucket, key, self._stored_headers())
+            return self._send(200, _xml('InitiateMultipartUploadResult', [_element('Bucket', bucket), _element('Key', key), _element('UploadId', upload_id)]))
+        if 'uploadId' not in self.query:
+            raise _S3Error(400, 'InvalidRequest')
+        upload = self.store.upload_path(self.query['uploadId'])
+        headers = self.store.upload(self.query['uploadId']).get('headers', {})
+        request = ET.fromstring(self._read_body())
+        numbers = [int(e.text) for e in request.iter() if e.tag.split('}')[-1] == 'PartNumber']
+        tmp = self.store.tmp_path()
+        with open(tmp, 'wb') as f:
+            for n in numbers:
+                part = self.store.upload_path(self.query['uploadId'], n)
+                if not os.path.isfile(part):
+                    raise _S3Error(400, 'InvalidPart', str(n))
+                with open(part, 'rb') as p:
+                    shutil.copyfileobj(p, f, _COPY_BUFFER)
+        self.store.commit(tmp, path)
+        self.store.save_metadata(path, headers)
+        shutil.rmtree(upload, ignore_errors=True)
+        self._send(200, _xml('CompleteMultipartUploadResult', [_element('Bucket', bucket), _element('Key', key), _element('ETag', self.store.etag(path))]))
+
+    def _delete_file(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            return
+        self.store.delete_metadata(path)
+        # remove directories left empty, the bucket directory is kept
+        directory = os.path.dirname(path)
+        while os.path.dirname(directory) != self.store.root:
+            try:
+                os.rmdir(directory)
+            except OSError:
+                break
+            directory = os.path.dirname(directory)
+
+    def _delete_object(self, bucket, key):
+        if 'uploadId' in self.query:
+            shutil.rmtree(self.store.upload_path(self.query['uploadId']), ignore_errors=True)
+            return self._send(204)
+        self._delete_file(self.store.object_path(bucket, key))
+        self._send(204)
+
+
+class _ThreadingServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # ranged readers close the connection before the end of the object
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super(_ThreadingServer, self).handle_error(request, client_address)
+
+
+class LocalObjectStorage(object):
+    """S3 compatible object storage that stores objects in a local directory.
+
+    Runs an HTTP server in the current process that serves the buckets in ``directory``, each subdirectory is a bucket and each file an object.
+    Topologies using :py:class:`Scan`, :py:class:`Read`, :py:class:`Write` and the other composites of this package run unchanged against local disk when the ``endpoint`` and ``credentials`` of the local object storage are set and SSL is disabled.
+    This allows to develop, profile and load test applications in standalone mode without network latency or request charges.
+
+    Example running a topology in standalone mode against the local directory ``/tmp/cos``::
+
+        import streamsx.objectstorage as cos
+
+        with cos.LocalObjectStorage('/tmp/cos', buckets=['sample']) as local:
+            s.for_each(cos.Write(bucket='sample', endpoint=local.endpoint, object='/out/data%OBJECTNUM.txt', credentials=local.credentials, ssl_enabled=False))
+            submit('STANDALONE', topo)
+
+    The server accepts any access key, requests are not authenticated.
+
+    .. versionadded:: 1.6
+
+    Args:
+        directory(str): Directory containing the buckets, created if it does not exist.
+        buckets(list): Names of buckets to create.
+        host(str): Host name the server binds to.
+        port(int): Port of the server, by default a free port is used.
+    """
+    def __init__(self, directory, buckets=None, host='localhost', port=0):
+        self.directory = directory
+        self.host = host
+        self.port = port
+        os.makedirs(directory, exist_ok=True)
+        for bucket in buckets or []:
+            self.create_bucket(bucket)
+        self._server = None
+        self._thread = None
+
+    @property
+    def endpoint(self):
+        """str: Endpoint of the running server, for example ``'localhost:39125'``."""
+        return '%s:%d' % (self.host, self.port)
+
+    @property
+    def credentials(self):
+        """dict: HMAC credentials accepted by the server."""
+        return {'access_key_id': 'local', 'secret_access_key': 'local'}
+
+    def create_bucket(self, bucket):
+        """Creates a bucket.
+
+        Args:
+            bucket(str): Bucket name.
+        """
+        os.makedirs(_Store(self.directory).bucket_path(bucket, exists=False), exist_ok=True)
+
+    def start(self):
+        """Starts the server in a background thread."""
+        if self._server is not None:
+            return self
+        self._server = _ThreadingServer((self.host, self.port), _Handler)
+        self._server.store = _Store(self.directory)
+        self._server.hostname = self.host
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='LocalObjectStorage', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops the server."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
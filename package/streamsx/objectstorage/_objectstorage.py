@@ -3,17 +3,47 @@
 # Copyright IBM Corp. 2018
 
 import datetime
+import math
+import warnings
 
 import streamsx.spl.op
 import streamsx.spl.types
-from streamsx.topology.schema import CommonSchema, StreamSchema
+from streamsx.topology.schema import CommonSchema, StreamSchema, is_common
 from streamsx.spl.types import rstring
 import json
 from streamsx.toolkits import download_toolkit
 import streamsx.topology.composite
+import streamsx.topology.state
+import streamsx.objectstorage._functions
 
 _TOOLKIT_NAME = 'com.ibm.streamsx.objectstorage'
 
+_PARQUET_COMPRESSIONS = ['UNCOMPRESSED', 'SNAPPY', 'GZIP', 'LZO']
+# codecs pyarrow can write, used by the Python operators
+_PYARROW_COMPRESSIONS = ['UNCOMPRESSED', 'SNAPPY', 'GZIP']
+_PARQUET_WRITER_VERSIONS = ['v1', 'v2']
+_PARQUET_BLOCK_SIZE = 128*1024*1024
+_COMPRESSION_EXTENSIONS = {'gzip': '.gz', 'zstd': '.zst', 'bz2': '.bz2'}
+_S3A_FAST_UPLOAD_BUFFERS = ['disk', 'array', 'bytebuffer']
+_S3A_MULTIPART_SIZE = 64*1024*1024
+_S3A_FAST_UPLOAD_ACTIVE_BLOCKS = 4
+
+_MB = 1024*1024
+# classes of the toolkit and the S3 client, objects not related to the buffered content
+_BASE_HEAP = 256*_MB
+# metaspace, thread stacks and code cache of the JVM outside of the heap
+_JVM_OVERHEAD = 256*_MB
+# write buffer of an object whose content is buffered on local disk
+_DISK_BUFFER = 8*_MB
+_HEAP_HEADROOM = 1.5
+
+_BLOCK_SCHEMA = StreamSchema('tuple<blob data>')
+_BATCH_SCHEMA = StreamSchema('tuple<rstring object_name, blob data, list<int64> offsets>')
+_LINE_ATTRIBUTES = ['object_name', 'line_number', 'offset', 'line']
+_SPLIT_LINE_ATTRIBUTES = ['object_name', 'offset', 'line']
+_SCAN_ATTRIBUTES = ['object_name', 'size', 'etag', 'last_modified', 'storage_class']
+
+
 def _add_toolkit_dependency(topo, version):
     # IMPORTANT: Dependency of this python wrapper to a specific toolkit version
     # This is important when toolkit is not set with streamsx.spl.toolkit.add_toolkit (selecting toolkit from remote build service)
@@ -126,17 +156,345 @@ def _check_time_per_object(time_per_object):
     return result
 
 
+def _check_seconds(value, name):
+    if isinstance(value, datetime.timedelta):
+        value = value.total_seconds()
+    elif not isinstance(value, (int, float)) or isinstance(value, bool):
+        raise TypeError(value)
+    if value < 0:
+        raise ValueError("Invalid " + name + " value. Value must not be negative.")
+    return float(value)
+
+
+def _check_sleep_times(sleep_time, max_sleep_time):
+    # sleep times of the scans run as Python operator
+    sleep_time = 5.0 if sleep_time is None else _check_seconds(sleep_time, 'sleep_time')
+    max_sleep_time = sleep_time if max_sleep_time is None else _check_seconds(max_sleep_time, 'max_sleep_time')
+    if max_sleep_time < sleep_time or sleep_time <= 0:
+        raise ValueError("Invalid max_sleep_time value. Value must not be less than sleep_time and sleep_time must be greater than zero.")
+    return sleep_time, max_sleep_time
+
+
+def _consistent_region(stream):
+    # configuration of the consistent region started by an operator upstream of
+    # the stream, None when not in a region, an autonomous region ends the region
+    operators = [stream.oport.operator]
+    visited = set()
+    while operators:
+        op = operators.pop()
+        if id(op) in visited or op.kind == '$Autonomous$':
+            continue
+        visited.add(id(op))
+        if getattr(op, '_consistent', None) is not None:
+            return op._consistent
+        for iport in op.inputPorts:
+            operators.extend(oport.operator for oport in iport.outputPorts)
+    return None
+
+
+def _check_consistent_rollover(sink):
+    # an object closed between two checkpoints would be written again when the region is reset
+    if sink.time_per_object is not None or sink.bytes_per_object is not None or sink.tuples_per_object is not None or sink.close_on_punct:
+        raise ValueError("Options time_per_object, bytes_per_object, tuples_per_object and close_on_punct are not supported in a consistent region, objects are closed when the region is drained.")
+
+
+def _check_positive_int(value, name):
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise TypeError(value)
+    if value < 1:
+        raise ValueError("Invalid " + name + " value. Value must be greater than zero.")
+    return value
+
+
+def _add_rollover_params(_op, time_per_object, bytes_per_object, tuples_per_object, close_on_punct):
+    # objects are closed every 10 seconds when no rollover policy is set
+    if time_per_object is None and bytes_per_object is None and tuples_per_object is None and not close_on_punct:
+        time_per_object = 10.0
+    if time_per_object is not None:
+        _op.params['timePerObject'] = streamsx.spl.types.float64(_check_time_per_object(time_per_object))
+    if bytes_per_object is not None:
+        _op.params['bytesPerObject'] = streamsx.spl.types.int64(_check_positive_int(bytes_per_object, 'bytes_per_object'))
+    if tuples_per_object is not None:
+        _op.params['tuplesPerObject'] = streamsx.spl.types.int64(_check_positive_int(tuples_per_object, 'tuples_per_object'))
+    if close_on_punct:
+        _op.params['closeOnPunct'] = _op.expression('true')
+
+
+def _add_s3a_params(_op, protocol, vm_arg, multipart_size, fast_upload_buffer, fast_upload_active_blocks, upload_threads):
+    # the S3A client of the sink reads its upload settings from JVM system properties
+    properties = []
+    if multipart_size is not None:
+        _check_positive_int(multipart_size, 's3a_multipart_size')
+        if multipart_size < 5*1024*1024:
+            raise ValueError("Invalid s3a_multipart_size value. Value must be at least 5 MB.")
+        properties.append(('fs.s3a.multipart.size', multipart_size))
+    if fast_upload_buffer is not None:
+        if fast_upload_buffer not in _S3A_FAST_UPLOAD_BUFFERS:
+            raise ValueError("Invalid s3a_fast_upload_buffer value. Set one of " + ', '.join(_S3A_FAST_UPLOAD_BUFFERS) + ".")
+        properties.append(('fs.s3a.fast.upload', 'true'))
+        properties.append(('fs.s3a.fast.upload.buffer', fast_upload_buffer))
+    if fast_upload_active_blocks is not None:
+        properties.append(('fs.s3a.fast.upload.active.blocks', _check_positive_int(fast_upload_active_blocks, 's3a_fast_upload_active_blocks')))
+    if upload_threads is not None:
+        properties.append(('fs.s3a.threads.max', _check_positive_int(upload_threads, 's3a_upload_threads')))
+    if not properties:
+        return
+    if protocol != 's3a':
+        raise ValueError("Multipart upload options require protocol 's3a'.")
+    vm_args = [] if vm_arg is None else [vm_arg] if isinstance(vm_arg, str) else list(vm_arg)
+    _op.params['vmArg'] = vm_args + ['-D%s=%s' % (key, value) for key, value in properties]
+
+
+def _check_positive_number(value, name):
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        raise TypeError(value)
+    if value <= 0:
+        raise ValueError("Invalid " + name + " value. Value must be greater than zero.")
+    return value
+
+
+def _estimate_object_size(sink, tuple_rate, tuple_size, region=None):
+    # smallest size limit of the rollover policy, None when the size is not bounded
+    limits = []
+    seconds = None
+    if region is not None:
+        # objects are closed by the checkpoints only, an operator driven region has no period,
+        # the period is not a rollover policy and may be shorter than a second
+        if region.trigger == streamsx.topology.state.ConsistentRegionConfig.Trigger.PERIODIC:
+            seconds = _check_seconds(region.period, 'period')
+    elif sink.time_per_object is not None:
+        seconds = _check_time_per_object(sink.time_per_object)
+    elif sink.bytes_per_object is None and sink.tuples_per_object is None and not sink.close_on_punct:
+        seconds = 10.0
+    if seconds is not None and tuple_rate is not None:
+        limits.append(seconds * tuple_rate * tuple_size)
+    if sink.bytes_per_object is not None:
+        limits.append(sink.bytes_per_object)
+    if sink.tuples_per_object is not None:
+        limits.append(sink.tuples_per_object * tuple_size)
+    return min(limits) if limits else None
+
+
+def _add_heap_params(_op, sink, parquet, region=None):
+    # sizes the JVM for the content buffered by the sink, each channel of a
+    # parallel region receives its share of the tuples and open objects
+    if not sink.auto_heap:
+        return
+    width = 1 if sink.width is None else _check_width(sink.width)
+    tuple_rate = None if sink.tuple_rate is None else _check_positive_number(sink.tuple_rate, 'tuple_rate') / width
+    tuple_size = 1024 if sink.tuple_size is None else _check_positive_int(sink.tuple_size, 'tuple_size')
+    open_objects = 1 if sink.open_objects is None else math.ceil(_check_positive_int(sink.open_objects, 'open_objects') / width)
+    object_size = _estimate_object_size(sink, tuple_rate, tuple_size, region)
+
+    def bounded(size):
+        return size if object_size is None else min(size, object_size)
+
+    heap = 0
+    direct = 0
+    if parquet:
+        # the row group is held in memory until it is flushed
+        heap += bounded(_PARQUET_BLOCK_SIZE if sink.parquet_block_size is None else sink.parquet_block_size)
+    if sink.protocol == 's3a' and sink.s3a_fast_upload_buffer in ['array', 'bytebuffer']:
+        blocks = _S3A_FAST_UPLOAD_ACTIVE_BLOCKS if sink.s3a_fast_upload_active_blocks is None else sink.s3a_fast_upload_active_blocks
+        part_size = _S3A_MULTIPART_SIZE if sink.s3a_multipart_size is None else sink.s3a_multipart_size
+        if sink.s3a_fast_upload_buffer == 'array':
+            heap += bounded(blocks * part_size)
+        else:
+            direct += bounded(blocks * part_size)
+    else:
+        heap += bounded(_DISK_BUFFER)
+    heap_mb = math.ceil((_BASE_HEAP + open_objects * heap) * _HEAP_HEADROOM / _MB)
+    direct_mb = math.ceil(open_objects * direct / _MB)
+
+    vm_args = _op.params.get('vmArg')
+    vm_args = [] if vm_args is None else [vm_args] if isinstance(vm_args, str) else list(vm_args)
+    if any(a.startswith('-Xmx') or a.startswith('-XX:MaxDirectMemorySize') for a in vm_args):
+        raise ValueError("Set either auto_heap or the heap size in vm_arg.")
+    vm_args.append('-Xmx%dm' % heap_mb)
+    if direct_mb:
+        vm_args.append('-XX:MaxDirectMemorySize=%dm' % direct_mb)
+    _op.params['vmArg'] = vm_args
+
+    if sink.memory_limit is not None:
+        required = heap_mb * _MB + direct_mb * _MB + _JVM_OVERHEAD
+        if required > _check_positive_int(sink.memory_limit, 'memory_limit'):
+            warnings.warn("Estimated memory of %d MB for the sink with %d open objects exceeds the memory limit of %d MB. Reduce the object size with the rollover policy, the parquet block size or the number of open objects, or increase the width." % (math.ceil(required / _MB), open_objects, sink.memory_limit // _MB))
+
+
+def _check_parquet_size(value, name):
+    _check_positive_int(value, name)
+    if value > 2147483647:
+        raise ValueError("Invalid " + name + " value. Value must be less than 2 GB.")
+    return value
+
+
+def _add_parquet_params(_op, compression, block_size, page_size, dict_page_size, enable_dict, writer_version, enable_schema_validation):
+    if compression is None:
+        compression = 'SNAPPY'
+    if not isinstance(compression, str):
+        raise TypeError(compression)
+    if compression.upper() not in _PARQUET_COMPRESSIONS:
+        raise ValueError("Invalid parquet_compression value. Set one of " + ', '.join(_PARQUET_COMPRESSIONS) + ".")
+    _op.params['parquetCompression'] = compression.upper()
+    _op.params['parquetEnableDict'] = _op.expression('false' if enable_dict is False else 'true')
+    if block_size is not None:
+        _op.params['parquetBlockSize'] = streamsx.spl.types.int32(_check_parquet_size(block_size, 'parquet_block_size'))
+    if page_size is not None:
+        _op.params['parquetPageSize'] = streamsx.spl.types.int32(_check_parquet_size(page_size, 'parquet_page_size'))
+    if dict_page_size is not None:
+        _op.params['parquetDictPageSize'] = streamsx.spl.types.int32(_check_parquet_size(dict_page_size, 'parquet_dict_page_size'))
+    if writer_version is not None:
+        if writer_version not in _PARQUET_WRITER_VERSIONS:
+            raise ValueError("Invalid parquet_writer_version value. Set one of " + ', '.join(_PARQUET_WRITER_VERSIONS) + ".")
+        _op.params['parquetWriterVersion'] = writer_version
+    if enable_schema_validation is not None:
+        _op.params['parquetEnableSchemaValidation'] = _op.expression('true' if enable_schema_validation else 'false')
+
+
+def _parquet_input_stream(stream, schema):
+    # parquet columns are generated from the attributes of a structured schema,
+    # schemas with the same attributes and a different tuple style are not converted
+    if schema is not None:
+        if schema.schema() != stream.oport.schema.schema():
+            stream = stream.map(schema=schema)
+    elif stream.oport.schema is CommonSchema.Python:
+        raise ValueError("Set the schema option to write a stream of Python objects in parquet format.")
+    return stream
+
+
+def _attribute_names(schema):
+    if isinstance(schema, str):
+        schema = StreamSchema(schema)
+    return list(schema.as_tuple(named=True).style._fields)
+
+
+def _check_attributes(stream, attributes, option):
+    if attributes is None:
+        return None
+    if isinstance(attributes, str):
+        attributes = [attributes]
+    if is_common(stream.oport.schema):
+        raise ValueError("Set " + option + " for structured streams only.")
+    names = _attribute_names(stream.oport.schema)
+    missing = [a for a in attributes if a not in names]
+    if missing:
+        raise ValueError("Attributes " + str(missing) + " of " + option + " not found in the input stream.")
+    return list(attributes)
+
+
+def _check_object(object, object_name_attribute):
+    if object is None and object_name_attribute is None:
+        raise ValueError("Set either object or object_name_attribute.")
+    if object is not None and object_name_attribute is not None:
+        raise ValueError("Set either object or object_name_attribute, not both.")
+
+
+def _add_partition_params(_op, partition_by, skip_partition_attributes):
+    if partition_by is None:
+        return
+    _op.params['partitionValueAttributes'] = partition_by
+    if skip_partition_attributes is not None:
+        _op.params['skipPartitionAttributes'] = _op.expression('true' if skip_partition_attributes else 'false')
+
+
+def _read_schema(block_size):
+    # binary mode emits blocks of the object in a blob
+    if block_size is not None:
+        _check_positive_int(block_size, 'block_size')
+        return _BLOCK_SCHEMA
+    return CommonSchema.String
+
+
+def _check_schema_attributes(schema, attributes):
+    if isinstance(schema, str):
+        schema = StreamSchema(schema)
+    unknown = [a for a in _attribute_names(schema) if a not in attributes]
+    if unknown:
+        raise ValueError("Attributes " + str(unknown) + " not supported, the schema can contain the attributes " + ', '.join(attributes) + ".")
+    return schema
+
+
+def _check_line_schema(schema):
+    return _check_schema_attributes(schema, _LINE_ATTRIBUTES)
+
+
+def _check_width(width):
+    if not isinstance(width, int) or isinstance(width, bool):
+        raise TypeError(width)
+    if width < 1:
+        raise ValueError("Invalid width value. Value must be at least 1.")
+    return width
+
+
+def _parallel(composite, stream, width, keys=None, routing=None):
+    # operators of a parallel region are not grouped visually,
+    # tuples with the same key values are routed to the same channel
+    composite.group = False
+    if keys:
+        return stream.parallel(_check_width(width), routing=streamsx.topology.topology.Routing.KEY_PARTITIONED, keys=keys)
+    if routing is not None:
+        return stream.parallel(_check_width(width), routing=routing)
+    return stream.parallel(_check_width(width))
+
+
+def _split_object_name(object):
+    # the channel number is inserted in front of %OBJECTNUM or the extension
+    if '%OBJECTNUM' in object:
+        head, tail = object.split('%OBJECTNUM', 1)
+        tail = '_%OBJECTNUM' + tail
+    else:
+        dirname, sep, basename = object.rpartition('/')
+        stem, dot, ext = basename.rpartition('.')
+        if not stem:
+            stem, dot, ext = basename, '', ''
+        head = dirname + sep + stem + '_'
+        tail = dot + ext
+    return head, tail
+
+
+def _channel_object_name(object):
+    # SPL expression evaluated by each channel of the parallel region
+    head, tail = _split_object_name(object)
+    return json.dumps(head) + ' + (rstring)getChannel() + ' + json.dumps(tail)
+
+
+def _check_compression(compression, values):
+    if compression not in values:
+        raise ValueError("Invalid compression value. Set one of " + ', '.join(values) + ".")
+    return compression
+
+
 class Scan(streamsx.topology.composite.Source):
     """Scan a directory in a bucket for object names.
 
     Scans an object storage directory and emits the names of new or modified objects that are found in the directory.
 
+    With ``max_sleep_time`` the scan is adaptive, the directory is scanned every ``sleep_time`` seconds after new or modified objects were found and the time between scans is doubled after each scan finding nothing until ``max_sleep_time`` is reached.
+
+    With ``manifest`` the name, ETag and last modified time of the scanned objects are kept in an object that is rewritten after each scan that found a change, its size grows with the number of objects. After a restart the first scan lists only the objects after the last known name, modifications of objects before it are detected by the subsequent scans. A manifest that cannot be read fails the scan with ``strict_mode`` and is retried otherwise, only a missing manifest starts a scan of all objects.
+
     Example scanning a directory ``/sample`` for objects matching the pattern::
 
         import streamsx.objectstorage as cos
 
         scans = topo.source(cos.Scan(bucket='your-bucket-name', directory='/sample', pattern='SAMPLE_[0-9]*\\.ascii\\.text$'))
 
+    Example scanning the directory ``/logs`` and its subdirectories laid out as ``/logs/yyyy/mm/dd/hh/``::
+
+        scans = topo.source(cos.Scan(bucket='your-bucket-name', endpoint=endpoint, directory='/logs', pattern='.*\\.json', recursive=True, max_depth=4))
+
+    Example scanning a directory with a manifest, after a restart only objects added since the last scan are emitted::
+
+        scans = topo.source(cos.Scan(bucket='your-bucket-name', endpoint=endpoint, directory='/sample', manifest='/manifests/sample.json.gz'))
+
+    Example scanning a directory and emitting the object names with their size::
+
+        scans = topo.source(cos.Scan(bucket='your-bucket-name', endpoint=endpoint, directory='/sample', schema='tuple<rstring object_name, int64 size>'))
+
+    Example scanning every 2 seconds while new objects arrive and backing off up to every 5 minutes while the directory is idle::
+
+        scans = topo.source(cos.Scan(bucket='your-bucket-name', endpoint=endpoint, directory='/sample', sleep_time=2.0, max_sleep_time=300.0))
+
     .. versionadded:: 1.5
 
     Attributes
@@ -148,7 +506,7 @@ class Scan(streamsx.topology.composite.Source):
     pattern : str
         Limits the object names that are listed to the names that match the specified regular expression.
     directory : str
-        Specifies the name of the directory to be scanned. Any subdirectories are not scanned.
+        Specifies the name of the directory to be scanned. Any subdirectories are not scanned unless ``recursive`` is set.
     credentials : str|dict
         Credentials as dict or name of the application configuration containing the credentials for Cloud Object Storage. When set to ``None`` the application configuration ``cos`` is used.
     protocol: str
@@ -157,7 +515,9 @@ class Scan(streamsx.topology.composite.Source):
         The additional optional parameters as variable keyword arguments.
 
     Returns:
-        Stream: Object names stream with schema ``CommonSchema.String``.
+        Stream: Object names stream with schema ``CommonSchema.String`` or the structured ``schema``.
+
+    .. note:: With the ``max_sleep_time``, ``recursive``, ``manifest`` or ``schema`` options the composite runs as Python operator and requires the package ``boto3`` (``ibm-cos-sdk`` for IAM authentication) in the Python environment of the Streams instance.
     """
 
     def __init__(self, bucket, endpoint, pattern='.*', directory='/', credentials=None, protocol='cos', **options):
@@ -173,10 +533,37 @@ class Scan(streamsx.topology.composite.Source):
 
         self.ssl_enabled = None
         self.vm_arg = None
+        self.sleep_time = None
+        self.init_delay = None
+        self.strict_mode = None
+        self.max_sleep_time = None
+        self.recursive = None
+        self.max_depth = None
+        self.listing_threads = None
+        self.manifest = None
+        self.schema = None
         if 'ssl_enabled' in options:
             self.ssl_enabled = options.get('ssl_enabled')
         if 'vm_arg' in options:
             self.vm_arg = options.get('vm_arg')
+        if 'sleep_time' in options:
+            self.sleep_time = options.get('sleep_time')
+        if 'init_delay' in options:
+            self.init_delay = options.get('init_delay')
+        if 'strict_mode' in options:
+            self.strict_mode = options.get('strict_mode')
+        if 'max_sleep_time' in options:
+            self.max_sleep_time = options.get('max_sleep_time')
+        if 'recursive' in options:
+            self.recursive = options.get('recursive')
+        if 'max_depth' in options:
+            self.max_depth = options.get('max_depth')
+        if 'listing_threads' in options:
+            self.listing_threads = options.get('listing_threads')
+        if 'manifest' in options:
+            self.manifest = options.get('manifest')
+        if 'schema' in options:
+            self.schema = options.get('schema')
 
     @property
     def vm_arg(self):
@@ -201,14 +588,133 @@ class Scan(streamsx.topology.composite.Source):
     def ssl_enabled(self, value):
         self._ssl_enabled = value
 
+    @property
+    def sleep_time(self):
+        """
+            float|datetime.timedelta: Time to wait in seconds between two scans of the directory. Defaults to 5 seconds.
+        """
+        return self._sleep_time
+
+    @sleep_time.setter
+    def sleep_time(self, value):
+        self._sleep_time = value
+
+    @property
+    def init_delay(self):
+        """
+            float|datetime.timedelta: Time to wait in seconds before the first scan of the directory. Defaults to 0.
+        """
+        return self._init_delay
+
+    @init_delay.setter
+    def init_delay(self, value):
+        self._init_delay = value
+
+    @property
+    def strict_mode(self):
+        """
+            bool: Set to ``True`` to stop with an error when the directory can not be scanned, for example if the bucket does not exist. By default scan errors are ignored and the scan is retried.
+        """
+        return self._strict_mode
+
+    @strict_mode.setter
+    def strict_mode(self, value):
+        self._strict_mode = value
+
+    @property
+    def max_sleep_time(self):
+        """
+            float|datetime.timedelta: Maximum time to wait in seconds between two scans when the directory is idle. By default the directory is scanned every ``sleep_time`` seconds.
+        """
+        return self._max_sleep_time
+
+    @max_sleep_time.setter
+    def max_sleep_time(self, value):
+        self._max_sleep_time = value
+
+    @property
+    def recursive(self):
+        """
+            bool: Set to ``True`` to scan the subdirectories of the directory too, the pattern is matched against the object name relative to the directory.
+        """
+        return self._recursive
+
+    @recursive.setter
+    def recursive(self, value):
+        self._recursive = value
+
+    @property
+    def max_depth(self):
+        """
+            int: Maximum number of subdirectory levels below the directory that are scanned when ``recursive`` is set. ``0`` scans the directory only. By default all levels are scanned.
+        """
+        return self._max_depth
+
+    @max_depth.setter
+    def max_depth(self, value):
+        self._max_depth = value
+
+    @property
+    def listing_threads(self):
+        """
+            int: Maximum number of directories listed concurrently when ``recursive`` is set. Default is 8.
+        """
+        return self._listing_threads
+
+    @listing_threads.setter
+    def listing_threads(self, value):
+        self._listing_threads = value
+
+    @property
+    def manifest(self):
+        """
+            str: Name of an object in the bucket that keeps the scanned objects, so objects seen before a restart are not emitted again, for example ``'/manifests/sample.json.gz'``.
+        """
+        return self._manifest
+
+    @manifest.setter
+    def manifest(self, value):
+        self._manifest = value
+
+    @property
+    def schema(self):
+        """
+            StreamSchema|str: Structured schema of the output stream with the attributes ``object_name``, ``size``, ``etag``, ``last_modified`` and ``storage_class`` of the listing. By default object names are emitted with schema ``CommonSchema.String``.
+        """
+        return self._schema
+
+    @schema.setter
+    def schema(self, value):
+        self._schema = value
+
     def populate(self, topology, name, **options):
         app_config_name = self.credentials
         # check if it's the credentials for the service
         if isinstance(self.credentials, dict):
             app_config_name = None
 
+        sleep_time = None if self.sleep_time is None else _check_seconds(self.sleep_time, 'sleep_time')
+        init_delay = None if self.init_delay is None else _check_seconds(self.init_delay, 'init_delay')
+        metadata = self.schema is not None and self.schema is not CommonSchema.String
+        if self.max_sleep_time is not None or self.recursive or self.manifest is not None or metadata:
+            sleep_time, max_sleep_time = _check_sleep_times(sleep_time, self.max_sleep_time)
+            max_depth = self.max_depth
+            if max_depth is not None and (not isinstance(max_depth, int) or max_depth < 0):
+                raise ValueError("Invalid max_depth value. Value must not be negative.")
+            listing_threads = 8 if self.listing_threads is None else _check_positive_int(self.listing_threads, 'listing_threads')
+            scanner = streamsx.objectstorage._functions._ObjectScanner(self.bucket, self.endpoint, self.credentials, self.ssl_enabled, self.directory, self.pattern, sleep_time, max_sleep_time, init_delay, self.strict_mode, bool(self.recursive), max_depth, listing_threads, self.manifest, metadata)
+            if metadata:
+                return topology.source(scanner, name=name).map(schema=_check_schema_attributes(self.schema, _SCAN_ATTRIBUTES))
+            return topology.source(scanner, name=name).as_string()
+
         _op = _ObjectStorageScan(topology, CommonSchema.String, pattern = self.pattern, directory = self.directory, endpoint = self.endpoint, appConfigName = app_config_name, vmArg = self.vm_arg, name = name)
         _op.params['objectStorageURI'] = self.protocol+'://'+self.bucket
+        if sleep_time is not None:
+            _op.params['sleepTime'] = streamsx.spl.types.float64(sleep_time)
+        if init_delay is not None:
+            _op.params['initDelay'] = streamsx.spl.types.float64(init_delay)
+        if self.strict_mode is not None:
+            _op.params['strictMode'] = _op.expression('true' if self.strict_mode else 'false')
 
         if isinstance(self.credentials, dict):
             access_key_id, secret_access_key = _read_hmac_credentials(self.credentials)
@@ -231,77 +737,1329 @@ class Read(streamsx.topology.composite.Map):
 
     Reads the object specified in the input stream and emits content of the object. Expects ``CommonSchema.String`` in the input stream.
 
+    Batches of ``batch_lines`` or ``batch_bytes`` hold consecutive lines of a single object, the last batch of an object may be smaller. With ``batch_bytes`` the attribute ``data`` holds the lines without decoding separated by a newline and ``offsets`` the position of each line in ``data``, a line larger than ``batch_bytes`` is emitted alone.
+    Compressed objects are decompressed while they are read, the ``offset`` attribute of ``schema`` is the position in the decompressed content. With ``compression='auto'`` the compression is detected from the first bytes of each object and objects without compression are read as they are.
+
     Example of reading object with the objects names from the ``scanned`` stream::
 
         import streamsx.objectstorage as cos
 
-        r = scanned.map(cos.Read(bucket=bucket, endpoint=endpoint))
+        r = scanned.map(cos.Read(bucket=bucket, endpoint=endpoint))
+
+    Example of reading binary objects, for example images or compressed archives, in blocks of 1 MB::
+
+        import streamsx.objectstorage as cos
+
+        blocks = scanned.map(cos.Read(bucket=bucket, endpoint=endpoint, block_size=1024*1024))
+
+    Example of reading lines together with the object name and position of the line::
+
+        import streamsx.objectstorage as cos
+
+        lines = scanned.map(cos.Read(bucket=bucket, endpoint=endpoint, schema='tuple<rstring object_name, int64 line_number, int64 offset, rstring line>', credentials=credentials))
+
+    Example of reading gzip, zstd or bz2 compressed objects and objects without compression::
+
+        import streamsx.objectstorage as cos
+
+        lines = scanned.map(cos.Read(bucket=bucket, endpoint=endpoint, compression='auto'))
+
+    Example of reading lines in batches of 10000 lines processed with a single call::
+
+        import streamsx.objectstorage as cos
+
+        batches = scanned.map(cos.Read(bucket=bucket, endpoint=endpoint, batch_lines=10000))
+        counts = batches.map(lambda lines: len(lines))
+
+    .. versionadded:: 1.5
+
+    Attributes
+    ----------
+    bucket : str
+        Bucket name. Bucket must have been created in your Cloud Object Storage service before using this class.
+    endpoint : str
+        Endpoint for Cloud Object Storage. Select the endpoint for your bucket location and resiliency: `IBM® Cloud Object Storage Endpoints <https://console.bluemix.net/docs/services/cloud-object-storage/basics/endpoints.html>`_. Use a private enpoint when running in IBM cloud Streaming Analytics service.
+    credentials : str|dict
+        Credentials as dict or name of the application configuration containing the credentials for Cloud Object Storage. When set to ``None`` the application configuration ``cos`` is used.
+    protocol: str
+        Protocol used by the S3 client, either ``cos`` (IAM and HMAC authentication supported) or  ``s3a`` (requires HMAC authentication). Protocol ``s3a`` supports multipart upload. `Protocol selection <https://ibmstreams.github.io/streamsx.objectstorage/doc/spldoc/html/tk$com.ibm.streamsx.objectstorage/tk$com.ibm.streamsx.objectstorage$19.html>`_
+    options : kwargs
+        The additional optional parameters as variable keyword arguments.
+
+    Returns:
+        :py:class:`topology_ref:streamsx.topology.topology.Stream`: Object content line by line with schema ``CommonSchema.String``, in blocks with schema ``tuple<blob data>`` when ``block_size`` is set, line by line with the structured schema set with ``schema``, as lists of lines with schema ``CommonSchema.Python`` when ``batch_lines`` is set, or in batches of lines with schema ``tuple<rstring object_name, blob data, list<int64> offsets>`` when ``batch_bytes`` is set.
+
+    .. note:: With the ``schema``, ``batch_lines``, ``batch_bytes`` or ``compression`` options the composite runs as Python operator and requires the package ``boto3`` (``ibm-cos-sdk`` for IAM authentication), and ``zstandard`` for ``zstd`` compressed objects, in the Python environment of the Streams instance.
+    """
+    def __init__(self, bucket, endpoint, credentials=None, protocol='cos', **options):
+        self.bucket = bucket
+        self.endpoint = endpoint
+        self.credentials = credentials
+        if (protocol != 'cos' and protocol != 's3a'):
+            raise ValueError("Set 'cos' or 's3a' for the protocol parameter.")
+        else:
+            self.protocol = protocol
+
+        self.ssl_enabled = None
+        self.vm_arg = None
+        self.block_size = None
+        self.encoding = None
+        self.schema = None
+        self.batch_lines = None
+        self.batch_bytes = None
+        self.compression = None
+        if 'ssl_enabled' in options:
+            self.ssl_enabled = options.get('ssl_enabled')
+        if 'vm_arg' in options:
+            self.vm_arg = options.get('vm_arg')
+        if 'block_size' in options:
+            self.block_size = options.get('block_size')
+        if 'encoding' in options:
+            self.encoding = options.get('encoding')
+        if 'schema' in options:
+            self.schema = options.get('schema')
+        if 'batch_lines' in options:
+            self.batch_lines = options.get('batch_lines')
+        if 'batch_bytes' in options:
+            self.batch_bytes = options.get('batch_bytes')
+        if 'compression' in options:
+            self.compression = options.get('compression')
+
+    @property
+    def vm_arg(self):
+        """
+            str: Arbitrary JVM arguments can be passed. For example, increase JVM's maximum heap size ``'-Xmx 8192m'``.
+        """
+        return self._vm_arg
+
+    @vm_arg.setter
+    def vm_arg(self, value):
+        self._vm_arg = value
+
+    @property
+    def ssl_enabled(self):
+        """
+            bool: Set to ``False`` if you want to use HTTP instead of HTTPS. Per default SSL is enabled and HTTPS is used.
+        """
+        return self._ssl_enabled
+
+    @ssl_enabled.setter
+    def ssl_enabled(self, value):
+        self._ssl_enabled = value
+
+    @property
+    def block_size(self):
+        """
+            int: Size in bytes of the blocks emitted as ``blob`` attribute ``data`` in binary mode. By default the object is read line by line.
+        """
+        return self._block_size
+
+    @block_size.setter
+    def block_size(self, value):
+        self._block_size = value
+
+    @property
+    def encoding(self):
+        """
+            str: Character encoding of the objects, for example ``'ISO-8859-1'``. Default is ``UTF-8``.
+        """
+        return self._encoding
+
+    @encoding.setter
+    def encoding(self, value):
+        self._encoding = value
+
+    @property
+    def schema(self):
+        """
+            StreamSchema|str: Structured schema of the output stream with the attributes ``object_name``, ``line_number``, ``offset`` and ``line``. By default lines are emitted with schema ``CommonSchema.String``.
+        """
+        return self._schema
+
+    @schema.setter
+    def schema(self, value):
+        self._schema = value
+
+    @property
+    def batch_lines(self):
+        """
+            int: Maximum number of lines of an object emitted per tuple as ``list`` with schema ``CommonSchema.Python``. By default each line is emitted as a tuple.
+        """
+        return self._batch_lines
+
+    @batch_lines.setter
+    def batch_lines(self, value):
+        self._batch_lines = value
+
+    @property
+    def batch_bytes(self):
+        """
+            int: Maximum size in bytes of the lines of an object emitted per tuple with schema ``tuple<rstring object_name, blob data, list<int64> offsets>``. By default each line is emitted as a tuple.
+        """
+        return self._batch_bytes
+
+    @batch_bytes.setter
+    def batch_bytes(self, value):
+        self._batch_bytes = value
+
+    @property
+    def compression(self):
+        """
+            str: Compression of the objects, one of ``gzip``, ``zstd`` or ``bz2``, or ``auto`` to detect the compression of each object. By default the objects are read without decompression.
+        """
+        return self._compression
+
+    @compression.setter
+    def compression(self, value):
+        self._compression = value
+
+    def _checked_compression(self):
+        return None if self.compression is None else _check_compression(self.compression, list(_COMPRESSION_EXTENSIONS) + ['auto'])
+
+    def _read_batches(self, stream, name):
+        if self.block_size is not None:
+            raise ValueError("Set either block_size or batch_lines and batch_bytes.")
+        if self.schema is not None and self.schema is not CommonSchema.String:
+            raise ValueError("Set either schema or batch_lines and batch_bytes.")
+        batch_lines = None if self.batch_lines is None else _check_positive_int(self.batch_lines, 'batch_lines')
+        batch_bytes = None if self.batch_bytes is None else _check_positive_int(self.batch_bytes, 'batch_bytes')
+        reader = streamsx.objectstorage._functions._BatchReader(self.bucket, self.endpoint, self.credentials, self.ssl_enabled, 'UTF-8' if self.encoding is None else self.encoding, batch_lines, batch_bytes, self._checked_compression())
+        batches = stream.flat_map(reader, name=name)
+        return batches if batch_bytes is None else batches.map(schema=_BATCH_SCHEMA)
+
+    def populate(self, topology, stream, schema, name, **options):
+        app_config_name = self.credentials
+        # check if it's the credentials for the service
+        if isinstance(self.credentials, dict):
+            app_config_name = None
+
+        if self.batch_lines is not None or self.batch_bytes is not None:
+            return self._read_batches(stream, name)
+
+        if self.schema is not None and self.schema is not CommonSchema.String:
+            if self.block_size is not None:
+                raise ValueError("Set either block_size or schema.")
+            reader = streamsx.objectstorage._functions._LineReader(self.bucket, self.endpoint, self.credentials, self.ssl_enabled, 'UTF-8' if self.encoding is None else self.encoding, self._checked_compression())
+            return stream.flat_map(reader, name=name).map(schema=_check_line_schema(self.schema))
+
+        if self.compression is not None:
+            if self.block_size is not None:
+                raise ValueError("Set either block_size or compression.")
+            reader = streamsx.objectstorage._functions._LineReader(self.bucket, self.endpoint, self.credentials, self.ssl_enabled, 'UTF-8' if self.encoding is None else self.encoding, self._checked_compression(), structured=False)
+            return stream.flat_map(reader, name=name).as_string()
+
+        _op = _ObjectStorageSource(stream, _read_schema(self.block_size), endpoint = self.endpoint, appConfigName = app_config_name, vmArg = self.vm_arg, name = name)
+        _op.params['objectStorageURI'] = self.protocol+'://'+self.bucket
+        if self.block_size is not None:
+            _op.params['blockSize'] = streamsx.spl.types.int32(self.block_size)
+        if self.encoding is not None:
+            _op.params['encoding'] = self.encoding
+
+        if isinstance(self.credentials, dict):
+            access_key_id, secret_access_key = _read_hmac_credentials(self.credentials)
+            if access_key_id is not None and secret_access_key is not None:
+                _op.params['objectStorageUser'] = access_key_id
+                _op.params['objectStoragePassword'] = secret_access_key
+            else:
+                _op.params['credentials'] = json.dumps(self.credentials)
+
+        if self.ssl_enabled is not None:
+            if self.ssl_enabled is False:
+                _add_toolkit_dependency(topology, '[1.10.0,3.0.0)')
+                _op.params['sslEnabled'] =  _op.expression('false')
+
+        return _op.outputs[0]
+
+
+class ParallelRead(Read):
+    """Read objects in a bucket with parallel readers.
+
+    Distributes the object names of the input stream across ``width`` parallel reader channels and emits the content of the objects. Expects ``CommonSchema.String`` in the input stream.
+    Object names are hash partitioned, an object is always read by a single channel, the channels read different objects concurrently.
+
+    With ``split_size`` the objects are split into byte ranges that are distributed across the channels. Splits are aligned on line boundaries, a line is emitted by the split it starts in. The input stream can be the structured output of :py:class:`Scan` with the attributes ``object_name`` and ``size`` to avoid a request per object for its size, the schema can contain the attributes ``object_name``, ``offset`` and ``line``.
+    With ``grouped`` the returned stream is not merged, transformations applied to it run in the channels and receive the content of each object or split contiguously and in order. End the region with :py:meth:`~streamsx.topology.topology.Stream.end_parallel`.
+
+    Example of reading the objects found by a scan with eight readers::
+
+        import streamsx.objectstorage as cos
+
+        scanned = topo.source(cos.Scan(bucket=bucket, endpoint=endpoint, directory='/archive'))
+        r = scanned.map(cos.ParallelRead(bucket=bucket, endpoint=endpoint, width=8))
+
+    Example of reading large objects in splits of 256 MB with the object sizes listed by the scan::
+
+        scanned = topo.source(cos.Scan(bucket=bucket, endpoint=endpoint, directory='/archive', schema='tuple<rstring object_name, int64 size>'))
+        r = scanned.map(cos.ParallelRead(bucket=bucket, endpoint=endpoint, width=8, split_size=256*1024*1024))
+
+    .. versionadded:: 1.6
+
+    Attributes
+    ----------
+    bucket : str
+        Bucket name. Bucket must have been created in your Cloud Object Storage service before using this class.
+    endpoint : str
+        Endpoint for Cloud Object Storage. Select the endpoint for your bucket location and resiliency: `IBM® Cloud Object Storage Endpoints <https://console.bluemix.net/docs/services/cloud-object-storage/basics/endpoints.html>`_. Use a private enpoint when running in IBM cloud Streaming Analytics service.
+    width : int
+        Number of parallel reader channels.
+    credentials : str|dict
+        Credentials as dict or name of the application configuration containing the credentials for Cloud Object Storage. When set to ``None`` the application configuration ``cos`` is used.
+    protocol: str
+        Protocol used by the S3 client, either ``cos`` (IAM and HMAC authentication supported) or  ``s3a`` (requires HMAC authentication). Protocol ``s3a`` supports multipart upload. `Protocol selection <https://ibmstreams.github.io/streamsx.objectstorage/doc/spldoc/html/tk$com.ibm.streamsx.objectstorage/tk$com.ibm.streamsx.objectstorage$19.html>`_
+    options : kwargs
+        The additional optional parameters as variable keyword arguments, all options of :py:class:`Read` are supported.
+
+    Returns:
+        :py:class:`topology_ref:streamsx.topology.topology.Stream`: Object content with the schema of :py:class:`Read`.
+
+    .. note:: With ``split_size`` the composite runs as Python operator and requires the package ``boto3`` (``ibm-cos-sdk`` for IAM authentication) in the Python environment of the Streams instance.
+    """
+    def __init__(self, bucket, endpoint, width, credentials=None, protocol='cos', **options):
+        super(ParallelRead, self).__init__(bucket, endpoint, credentials, protocol, **options)
+        self.width = width
+        self.grouped = None
+        self.split_size = None
+        if 'grouped' in options:
+            self.grouped = options.get('grouped')
+        if 'split_size' in options:
+            self.split_size = options.get('split_size')
+
+    @property
+    def grouped(self):
+        """
+            bool: Set to ``True`` to keep the returned stream in the parallel region with the content of each object in order. By default the output of the channels is merged.
+        """
+        return self._grouped
+
+    @grouped.setter
+    def grouped(self, value):
+        self._grouped = value
+
+    @property
+    def split_size(self):
+        """
+            int: Size in bytes of the ranges the objects are split into, so a large object is read by all channels. By default each object is read by a single channel.
+        """
+        return self._split_size
+
+    @split_size.setter
+    def split_size(self, value):
+        self._split_size = value
+
+    def _read_splits(self, stream, name):
+        if not is_common(stream.oport.schema):
+            _check_attributes(stream, 'object_name', 'split_size')
+        if self.block_size is not None:
+            raise ValueError("Set either block_size or split_size.")
+        if self.batch_lines is not None or self.batch_bytes is not None:
+            raise ValueError("Set either split_size or batch_lines and batch_bytes.")
+        if self.compression is not None:
+            raise ValueError("Compressed objects cannot be split, set either split_size or compression.")
+        structured = self.schema is not None and self.schema is not CommonSchema.String
+        out_schema = _check_schema_attributes(self.schema, _SPLIT_LINE_ATTRIBUTES) if structured else CommonSchema.String
+        splitter = streamsx.objectstorage._functions._ObjectSplitter(self.bucket, self.endpoint, self.credentials, self.ssl_enabled, _check_positive_int(self.split_size, 'split_size'))
+        splits = _parallel(self, stream.flat_map(splitter), self.width, routing=streamsx.topology.topology.Routing.ROUND_ROBIN)
+        reader = streamsx.objectstorage._functions._RangeLineReader(self.bucket, self.endpoint, self.credentials, self.ssl_enabled, 'UTF-8' if self.encoding is None else self.encoding, structured)
+        lines = splits.flat_map(reader, name=name)
+        return lines.map(schema=out_schema) if structured else lines.as_string()
+
+    def populate(self, topology, stream, schema, name, **options):
+        if self.split_size is not None:
+            content = self._read_splits(stream, name)
+        else:
+            # all content of an object is read by the same channel
+            object_names = _parallel(self, stream, self.width, routing=streamsx.topology.topology.Routing.HASH_PARTITIONED)
+            content = super(ParallelRead, self).populate(topology, object_names, schema, name, **options)
+        if self.grouped:
+            return content
+        return content.end_parallel()
+
+
+class ReadParquet(streamsx.topology.composite.Map):
+    """Read objects in parquet format.
+
+    Reads the parquet object specified in the input stream and emits a tuple for each row. Expects ``CommonSchema.String`` in the input stream.
+
+    Only the column chunks of the requested columns are fetched from the object. Row groups are skipped without being fetched when the min/max statistics of a row group do not match the ``filters``.
+
+    Example of reading the columns ``ts`` and ``value`` of all rows with ``region`` ``eu`` from the objects in the ``scanned`` stream::
+
+        import streamsx.objectstorage as cos
+
+        r = scanned.map(cos.ReadParquet(bucket=bucket, endpoint=endpoint, schema='tuple<int64 ts, float64 value>', filters=[('region', '=', 'eu')], credentials=credentials))
+
+    .. versionadded:: 1.6
+
+    Attributes
+    ----------
+    bucket : str
+        Bucket name. Bucket must have been created in your Cloud Object Storage service before using this class.
+    endpoint : str
+        Endpoint for Cloud Object Storage. Select the endpoint for your bucket location and resiliency: `IBM® Cloud Object Storage Endpoints <https://console.bluemix.net/docs/services/cloud-object-storage/basics/endpoints.html>`_. Use a private enpoint when running in IBM cloud Streaming Analytics service.
+    schema : StreamSchema|str
+        Schema of the output stream. Parquet columns are mapped to the attributes with the same name.
+    columns : list(str)
+        Names of the parquet columns to read. Defaults to the attribute names of ``schema``.
+    filters : list(tuple)
+        Rows are emitted only if all filters match. A filter is a tuple ``(column, op, value)`` with ``op`` one of ``=``, ``==``, ``!=``, ``<``, ``<=``, ``>``, ``>=`` or ``in``.
+    credentials : str|dict
+        Credentials as dict or name of the application configuration containing the credentials for Cloud Object Storage. When set to ``None`` the application configuration ``cos`` is used.
+    protocol: str
+        Protocol used by the S3 client, either ``cos`` (IAM and HMAC authentication supported) or  ``s3a`` (requires HMAC authentication).
+    options : kwargs
+        The additional optional parameters as variable keyword arguments.
+
+    Returns:
+        :py:class:`topology_ref:streamsx.topology.topology.Stream`: Rows of the objects with schema ``schema``.
+
+    .. note:: The composite runs as Python operator and requires the packages ``pyarrow`` and ``boto3`` (``ibm-cos-sdk`` for IAM authentication) in the Python environment of the Streams instance.
+    """
+    def __init__(self, bucket, endpoint, schema, columns=None, filters=None, credentials=None, protocol='cos', **options):
+        self.bucket = bucket
+        self.endpoint = endpoint
+        self.schema = schema
+        self.columns = columns
+        self.filters = streamsx.objectstorage._functions._check_filters(filters)
+        self.credentials = credentials
+        if (protocol != 'cos' and protocol != 's3a'):
+            raise ValueError("Set 'cos' or 's3a' for the protocol parameter.")
+        else:
+            self.protocol = protocol
+
+        self.ssl_enabled = None
+        if 'ssl_enabled' in options:
+            self.ssl_enabled = options.get('ssl_enabled')
+
+    @property
+    def ssl_enabled(self):
+        """
+            bool: Set to ``False`` if you want to use HTTP instead of HTTPS. Per default SSL is enabled and HTTPS is used.
+        """
+        return self._ssl_enabled
+
+    @ssl_enabled.setter
+    def ssl_enabled(self, value):
+        self._ssl_enabled = value
+
+    def populate(self, topology, stream, schema, name, **options):
+        columns = self.columns
+        if columns is None:
+            columns = _attribute_names(self.schema)
+
+        reader = streamsx.objectstorage._functions._ParquetReader(self.bucket, self.endpoint, self.credentials, self.ssl_enabled, columns, self.filters)
+        rows = stream.flat_map(reader, name=name)
+        return rows.map(schema=self.schema)
+
+
+class Write(streamsx.topology.composite.ForEach):
+    """Write strings to an object.
+
+    Adds a COS-Writer where each tuple on `stream` is
+    written into an object.
+
+    Expects ``CommonSchema.String`` in the input stream. With the ``partition_by`` or ``object_name_attribute`` options a structured stream is expected with one ``rstring`` attribute containing the data or the ``data_attribute`` option. An object is written per partition or object name and is open until it is closed by the rollover policy, the partition attributes are not written to the object.
+
+    With ``width`` the stream is distributed round-robin to the channels and each channel writes its own objects, for example ``hw%OBJECTNUM.txt`` is written as ``hw0_%OBJECTNUM.txt``, ``hw1_%OBJECTNUM.txt`` and so on. If the object name does not contain ``%OBJECTNUM`` the channel number is appended to the name before the extension. All tuples of a partition or object name are written by the same channel.
+
+    With ``compression`` the lines are compressed while the object is written and uploaded in parts, ``bytes_per_object`` applies to the compressed size. Objects are named with the ``%OBJECTNUM`` variable, the ``partition_by``, ``object_name_attribute``, ``data_attribute`` and ``close_on_punct`` options, the ``s3a`` protocol and the options of the Java operator (``vm_arg``, ``auto_heap``, ``memory_limit``, ``tuple_rate``, ``tuple_size``, ``open_objects`` and the ``s3a_*`` options) are not supported. :py:class:`Read` decompresses the objects with its ``compression`` option.
+
+    With ``auto_heap`` the heap size of the JVM is estimated from the size of the objects given by the rollover policy (the checkpoint period in a consistent region), ``tuple_rate`` and ``tuple_size``, the multipart upload buffers and ``open_objects``. When ``tuple_rate`` is not set, objects closed by time only are assumed to reach the upload buffer size. With the ``array`` and ``bytebuffer`` upload buffers the memory per object is bounded by ``s3a_fast_upload_active_blocks`` times ``s3a_multipart_size``. The ``-Xmx`` option (and ``-XX:MaxDirectMemorySize`` for ``bytebuffer``) is added to ``vm_arg``, which must not set the heap size, and a warning is issued when the estimate exceeds ``memory_limit``.
+
+    Lines can be written in batches to reduce the cost per line: a ``CommonSchema.Python`` stream with a list of lines per tuple is written with a single append per list. A structured stream whose ``data_attribute`` holds newline separated lines, for example ``tuple<rstring lines, int32 count>``, is written the same way. The ``tuples_per_object`` rollover policy counts batches in this case.
+
+    The sink can be part of a consistent region started upstream with :py:meth:`~streamsx.topology.topology.Stream.set_consistent`, set the region before the sink is added. A sink downstream of :py:meth:`~streamsx.topology.topology.Stream.autonomous` is not part of the region. In a consistent region an object is closed when the region is drained and holds the tuples processed since the previous checkpoint, the ``time_per_object``, ``bytes_per_object``, ``tuples_per_object`` and ``close_on_punct`` options are not supported. An object is visible only when it is closed, the tuples processed after the last checkpoint are not in any object when the region is reset and are written once when they are replayed. With ``compression`` the object number is part of the checkpoint, the multipart uploads started after the checkpoint are aborted when the region is reset and the open object is completed when the processing element is shut down.
+
+    Example of creating an object with two lines::
+
+        import streamsx.objectstorage as cos
+        to_cos = topo.source(['Hello', 'World!'])
+        to_cos = to_cos.as_string()
+        to_cos.for_each(cos.Write(bucket, endpoint, '/sample/hw%OBJECTNUM.txt'))
+
+    Example of writing batches of lines::
+
+        batches = topo.source(lambda: (['event %d' % i for i in range(n, n + 1000)] for n in range(0, 1000000, 1000)))
+        batches.for_each(cos.Write(bucket, endpoint, '/events/e%OBJECTNUM.txt', bytes_per_object=128*1024*1024))
+
+    Example of writing gzip compressed objects ``/logs/l0.txt.gz``, ``/logs/l1.txt.gz``, ...::
+
+        lines.for_each(cos.Write(bucket, endpoint, '/logs/l%OBJECTNUM.txt', time_per_object=300, compression='gzip'))
+
+    Example of writing the lines of a consistent region, an object is created per checkpoint every 60 seconds::
+
+        from streamsx.topology.state import ConsistentRegionConfig
+        lines = topo.source(LogTail()).set_consistent(ConsistentRegionConfig.periodic(60)).as_string()
+        lines.for_each(cos.Write(bucket, endpoint, '/logs/l%OBJECTNUM.txt', credentials=hmac_credentials, protocol='s3a'))
+
+    .. versionadded:: 1.5
+
+    Attributes
+    ----------
+    bucket : str
+        Bucket name. Bucket must have been created in your Cloud Object Storage service before using this class.
+    endpoint : str
+        Endpoint for Cloud Object Storage. Select the endpoint for your bucket location and resiliency: `IBM® Cloud Object Storage Endpoints <https://console.bluemix.net/docs/services/cloud-object-storage/basics/endpoints.html>`_. Use a private enpoint when running in IBM cloud Streaming Analytics service.
+    object : str
+        Name of the object to be created in your bucket. For example, ``SAMPLE_%OBJECTNUM.text``, %OBJECTNUM is an object number, starting at 0. When a new object is opened for writing the number is incremented.
+    time_per_object : int|float|datetime.timedelta
+        Specifies the approximate time, in seconds, after which the current output object is closed and a new object is opened for writing. Can be combined with the ``bytes_per_object``, ``tuples_per_object`` and ``close_on_punct`` options, the object is closed when the first of the limits is reached. If no rollover policy is set, the object is closed after 10 seconds.
+    credentials : str|dict
+        Credentials as dict or name of the application configuration containing the credentials for Cloud Object Storage. When set to ``None`` the application configuration ``cos`` is used.
+    protocol: str
+        Protocol used by the S3 client, either ``cos`` (IAM and HMAC authentication supported) or  ``s3a`` (requires HMAC authentication). Protocol ``s3a`` supports multipart upload. `Protocol selection <https://ibmstreams.github.io/streamsx.objectstorage/doc/spldoc/html/tk$com.ibm.streamsx.objectstorage/tk$com.ibm.streamsx.objectstorage$19.html>`_
+    options : kwargs
+        The additional optional parameters as variable keyword arguments.
+
+    Returns:
+        :py:class:`topology_ref:streamsx.topology.topology.Sink`: Stream termination.
+
+    .. note:: With ``compression`` the composite runs as Python operator and requires the package ``boto3`` (``ibm-cos-sdk`` for IAM authentication), and ``zstandard`` for ``zstd``, in the Python environment of the Streams instance.
+    """
+    def __init__(self, bucket, endpoint, object, time_per_object=None, credentials=None, protocol='cos', **options):
+        self.bucket = bucket
+        self.endpoint = endpoint
+        self.object = object
+        self.credentials = credentials
+        if (protocol != 'cos' and protocol != 's3a'):
+            raise ValueError("Set 'cos' or 's3a' for the protocol parameter.")
+        else:
+            self.protocol = protocol
+        self.time_per_object = time_per_object
+        self.header = None
+        self.ssl_enabled = None
+        self.vm_arg = None
+        self.width = None
+        self.bytes_per_object = None
+        self.tuples_per_object = None
+        self.close_on_punct = None
+        self.partition_by = None
+        self.object_name_attribute = None
+        self.data_attribute = None
+        self.compression = None
+        if 'header' in options:
+            self.header = options.get('header')
+        if 'ssl_enabled' in options:
+            self.ssl_enabled = options.get('ssl_enabled')
+        if 'vm_arg' in options:
+            self.vm_arg = options.get('vm_arg')
+        if 'width' in options:
+            self.width = options.get('width')
+        if 'bytes_per_object' in options:
+            self.bytes_per_object = options.get('bytes_per_object')
+        if 'tuples_per_object' in options:
+            self.tuples_per_object = options.get('tuples_per_object')
+        if 'close_on_punct' in options:
+            self.close_on_punct = options.get('close_on_punct')
+        if 'partition_by' in options:
+            self.partition_by = options.get('partition_by')
+        if 'object_name_attribute' in options:
+            self.object_name_attribute = options.get('object_name_attribute')
+        if 'data_attribute' in options:
+            self.data_attribute = options.get('data_attribute')
+        if 'compression' in options:
+            self.compression = options.get('compression')
+        self.s3a_multipart_size = None
+        self.s3a_fast_upload_buffer = None
+        self.s3a_fast_upload_active_blocks = None
+        self.s3a_upload_threads = None
+        if 's3a_multipart_size' in options:
+            self.s3a_multipart_size = options.get('s3a_multipart_size')
+        if 's3a_fast_upload_buffer' in options:
+            self.s3a_fast_upload_buffer = options.get('s3a_fast_upload_buffer')
+        if 's3a_fast_upload_active_blocks' in options:
+            self.s3a_fast_upload_active_blocks = options.get('s3a_fast_upload_active_blocks')
+        if 's3a_upload_threads' in options:
+            self.s3a_upload_threads = options.get('s3a_upload_threads')
+        self.auto_heap = None
+        self.tuple_rate = None
+        self.tuple_size = None
+        self.open_objects = None
+        self.memory_limit = None
+        if 'auto_heap' in options:
+            self.auto_heap = options.get('auto_heap')
+        if 'tuple_rate' in options:
+            self.tuple_rate = options.get('tuple_rate')
+        if 'tuple_size' in options:
+            self.tuple_size = options.get('tuple_size')
+        if 'open_objects' in options:
+            self.open_objects = options.get('open_objects')
+        if 'memory_limit' in options:
+            self.memory_limit = options.get('memory_limit')
+
+    @property
+    def header(self):
+        """
+            str: Specify the content of the header row. This header is added as first line in the object. Use this parameter when writing strings in CSV format and you like to query the objects with the IBM SQL Query service. By default no header row is generated.
+        """
+        return self._header
+
+    @header.setter
+    def header(self, value):
+        self._header = value
+
+    @property
+    def vm_arg(self):
+        """
+            str: Arbitrary JVM arguments can be passed. For example, increase JVM's maximum heap size ``'-Xmx 8192m'``.
+        """
+        return self._vm_arg
+
+    @vm_arg.setter
+    def vm_arg(self, value):
+        self._vm_arg = value
+
+    @property
+    def ssl_enabled(self):
+        """
+            bool: Set to ``False`` if you want to use HTTP instead of HTTPS. Per default SSL is enabled and HTTPS is used.
+        """
+        return self._ssl_enabled
+
+    @ssl_enabled.setter
+    def ssl_enabled(self, value):
+        self._ssl_enabled = value
+
+    @property
+    def width(self):
+        """
+            int: Number of parallel channels writing objects, the channel number is inserted into the object name in front of ``%OBJECTNUM``. By default a single channel is used.
+        """
+        return self._width
+
+    @width.setter
+    def width(self, value):
+        self._width = value
+
+    @property
+    def bytes_per_object(self):
+        """
+            int: Specifies the approximate size of the output object, in bytes. When the size is exceeded, the current output object is closed and a new object is opened for writing.
+        """
+        return self._bytes_per_object
+
+    @bytes_per_object.setter
+    def bytes_per_object(self, value):
+        self._bytes_per_object = value
+
+    @property
+    def tuples_per_object(self):
+        """
+            int: Specifies the maximum number of tuples written to each output object. When the number is reached, the current output object is closed and a new object is opened for writing.
+        """
+        return self._tuples_per_object
+
+    @tuples_per_object.setter
+    def tuples_per_object(self, value):
+        self._tuples_per_object = value
+
+    @property
+    def close_on_punct(self):
+        """
+            bool: Set to ``True`` to close the current output object when a window punctuation marker is received.
+        """
+        return self._close_on_punct
+
+    @close_on_punct.setter
+    def close_on_punct(self, value):
+        self._close_on_punct = value
+
+    @property
+    def partition_by(self):
+        """
+            list(str): Names of the attributes whose values partition the objects into Hive-style prefixes ``attribute=value/``, for example ``date=2020-05-17/region=eu/``.
+        """
+        return self._partition_by
+
+    @partition_by.setter
+    def partition_by(self, value):
+        self._partition_by = value
+
+    @property
+    def object_name_attribute(self):
+        """
+            str: Name of the ``rstring`` attribute containing the name of the object the tuple is written to. Set ``object`` to ``None`` when this option is used.
+        """
+        return self._object_name_attribute
+
+    @object_name_attribute.setter
+    def object_name_attribute(self, value):
+        self._object_name_attribute = value
+
+    @property
+    def data_attribute(self):
+        """
+            str: Name of the attribute containing the data written to the object, required when the stream has other attributes than ``object_name_attribute`` and ``partition_by``.
+        """
+        return self._data_attribute
+
+    @data_attribute.setter
+    def data_attribute(self, value):
+        self._data_attribute = value
+
+    @property
+    def compression(self):
+        """
+            str: Compression of the objects, one of ``gzip``, ``zstd`` or ``bz2``, the extension ``.gz``, ``.zst`` or ``.bz2`` is appended to the object name. By default objects are not compressed.
+        """
+        return self._compression
+
+    @compression.setter
+    def compression(self, value):
+        self._compression = value
+
+    @property
+    def s3a_multipart_size(self):
+        """
+            int: Size in bytes of the parts of a multipart upload with protocol ``s3a``, at least 5 MB. Default is 64 MB (``fs.s3a.multipart.size``).
+        """
+        return self._s3a_multipart_size
+
+    @s3a_multipart_size.setter
+    def s3a_multipart_size(self, value):
+        self._s3a_multipart_size = value
+
+    @property
+    def s3a_fast_upload_buffer(self):
+        """
+            str: Buffer for the parts waiting for upload with protocol ``s3a``, one of ``disk``, ``array`` (JVM heap) or ``bytebuffer`` (direct memory). Default is ``disk`` (``fs.s3a.fast.upload.buffer``).
+        """
+        return self._s3a_fast_upload_buffer
+
+    @s3a_fast_upload_buffer.setter
+    def s3a_fast_upload_buffer(self, value):
+        self._s3a_fast_upload_buffer = value
+
+    @property
+    def s3a_fast_upload_active_blocks(self):
+        """
+            int: Maximum number of parts of an object buffered or uploading at the same time with protocol ``s3a``. Default is 4 (``fs.s3a.fast.upload.active.blocks``).
+        """
+        return self._s3a_fast_upload_active_blocks
+
+    @s3a_fast_upload_active_blocks.setter
+    def s3a_fast_upload_active_blocks(self, value):
+        self._s3a_fast_upload_active_blocks = value
+
+    @property
+    def s3a_upload_threads(self):
+        """
+            int: Number of threads uploading parts in parallel with protocol ``s3a``. Default is the S3A client default (``fs.s3a.threads.max``).
+        """
+        return self._s3a_upload_threads
+
+    @s3a_upload_threads.setter
+    def s3a_upload_threads(self, value):
+        self._s3a_upload_threads = value
+
+    @property
+    def auto_heap(self):
+        """
+            bool: Set to ``True`` to add the maximum heap size of the JVM, estimated from the content buffered by the sink, to ``vm_arg``. By default the JVM default heap size is used.
+        """
+        return self._auto_heap
+
+    @auto_heap.setter
+    def auto_heap(self, value):
+        self._auto_heap = value
+
+    @property
+    def tuple_rate(self):
+        """
+            int|float: Expected number of tuples per second written by the sink, used by ``auto_heap`` to estimate the size of the objects closed by ``time_per_object``.
+        """
+        return self._tuple_rate
+
+    @tuple_rate.setter
+    def tuple_rate(self, value):
+        self._tuple_rate = value
+
+    @property
+    def tuple_size(self):
+        """
+            int: Expected average size in bytes of a tuple written to the objects, used by ``auto_heap``. Default is 1024.
+        """
+        return self._tuple_size
+
+    @tuple_size.setter
+    def tuple_size(self, value):
+        self._tuple_size = value
+
+    @property
+    def open_objects(self):
+        """
+            int: Expected number of objects open at the same time, for example the number of partitions written concurrently, used by ``auto_heap``. Default is 1.
+        """
+        return self._open_objects
+
+    @open_objects.setter
+    def open_objects(self, value):
+        self._open_objects = value
+
+    @property
+    def memory_limit(self):
+        """
+            int: Memory limit in bytes of the container running the sink, with ``auto_heap`` a warning is issued when the estimated memory of the JVM exceeds it.
+        """
+        return self._memory_limit
+
+    @memory_limit.setter
+    def memory_limit(self, value):
+        self._memory_limit = value
+
+    def _write_compressed(self, stream, name, consistent):
+        compression = _check_compression(self.compression, list(_COMPRESSION_EXTENSIONS))
+        if self.partition_by is not None or self.object_name_attribute is not None or self.data_attribute is not None or self.close_on_punct:
+            raise ValueError("Options partition_by, object_name_attribute, data_attribute and close_on_punct are not supported with compression.")
+        if stream.oport.schema != CommonSchema.String:
+            raise ValueError("Set compression for a stream with schema CommonSchema.String or CommonSchema.Python.")
+        # options of the Java operator, compressed objects are written by a Python operator
+        jvm_options = ['vm_arg', 'auto_heap', 'memory_limit', 'tuple_rate', 'tuple_size', 'open_objects', 's3a_multipart_size', 's3a_fast_upload_buffer', 's3a_fast_upload_active_blocks', 's3a_upload_threads']
+        if self.protocol != 'cos' or any(getattr(self, option) is not None for option in jvm_options):
+            raise ValueError("Options protocol='s3a', " + ', '.join(jvm_options) + " are not supported with compression.")
+        time_per_object = self.time_per_object
+        # objects are closed every 10 seconds when no rollover policy is set
+        if time_per_object is None and self.bytes_per_object is None and self.tuples_per_object is None and not consistent:
+            time_per_object = 10.0
+        time_per_object = None if time_per_object is None else _check_time_per_object(time_per_object)
+        bytes_per_object = None if self.bytes_per_object is None else _check_positive_int(self.bytes_per_object, 'bytes_per_object')
+        tuples_per_object = None if self.tuples_per_object is None else _check_positive_int(self.tuples_per_object, 'tuples_per_object')
+        object = self.object
+        if self.width is not None and _check_width(self.width) > 1:
+            stream = _parallel(self, stream, self.width)
+            head, tail = _split_object_name(object)
+            object = head + '%CHANNEL' + tail
+        extension = _COMPRESSION_EXTENSIONS[compression]
+        if not object.endswith(extension):
+            object += extension
+        writer = streamsx.objectstorage._functions._CompressedWriter(self.bucket, self.endpoint, self.credentials, self.ssl_enabled, object, compression, self.header, time_per_object, bytes_per_object, tuples_per_object, consistent)
+        return stream.for_each(writer, name=name)
+
+    def populate(self, topology, stream, name, **options) -> streamsx.topology.topology.Sink:
+        app_config_name = self.credentials
+        # check if it's the credentials for the service
+        if isinstance(self.credentials, dict):
+            app_config_name = None
+
+        _check_object(self.object, self.object_name_attribute)
+        region = _consistent_region(stream)
+        if region is not None:
+            _check_consistent_rollover(self)
+        if stream.oport.schema == CommonSchema.Python:
+            stream = stream.map(streamsx.objectstorage._functions._join_lines, schema=CommonSchema.String)
+        if self.compression is not None:
+            return self._write_compressed(stream, name, region is not None)
+        partition_by = _check_attributes(stream, self.partition_by, 'partition_by')
+        object_name_attribute = _check_attributes(stream, self.object_name_attribute, 'object_name_attribute')
+        data_attribute = _check_attributes(stream, self.data_attribute, 'data_attribute')
+        keys = (partition_by or []) + (object_name_attribute or [])
+        if data_attribute is None and keys:
+            data_attribute = [a for a in _attribute_names(stream.oport.schema) if a not in keys]
+            if len(data_attribute) != 1:
+                raise ValueError("Set data_attribute for a stream with more than one attribute in addition to the partition and object name attributes.")
+
+        if self.width is not None and _check_width(self.width) > 1:
+            stream = _parallel(self, stream, self.width, keys)
+
+        _op = _ObjectStorageSink(stream, objectName = self.object, endpoint = self.endpoint, appConfigName = app_config_name, vmArg = self.vm_arg, name = name)
+        if self.width is not None and self.width > 1 and self.object is not None:
+            _op.params['objectName'] = _op.expression(_channel_object_name(self.object))
+        if object_name_attribute is not None:
+            _op.params['objectNameAttribute'] = _op.attribute(stream, object_name_attribute[0])
+        if data_attribute is not None:
+            _op.params['dataAttribute'] = _op.attribute(stream, data_attribute[0])
+        _op.params['storageFormat'] = 'raw'
+        _op.params['objectStorageURI'] = self.protocol+'://'+self.bucket
+        if region is None:
+            _add_rollover_params(_op, self.time_per_object, self.bytes_per_object, self.tuples_per_object, self.close_on_punct)
+        _add_partition_params(_op, partition_by, True)
+        _add_s3a_params(_op, self.protocol, self.vm_arg, self.s3a_multipart_size, self.s3a_fast_upload_buffer, self.s3a_fast_upload_active_blocks, self.s3a_upload_threads)
+        _add_heap_params(_op, self, False, region)
+
+        if self.header is not None:
+            _op.params['headerRow'] = self.header
+
+        if isinstance(self.credentials, dict):
+            access_key_id, secret_access_key = _read_hmac_credentials(self.credentials)
+            if access_key_id is not None and secret_access_key is not None:
+                _op.params['objectStorageUser'] = access_key_id
+                _op.params['objectStoragePassword'] = secret_access_key
+            else:
+                _op.params['credentials'] = json.dumps(self.credentials)
+
+        if self.ssl_enabled is not None:
+            if self.ssl_enabled is False:
+                _add_toolkit_dependency(topology, '[1.10.0,3.0.0)')
+                _op.params['sslEnabled'] =  _op.expression('false')
+
+        return streamsx.topology.topology.Sink(_op)
+
+
+class WriteParquet(streamsx.topology.composite.ForEach):
+    """Create objects in parquet format.
+
+    Adds a COS-Writer where each tuple on `stream` is
+    written into an object in parquet format.
+
+    Expects a structured stream, each attribute is written to a parquet column of the corresponding type. Nested tuple attributes are written as parquet groups and list attributes as repeated fields.
+    Streams of Python objects, dictionaries or named tuples are converted to a structured stream when the ``schema`` option is set.
+
+    With the ``partition_by`` or ``object_name_attribute`` options an object is written per partition or object name and is open until it is closed by the rollover policy. With ``width`` the stream is distributed round-robin to the channels and the channel number is inserted into the object name as for :py:class:`Write`, all tuples of a partition or object name are written by the same channel.
+
+    With ``auto_heap`` the heap size of the JVM is estimated as for :py:class:`Write`, taking the parquet block size into account. When ``tuple_rate`` is not set, objects closed by time only are assumed to reach the parquet block size.
+
+    The sink can be part of a consistent region started upstream with :py:meth:`~streamsx.topology.topology.Stream.set_consistent`, set the region before the sink is added. A sink downstream of :py:meth:`~streamsx.topology.topology.Stream.autonomous` is not part of the region. In a consistent region an object is closed when the region is drained and holds the tuples processed since the previous checkpoint, the ``time_per_object``, ``bytes_per_object``, ``tuples_per_object`` and ``close_on_punct`` options are not supported. An object is visible only when it is closed, the tuples processed after the last checkpoint are not in any object when the region is reset and are written once when they are replayed.
+
+    Example of creating objects in parquet format from a stream named 'js' in JSON format::
+
+        import streamsx.objectstorage as cos
+        ...
+        # JSON to tuple
+        to_cos = js.map(schema='tuple<rstring a, int32 b>')
+        to_cos.for_each(cos.WriteParquet(bucket=bucket, endpoint=endpoint, object='/parquet/sample/hw%OBJECTNUM.parquet'))
+
+    Example of creating objects in parquet format from a stream of Python dictionaries::
+
+        import streamsx.objectstorage as cos
+        ...
+        readings = topo.source(lambda : [{'id': 'sensor1', 'ts': 1589712000, 'value': 20.5}])
+        readings.for_each(cos.WriteParquet(bucket=bucket, endpoint=endpoint, object='/parquet/sample/readings%OBJECTNUM.parquet', schema='tuple<rstring id, int64 ts, float64 value>'))
+
+    Example of uploading large objects in parts of 128 MB by 8 threads, with at most 4 parts of an object in memory::
+
+        to_cos.for_each(cos.WriteParquet(bucket=bucket, endpoint=endpoint, object='/big/p%OBJECTNUM.parquet', credentials=hmac_credentials, protocol='s3a', s3a_multipart_size=128*1024*1024, s3a_fast_upload_buffer='bytebuffer', s3a_fast_upload_active_blocks=4, s3a_upload_threads=8))
+
+    .. versionadded:: 1.5
+
+    Attributes
+    ----------
+    bucket : str
+        Bucket name. Bucket must have been created in your Cloud Object Storage service before using this class.
+    endpoint : str
+        Endpoint for Cloud Object Storage. Select the endpoint for your bucket location and resiliency: `IBM® Cloud Object Storage Endpoints <https://console.bluemix.net/docs/services/cloud-object-storage/basics/endpoints.html>`_. Use a private enpoint when running in IBM cloud Streaming Analytics service.
+    object : str
+        Name of the object to be created in your bucket. For example, ``SAMPLE_%OBJECTNUM.text``, %OBJECTNUM is an object number, starting at 0. When a new object is opened for writing the number is incremented.
+    time_per_object : int|float|datetime.timedelta
+        Specifies the approximate time, in seconds, after which the current output object is closed and a new object is opened for writing. Can be combined with the ``bytes_per_object``, ``tuples_per_object`` and ``close_on_punct`` options, the object is closed when the first of the limits is reached. If no rollover policy is set, the object is closed after 10 seconds.
+    credentials : str|dict
+        Credentials as dict or name of the application configuration containing the credentials for Cloud Object Storage. When set to ``None`` the application configuration ``cos`` is used.
+    protocol: str
+        Protocol used by the S3 client, either ``cos`` (IAM and HMAC authentication supported) or  ``s3a`` (requires HMAC authentication). Protocol ``s3a`` supports multipart upload. `Protocol selection <https://ibmstreams.github.io/streamsx.objectstorage/doc/spldoc/html/tk$com.ibm.streamsx.objectstorage/tk$com.ibm.streamsx.objectstorage$19.html>`_
+    options : kwargs
+        The additional optional parameters as variable keyword arguments.
+
+    Returns:
+        :py:class:`topology_ref:streamsx.topology.topology.Sink`: Stream termination.
+    """
+    def __init__(self, bucket, endpoint, object, time_per_object=None, credentials=None, protocol='cos', **options):
+        self.bucket = bucket
+        self.endpoint = endpoint
+        self.object = object
+        self.credentials = credentials
+        if (protocol != 'cos' and protocol != 's3a'):
+            raise ValueError("Set 'cos' or 's3a' for the protocol parameter.")
+        else:
+            self.protocol = protocol
+        self.time_per_object = time_per_object
+        self.ssl_enabled = None
+        self.vm_arg = None
+        self.width = None
+        self.bytes_per_object = None
+        self.tuples_per_object = None
+        self.close_on_punct = None
+        self.partition_by = None
+        self.object_name_attribute = None
+        self.skip_partition_attributes = None
+        self.parquet_compression = None
+        self.parquet_block_size = None
+        self.parquet_page_size = None
+        self.parquet_dict_page_size = None
+        self.parquet_enable_dict = None
+        self.parquet_writer_version = None
+        self.parquet_enable_schema_validation = None
+        self.schema = None
+        if 'header' in options:
+            self.header = options.get('header')
+        if 'ssl_enabled' in options:
+            self.ssl_enabled = options.get('ssl_enabled')
+        if 'vm_arg' in options:
+            self.vm_arg = options.get('vm_arg')
+        if 'width' in options:
+            self.width = options.get('width')
+        if 'bytes_per_object' in options:
+            self.bytes_per_object = options.get('bytes_per_object')
+        if 'tuples_per_object' in options:
+            self.tuples_per_object = options.get('tuples_per_object')
+        if 'close_on_punct' in options:
+            self.close_on_punct = options.get('close_on_punct')
+        if 'partition_by' in options:
+            self.partition_by = options.get('partition_by')
+        if 'object_name_attribute' in options:
+            self.object_name_attribute = options.get('object_name_attribute')
+        if 'skip_partition_attributes' in options:
+            self.skip_partition_attributes = options.get('skip_partition_attributes')
+        if 'parquet_compression' in options:
+            self.parquet_compression = options.get('parquet_compression')
+        if 'parquet_block_size' in options:
+            self.parquet_block_size = options.get('parquet_block_size')
+        if 'parquet_page_size' in options:
+            self.parquet_page_size = options.get('parquet_page_size')
+        if 'parquet_dict_page_size' in options:
+            self.parquet_dict_page_size = options.get('parquet_dict_page_size')
+        if 'parquet_enable_dict' in options:
+            self.parquet_enable_dict = options.get('parquet_enable_dict')
+        if 'parquet_writer_version' in options:
+            self.parquet_writer_version = options.get('parquet_writer_version')
+        if 'parquet_enable_schema_validation' in options:
+            self.parquet_enable_schema_validation = options.get('parquet_enable_schema_validation')
+        if 'schema' in options:
+            self.schema = options.get('schema')
+        self.s3a_multipart_size = None
+        self.s3a_fast_upload_buffer = None
+        self.s3a_fast_upload_active_blocks = None
+        self.s3a_upload_threads = None
+        if 's3a_multipart_size' in options:
+            self.s3a_multipart_size = options.get('s3a_multipart_size')
+        if 's3a_fast_upload_buffer' in options:
+            self.s3a_fast_upload_buffer = options.get('s3a_fast_upload_buffer')
+        if 's3a_fast_upload_active_blocks' in options:
+            self.s3a_fast_upload_active_blocks = options.get('s3a_fast_upload_active_blocks')
+        if 's3a_upload_threads' in options:
+            self.s3a_upload_threads = options.get('s3a_upload_threads')
+        self.auto_heap = None
+        self.tuple_rate = None
+        self.tuple_size = None
+        self.open_objects = None
+        self.memory_limit = None
+        if 'auto_heap' in options:
+            self.auto_heap = options.get('auto_heap')
+        if 'tuple_rate' in options:
+            self.tuple_rate = options.get('tuple_rate')
+        if 'tuple_size' in options:
+            self.tuple_size = options.get('tuple_size')
+        if 'open_objects' in options:
+            self.open_objects = options.get('open_objects')
+        if 'memory_limit' in options:
+            self.memory_limit = options.get('memory_limit')
+
+    @property
+    def vm_arg(self):
+        """
+            str: Arbitrary JVM arguments can be passed. For example, increase JVM's maximum heap size ``'-Xmx 8192m'``.
+        """
+        return self._vm_arg
+
+    @vm_arg.setter
+    def vm_arg(self, value):
+        self._vm_arg = value
+
+    @property
+    def ssl_enabled(self):
+        """
+            bool: Set to ``False`` if you want to use HTTP instead of HTTPS. Per default SSL is enabled and HTTPS is used.
+        """
+        return self._ssl_enabled
+
+    @ssl_enabled.setter
+    def ssl_enabled(self, value):
+        self._ssl_enabled = value
+
+    @property
+    def width(self):
+        """
+            int: Number of parallel channels writing objects, the channel number is inserted into the object name in front of ``%OBJECTNUM``. By default a single channel is used.
+        """
+        return self._width
+
+    @width.setter
+    def width(self, value):
+        self._width = value
+
+    @property
+    def bytes_per_object(self):
+        """
+            int: Specifies the approximate size of the output object, in bytes. When the size is exceeded, the current output object is closed and a new object is opened for writing.
+        """
+        return self._bytes_per_object
+
+    @bytes_per_object.setter
+    def bytes_per_object(self, value):
+        self._bytes_per_object = value
+
+    @property
+    def tuples_per_object(self):
+        """
+            int: Specifies the maximum number of tuples written to each output object. When the number is reached, the current output object is closed and a new object is opened for writing.
+        """
+        return self._tuples_per_object
+
+    @tuples_per_object.setter
+    def tuples_per_object(self, value):
+        self._tuples_per_object = value
+
+    @property
+    def close_on_punct(self):
+        """
+            bool: Set to ``True`` to close the current output object when a window punctuation marker is received.
+        """
+        return self._close_on_punct
+
+    @close_on_punct.setter
+    def close_on_punct(self, value):
+        self._close_on_punct = value
+
+    @property
+    def parquet_compression(self):
+        """
+            str: Compression codec of the parquet objects, one of ``UNCOMPRESSED``, ``SNAPPY``, ``GZIP`` or ``LZO``. Default is ``SNAPPY``.
+        """
+        return self._parquet_compression
+
+    @parquet_compression.setter
+    def parquet_compression(self, value):
+        self._parquet_compression = value
+
+    @property
+    def parquet_block_size(self):
+        """
+            int: Size of a row group in bytes, buffered in memory before it is written. Larger row groups are faster to scan in analytic queries and require more heap. Default is 128 MB.
+        """
+        return self._parquet_block_size
+
+    @parquet_block_size.setter
+    def parquet_block_size(self, value):
+        self._parquet_block_size = value
+
+    @property
+    def parquet_page_size(self):
+        """
+            int: Size of a page in bytes. A page is the smallest unit that must be read to access a single value, use smaller pages for point lookups. Default is 1 MB.
+        """
+        return self._parquet_page_size
+
+    @parquet_page_size.setter
+    def parquet_page_size(self, value):
+        self._parquet_page_size = value
+
+    @property
+    def parquet_dict_page_size(self):
+        """
+            int: Maximum size of the dictionary page in bytes, a column falls back to plain encoding when its dictionary exceeds this size. Default is 1 MB.
+        """
+        return self._parquet_dict_page_size
+
+    @parquet_dict_page_size.setter
+    def parquet_dict_page_size(self, value):
+        self._parquet_dict_page_size = value
+
+    @property
+    def parquet_enable_dict(self):
+        """
+            bool: Set to ``False`` to disable dictionary encoding. Default is ``True``.
+        """
+        return self._parquet_enable_dict
+
+    @parquet_enable_dict.setter
+    def parquet_enable_dict(self, value):
+        self._parquet_enable_dict = value
+
+    @property
+    def parquet_writer_version(self):
+        """
+            str: Parquet writer version, either ``v1`` or ``v2``. Default is ``v1``.
+        """
+        return self._parquet_writer_version
+
+    @parquet_writer_version.setter
+    def parquet_writer_version(self, value):
+        self._parquet_writer_version = value
+
+    @property
+    def parquet_enable_schema_validation(self):
+        """
+            bool: Set to ``True`` to validate the parquet schema when objects are written.
+        """
+        return self._parquet_enable_schema_validation
+
+    @parquet_enable_schema_validation.setter
+    def parquet_enable_schema_validation(self, value):
+        self._parquet_enable_schema_validation = value
+
+    @property
+    def schema(self):
+        """
+            StreamSchema|str|typing.NamedTuple: Structured schema the tuples of the input stream are converted to, not required when the input stream is already a structured stream.
+        """
+        return self._schema
+
+    @schema.setter
+    def schema(self, value):
+        self._schema = value
+
+    @property
+    def partition_by(self):
+        """
+            list(str): Names of the attributes whose values partition the objects into Hive-style prefixes ``attribute=value/``, for example ``date=2020-05-17/region=eu/``.
+        """
+        return self._partition_by
+
+    @partition_by.setter
+    def partition_by(self, value):
+        self._partition_by = value
+
+    @property
+    def skip_partition_attributes(self):
+        """
+            bool: Set to ``True`` to omit the ``partition_by`` attributes from the parquet columns, their values are contained in the object name. Default is ``False``.
+        """
+        return self._skip_partition_attributes
+
+    @skip_partition_attributes.setter
+    def skip_partition_attributes(self, value):
+        self._skip_partition_attributes = value
+
+    @property
+    def object_name_attribute(self):
+        """
+            str: Name of the ``rstring`` attribute containing the name of the object the tuple is written to. Set ``object`` to ``None`` when this option is used.
+        """
+        return self._object_name_attribute
+
+    @object_name_attribute.setter
+    def object_name_attribute(self, value):
+        self._object_name_attribute = value
+
+    @property
+    def s3a_multipart_size(self):
+        """
+            int: Size in bytes of the parts of a multipart upload with protocol ``s3a``, at least 5 MB. Default is 64 MB (``fs.s3a.multipart.size``).
+        """
+        return self._s3a_multipart_size
+
+    @s3a_multipart_size.setter
+    def s3a_multipart_size(self, value):
+        self._s3a_multipart_size = value
+
+    @property
+    def s3a_fast_upload_buffer(self):
+        """
+            str: Buffer for the parts waiting for upload with protocol ``s3a``, one of ``disk``, ``array`` (JVM heap) or ``bytebuffer`` (direct memory). Default is ``disk`` (``fs.s3a.fast.upload.buffer``).
+        """
+        return self._s3a_fast_upload_buffer
+
+    @s3a_fast_upload_buffer.setter
+    def s3a_fast_upload_buffer(self, value):
+        self._s3a_fast_upload_buffer = value
+
+    @property
+    def s3a_fast_upload_active_blocks(self):
+        """
+            int: Maximum number of parts of an object buffered or uploading at the same time with protocol ``s3a``. Default is 4 (``fs.s3a.fast.upload.active.blocks``).
+        """
+        return self._s3a_fast_upload_active_blocks
+
+    @s3a_fast_upload_active_blocks.setter
+    def s3a_fast_upload_active_blocks(self, value):
+        self._s3a_fast_upload_active_blocks = value
+
+    @property
+    def s3a_upload_threads(self):
+        """
+            int: Number of threads uploading parts in parallel with protocol ``s3a``. Default is the S3A client default (``fs.s3a.threads.max``).
+        """
+        return self._s3a_upload_threads
+
+    @s3a_upload_threads.setter
+    def s3a_upload_threads(self, value):
+        self._s3a_upload_threads = value
+
+    @property
+    def auto_heap(self):
+        """
+            bool: Set to ``True`` to add the maximum heap size of the JVM, estimated from the content buffered by the sink, to ``vm_arg``. By default the JVM default heap size is used.
+        """
+        return self._auto_heap
+
+    @auto_heap.setter
+    def auto_heap(self, value):
+        self._auto_heap = value
 
-    .. versionadded:: 1.5
+    @property
+    def tuple_rate(self):
+        """
+            int|float: Expected number of tuples per second written by the sink, used by ``auto_heap`` to estimate the size of the objects closed by ``time_per_object``.
+        """
+        return self._tuple_rate
 
-    Attributes
-    ----------
-    bucket : str
-        Bucket name. Bucket must have been created in your Cloud Object Storage service before using this class.
-    endpoint : str
-        Endpoint for Cloud Object Storage. Select the endpoint for your bucket location and resiliency: `IBM® Cloud Object Storage Endpoints <https://console.bluemix.net/docs/services/cloud-object-storage/basics/endpoints.html>`_. Use a private enpoint when running in IBM cloud Streaming Analytics service.
-    credentials : str|dict
-        Credentials as dict or name of the application configuration containing the credentials for Cloud Object Storage. When set to ``None`` the application configuration ``cos`` is used.
-    protocol: str
-        Protocol used by the S3 client, either ``cos`` (IAM and HMAC authentication supported) or  ``s3a`` (requires HMAC authentication). Protocol ``s3a`` supports multipart upload. `Protocol selection <https://ibmstreams.github.io/streamsx.objectstorage/doc/spldoc/html/tk$com.ibm.streamsx.objectstorage/tk$com.ibm.streamsx.objectstorage$19.html>`_
-    options : kwargs
-        The additional optional parameters as variable keyword arguments.
+    @tuple_rate.setter
+    def tuple_rate(self, value):
+        self._tuple_rate = value
 
-    Returns:
-        :py:class:`topology_ref:streamsx.topology.topology.Stream`: Object content line by line with schema ``CommonSchema.String``.
-    """
-    def __init__(self, bucket, endpoint, credentials=None, protocol='cos', **options):
-        self.bucket = bucket
-        self.endpoint = endpoint
-        self.credentials = credentials
-        if (protocol != 'cos' and protocol != 's3a'):
-            raise ValueError("Set 'cos' or 's3a' for the protocol parameter.")
-        else:
-            self.protocol = protocol
+    @property
+    def tuple_size(self):
+        """
+            int: Expected average size in bytes of a tuple written to the objects, used by ``auto_heap``. Default is 1024.
+        """
+        return self._tuple_size
 
-        self.ssl_enabled = None
-        self.vm_arg = None
-        if 'ssl_enabled' in options:
-            self.ssl_enabled = options.get('ssl_enabled')
-        if 'vm_arg' in options:
-            self.vm_arg = options.get('vm_arg')
+    @tuple_size.setter
+    def tuple_size(self, value):
+        self._tuple_size = value
 
     @property
-    def vm_arg(self):
+    def open_objects(self):
         """
-            str: Arbitrary JVM arguments can be passed. For example, increase JVM's maximum heap size ``'-Xmx 8192m'``.
+            int: Expected number of objects open at the same time, for example the number of partitions written concurrently, used by ``auto_heap``. Default is 1.
         """
-        return self._vm_arg
+        return self._open_objects
 
-    @vm_arg.setter
-    def vm_arg(self, value):
-        self._vm_arg = value
+    @open_objects.setter
+    def open_objects(self, value):
+        self._open_objects = value
 
     @property
-    def ssl_enabled(self):
+    def memory_limit(self):
         """
-            bool: Set to ``False`` if you want to use HTTP instead of HTTPS. Per default SSL is enabled and HTTPS is used.
+            int: Memory limit in bytes of the container running the sink, with ``auto_heap`` a warning is issued when the estimated memory of the JVM exceeds it.
         """
-        return self._ssl_enabled
-
-    @ssl_enabled.setter
-    def ssl_enabled(self, value):
-        self._ssl_enabled = value
+        return self._memory_limit
 
+    @memory_limit.setter
+    def memory_limit(self, value):
+        self._memory_limit = value
 
-    def populate(self, topology, stream, schema, name, **options):
+    def populate(self, topology, stream, name, **options) -> streamsx.topology.topology.Sink:
         app_config_name = self.credentials
         # check if it's the credentials for the service
         if isinstance(self.credentials, dict):
             app_config_name = None
 
-        _op = _ObjectStorageSource(stream, CommonSchema.String, endpoint = self.endpoint, appConfigName = app_config_name, vmArg = self.vm_arg, name = name)
+        _check_object(self.object, self.object_name_attribute)
+        region = _consistent_region(stream)
+        if region is not None:
+            _check_consistent_rollover(self)
+        schema = StreamSchema(self.schema) if isinstance(self.schema, str) else self.schema
+        # partition and object name attributes are routing keys of the parallel region
+        stream = _parquet_input_stream(stream, schema)
+        partition_by = _check_attributes(stream, self.partition_by, 'partition_by')
+        object_name_attribute = _check_attributes(stream, self.object_name_attribute, 'object_name_attribute')
+        keys = (partition_by or []) + (object_name_attribute or [])
+
+        if self.width is not None and _check_width(self.width) > 1:
+            stream = _parallel(self, stream, self.width, keys)
+
+        _op = _ObjectStorageSink(stream, objectName = self.object, endpoint = self.endpoint, appConfigName = app_config_name, vmArg = self.vm_arg, name = name)
+        if self.width is not None and self.width > 1 and self.object is not None:
+            _op.params['objectName'] = _op.expression(_channel_object_name(self.object))
+        if object_name_attribute is not None:
+            _op.params['objectNameAttribute'] = _op.attribute(stream, object_name_attribute[0])
+        _op.params['storageFormat'] = 'parquet'
+        _add_parquet_params(_op, self.parquet_compression, self.parquet_block_size, self.parquet_page_size, self.parquet_dict_page_size, self.parquet_enable_dict, self.parquet_writer_version, self.parquet_enable_schema_validation)
+        _add_partition_params(_op, partition_by, self.skip_partition_attributes)
         _op.params['objectStorageURI'] = self.protocol+'://'+self.bucket
+        if region is None:
+            _add_rollover_params(_op, self.time_per_object, self.bytes_per_object, self.tuples_per_object, self.close_on_punct)
+        _add_s3a_params(_op, self.protocol, self.vm_arg, self.s3a_multipart_size, self.s3a_fast_upload_buffer, self.s3a_fast_upload_active_blocks, self.s3a_upload_threads)
+        _add_heap_params(_op, self, True, region)
 
         if isinstance(self.credentials, dict):
             access_key_id, secret_access_key = _read_hmac_credentials(self.credentials)
@@ -316,25 +2074,27 @@ class Read(streamsx.topology.composite.Map):
                 _add_toolkit_dependency(topology, '[1.10.0,3.0.0)')
                 _op.params['sslEnabled'] =  _op.expression('false')
 
-        return _op.outputs[0]
+        return streamsx.topology.topology.Sink(_op)
 
 
-class Write(streamsx.topology.composite.ForEach):
-    """Write strings to an object.
+class Compact(streamsx.topology.composite.Source):
+    """Compact small objects in a directory into objects of a target size.
 
-    Adds a COS-Writer where each tuple on `stream` is
-    written into an object.
+    Scans the directory and merges objects smaller than ``target_size`` into a new object once the small objects of a directory add up to ``target_size`` bytes, or when the first of them was found ``max_age`` seconds ago, a single small object in a directory is not compacted. The merged object is named ``compacted-<timestamp>-<id>`` with the extension of the merged objects, it becomes visible at once when it is complete and the merged objects are deleted afterwards. Objects of different directories are never merged, so a partitioned layout is kept.
 
-    Expects ``CommonSchema.String`` in the input stream.
+    The compaction is not atomic: until the merged objects are deleted, both the compacted object and the merged objects are visible and readers listing the directory in between see the content twice. A failed delete is retried after the next scan. The names of the merged objects are stored in the user metadata of the compacted object, so a compaction merges as many objects as the 2 KB of user metadata can name. The small objects found are kept in memory only, after a restart all objects of the directory are scanned again, merged objects left by a failed delete are deleted when their compacted object is found and the small objects not compacted yet are found again.
 
-    Example of creating an object with two lines::
+    Objects in ``raw`` format are concatenated line by line, objects in ``parquet`` format must have the same schema and are merged into a single parquet object.
+
+    Example compacting the objects written every minute to ``/logs`` into objects of 128 MB::
 
         import streamsx.objectstorage as cos
-        to_cos = topo.source(['Hello', 'World!'])
-        to_cos = to_cos.as_string()
-        to_cos.for_each(cos.Write(bucket, endpoint, '/sample/hw%OBJECTNUM.txt'))
 
-    .. versionadded:: 1.5
+        compacted = topo.source(cos.Compact(bucket='your-bucket-name', endpoint=endpoint, directory='/logs', target_size=128*1024*1024, recursive=True))
+
+    Compaction runs as Python operator that requires the package ``boto3`` (``ibm-cos-sdk`` for IAM authentication) in the Python environment of the Streams instance, parquet objects require the package ``pyarrow``.
+
+    .. versionadded:: 1.6
 
     Attributes
     ----------
@@ -342,61 +2102,132 @@ class Write(streamsx.topology.composite.ForEach):
         Bucket name. Bucket must have been created in your Cloud Object Storage service before using this class.
     endpoint : str
         Endpoint for Cloud Object Storage. Select the endpoint for your bucket location and resiliency: `IBM® Cloud Object Storage Endpoints <https://console.bluemix.net/docs/services/cloud-object-storage/basics/endpoints.html>`_. Use a private enpoint when running in IBM cloud Streaming Analytics service.
-    object : str
-        Name of the object to be created in your bucket. For example, ``SAMPLE_%OBJECTNUM.text``, %OBJECTNUM is an object number, starting at 0. When a new object is opened for writing the number is incremented.
-    time_per_object : int|float|datetime.timedelta
-        Specifies the approximate time, in seconds, after which the current output object is closed and a new object is opened for writing.
+    directory : str
+        Name of the directory to be compacted.
+    target_size : int
+        Size in bytes of the compacted objects.
     credentials : str|dict
         Credentials as dict or name of the application configuration containing the credentials for Cloud Object Storage. When set to ``None`` the application configuration ``cos`` is used.
     protocol: str
-        Protocol used by the S3 client, either ``cos`` (IAM and HMAC authentication supported) or  ``s3a`` (requires HMAC authentication). Protocol ``s3a`` supports multipart upload. `Protocol selection <https://ibmstreams.github.io/streamsx.objectstorage/doc/spldoc/html/tk$com.ibm.streamsx.objectstorage/tk$com.ibm.streamsx.objectstorage$19.html>`_
+        Protocol used by the S3 client, only ``cos`` is supported.
     options : kwargs
         The additional optional parameters as variable keyword arguments.
 
     Returns:
-        :py:class:`topology_ref:streamsx.topology.topology.Sink`: Stream termination.
+        Stream: Names of the compacted objects with schema ``CommonSchema.String``.
     """
-    def __init__(self, bucket, endpoint, object, time_per_object=10.0, credentials=None, protocol='cos', **options):
+    def __init__(self, bucket, endpoint, directory, target_size, credentials=None, protocol='cos', **options):
         self.bucket = bucket
         self.endpoint = endpoint
-        self.object = object
+        self.directory = directory
+        self.target_size = target_size
         self.credentials = credentials
-        if (protocol != 'cos' and protocol != 's3a'):
-            raise ValueError("Set 'cos' or 's3a' for the protocol parameter.")
-        else:
-            self.protocol = protocol
-        self.time_per_object = time_per_object
-        self.header = None
+        # the objects are accessed by a Python operator, there is no s3a client
+        if protocol != 'cos':
+            raise ValueError("Set 'cos' for the protocol parameter.")
+        self.protocol = protocol
+
+        self.pattern = '.*'
+        self.format = 'raw'
+        self.recursive = None
+        self.sleep_time = None
+        self.max_sleep_time = None
+        self.parquet_compression = None
         self.ssl_enabled = None
-        self.vm_arg = None
-        if 'header' in options:
-            self.header = options.get('header')
+        self.max_age = None
+        if 'pattern' in options:
+            self.pattern = options.get('pattern')
+        if 'max_age' in options:
+            self.max_age = options.get('max_age')
+        if 'format' in options:
+            self.format = options.get('format')
+        if 'recursive' in options:
+            self.recursive = options.get('recursive')
+        if 'sleep_time' in options:
+            self.sleep_time = options.get('sleep_time')
+        if 'max_sleep_time' in options:
+            self.max_sleep_time = options.get('max_sleep_time')
+        if 'parquet_compression' in options:
+            self.parquet_compression = options.get('parquet_compression')
         if 'ssl_enabled' in options:
             self.ssl_enabled = options.get('ssl_enabled')
-        if 'vm_arg' in options:
-            self.vm_arg = options.get('vm_arg')
 
     @property
-    def header(self):
+    def pattern(self):
         """
-            str: Specify the content of the header row. This header is added as first line in the object. Use this parameter when writing strings in CSV format and you like to query the objects with the IBM SQL Query service. By default no header row is generated.
+            str: Limits the objects that are compacted to the names that match the specified regular expression. Default is ``.*``.
         """
-        return self._header
+        return self._pattern
 
-    @header.setter
-    def header(self, value):
-        self._header = value
+    @pattern.setter
+    def pattern(self, value):
+        self._pattern = value
 
     @property
-    def vm_arg(self):
+    def max_age(self):
         """
-            str: Arbitrary JVM arguments can be passed. For example, increase JVM's maximum heap size ``'-Xmx 8192m'``.
+            float|datetime.timedelta: Time in seconds after which the small objects of a directory are compacted even if they do not add up to ``target_size``. Default is 3600 seconds.
         """
-        return self._vm_arg
+        return self._max_age
 
-    @vm_arg.setter
-    def vm_arg(self, value):
-        self._vm_arg = value
+    @max_age.setter
+    def max_age(self, value):
+        self._max_age = value
+
+    @property
+    def format(self):
+        """
+            str: Format of the objects, either ``raw`` (lines) or ``parquet``. Default is ``raw``.
+        """
+        return self._format
+
+    @format.setter
+    def format(self, value):
+        self._format = value
+
+    @property
+    def recursive(self):
+        """
+            bool: Set to ``True`` to compact the subdirectories of the directory too, each directory is compacted separately.
+        """
+        return self._recursive
+
+    @recursive.setter
+    def recursive(self, value):
+        self._recursive = value
+
+    @property
+    def sleep_time(self):
+        """
+            float|datetime.timedelta: Time to wait in seconds between two scans of the directory. Defaults to 5 seconds.
+        """
+        return self._sleep_time
+
+    @sleep_time.setter
+    def sleep_time(self, value):
+        self._sleep_time = value
+
+    @property
+    def max_sleep_time(self):
+        """
+            float|datetime.timedelta: Enables adaptive scanning with the maximum time to wait in seconds between two scans, see :py:attr:`Scan.max_sleep_time`.
+        """
+        return self._max_sleep_time
+
+    @max_sleep_time.setter
+    def max_sleep_time(self, value):
+        self._max_sleep_time = value
+
+    @property
+    def parquet_compression(self):
+        """
+            str: Compression codec of the compacted parquet objects, one of ``UNCOMPRESSED``, ``SNAPPY`` or ``GZIP``. Default is ``SNAPPY``.
+        """
+        return self._parquet_compression
+
+    @parquet_compression.setter
+    def parquet_compression(self, value):
+        self._parquet_compression = value
 
     @property
     def ssl_enabled(self):
@@ -409,101 +2240,152 @@ class Write(streamsx.topology.composite.ForEach):
     def ssl_enabled(self, value):
         self._ssl_enabled = value
 
-    def populate(self, topology, stream, name, **options) -> streamsx.topology.topology.Sink:
-        app_config_name = self.credentials
-        # check if it's the credentials for the service
-        if isinstance(self.credentials, dict):
-            app_config_name = None
-
-        _op = _ObjectStorageSink(stream, objectName = self.object, endpoint = self.endpoint, appConfigName = app_config_name, vmArg = self.vm_arg, name = name)
-        _op.params['storageFormat'] = 'raw'
-        _op.params['objectStorageURI'] = self.protocol+'://'+self.bucket
-        _op.params['timePerObject'] = streamsx.spl.types.float64(_check_time_per_object(self.time_per_object))
+    def populate(self, topology, name, **options):
+        target_size = _check_positive_int(self.target_size, 'target_size')
+        if self.format not in ('raw', 'parquet'):
+            raise ValueError("Set 'raw' or 'parquet' for the format parameter.")
+        compression = 'SNAPPY' if self.parquet_compression is None else self.parquet_compression
+        if not isinstance(compression, str):
+            raise TypeError(compression)
+        compression = compression.upper()
+        if compression not in _PYARROW_COMPRESSIONS:
+            raise ValueError("Invalid parquet_compression value. Set one of " + ', '.join(_PYARROW_COMPRESSIONS) + ".")
 
-        if self.header is not None:
-            _op.params['headerRow'] = self.header
+        sleep_time, max_sleep_time = _check_sleep_times(self.sleep_time, self.max_sleep_time)
+        max_age = 3600.0 if self.max_age is None else _check_seconds(self.max_age, 'max_age')
+        # the scan and the compaction run in the same operator to compact after scans that found no objects
+        compactor = streamsx.objectstorage._functions._Compactor(self.bucket, self.endpoint, self.credentials, self.ssl_enabled, self.directory, self.pattern, sleep_time, max_sleep_time, bool(self.recursive), 8, target_size, max_age, self.format, 'none' if compression == 'UNCOMPRESSED' else compression.lower())
+        return topology.source(compactor, name=name).as_string()
 
-        if isinstance(self.credentials, dict):
-            access_key_id, secret_access_key = _read_hmac_credentials(self.credentials)
-            if access_key_id is not None and secret_access_key is not None:
-                _op.params['objectStorageUser'] = access_key_id
-                _op.params['objectStoragePassword'] = secret_access_key
-            else:
-                _op.params['credentials'] = json.dumps(self.credentials)
 
-        if self.ssl_enabled is not None:
-            if self.ssl_enabled is False:
-                _add_toolkit_dependency(topology, '[1.10.0,3.0.0)')
-                _op.params['sslEnabled'] =  _op.expression('false')
+class Copy(streamsx.topology.composite.Map):
+    """Copy objects to another bucket with server-side copy.
 
-        return streamsx.topology.topology.Sink(_op)
+    Copies the objects specified in the input stream to ``target_bucket``, the content is copied by the object storage service and not transferred through the Streams application. Expects ``CommonSchema.String`` with the object names or the structured output of :py:class:`Scan` with the attributes ``object_name``, ``size`` and ``etag`` in the input stream, otherwise the size and ETag of each object are requested.
 
+    Objects larger than ``part_size`` are copied with multipart copy, up to ``max_concurrency`` parts of an object are copied concurrently. Objects are not copied again when the target object has the same ETag as the source object, the ETag of the source object is kept in the metadata ``source-etag`` of the target object as multipart copies have a different ETag. The content type, content encoding, cache control, content disposition, content language and user metadata of the source object are copied to the target object.
+    The source and the target bucket must be accessible with the same endpoint and credentials.
 
-class WriteParquet(streamsx.topology.composite.ForEach):
-    """Create objects in parquet format.
+    Example copying the objects of a directory to a bucket in another region::
 
-    Adds a COS-Writer where each tuple on `stream` is
-    written into an object in parquet format.
+        import streamsx.objectstorage as cos
 
-    Example of creating objects in parquet format from a stream named 'js' in JSON format::
+        scanned = topo.source(cos.Scan(bucket='source-bucket', endpoint=endpoint, directory='/archive', schema='tuple<rstring object_name, int64 size, rstring etag>'))
+        copied = scanned.map(cos.Copy(bucket='source-bucket', endpoint=endpoint, target_bucket='target-bucket', width=4))
 
-        import streamsx.objectstorage as cos
-        ...
-        # JSON to tuple
-        to_cos = js.map(schema='tuple<rstring a, int32 b>')
-        to_cos.for_each(cos.write(bucket=bucket, endpoint=endpoint, object='/parquet/sample/hw%OBJECTNUM.parquet'))
+    The copy runs as Python operator that requires the package ``boto3`` (``ibm-cos-sdk`` for IAM authentication) in the Python environment of the Streams instance.
 
-    .. versionadded:: 1.5
+    .. versionadded:: 1.6
 
     Attributes
     ----------
     bucket : str
-        Bucket name. Bucket must have been created in your Cloud Object Storage service before using this class.
+        Name of the bucket containing the objects to copy.
     endpoint : str
         Endpoint for Cloud Object Storage. Select the endpoint for your bucket location and resiliency: `IBM® Cloud Object Storage Endpoints <https://console.bluemix.net/docs/services/cloud-object-storage/basics/endpoints.html>`_. Use a private enpoint when running in IBM cloud Streaming Analytics service.
-    object : str
-        Name of the object to be created in your bucket. For example, ``SAMPLE_%OBJECTNUM.text``, %OBJECTNUM is an object number, starting at 0. When a new object is opened for writing the number is incremented.
-    time_per_object : int|float|datetime.timedelta
-        Specifies the approximate time, in seconds, after which the current output object is closed and a new object is opened for writing.
+    target_bucket : str
+        Name of the bucket the objects are copied to.
     credentials : str|dict
         Credentials as dict or name of the application configuration containing the credentials for Cloud Object Storage. When set to ``None`` the application configuration ``cos`` is used.
-    protocol: str
-        Protocol used by the S3 client, either ``cos`` (IAM and HMAC authentication supported) or  ``s3a`` (requires HMAC authentication). Protocol ``s3a`` supports multipart upload. `Protocol selection <https://ibmstreams.github.io/streamsx.objectstorage/doc/spldoc/html/tk$com.ibm.streamsx.objectstorage/tk$com.ibm.streamsx.objectstorage$19.html>`_
     options : kwargs
         The additional optional parameters as variable keyword arguments.
 
     Returns:
-        :py:class:`topology_ref:streamsx.topology.topology.Sink`: Stream termination.
+        :py:class:`topology_ref:streamsx.topology.topology.Stream`: Names of the copied objects in the target bucket with schema ``CommonSchema.String``, skipped objects are not emitted.
     """
-    def __init__(self, bucket, endpoint, object, time_per_object=10.0, credentials=None, protocol='cos', **options):
+    def __init__(self, bucket, endpoint, target_bucket, credentials=None, **options):
         self.bucket = bucket
         self.endpoint = endpoint
-        self.object = object
+        self.target_bucket = target_bucket
         self.credentials = credentials
-        if (protocol != 'cos' and protocol != 's3a'):
-            raise ValueError("Set 'cos' or 's3a' for the protocol parameter.")
-        else:
-            self.protocol = protocol
-        self.time_per_object = time_per_object
+
+        self.directory = None
+        self.target_directory = None
+        self.width = None
+        self.max_concurrency = None
+        self.part_size = None
+        self.skip_unchanged = None
         self.ssl_enabled = None
-        self.vm_arg = None
-        if 'header' in options:
-            self.header = options.get('header')
+        if 'directory' in options:
+            self.directory = options.get('directory')
+        if 'target_directory' in options:
+            self.target_directory = options.get('target_directory')
+        if 'width' in options:
+            self.width = options.get('width')
+        if 'max_concurrency' in options:
+            self.max_concurrency = options.get('max_concurrency')
+        if 'part_size' in options:
+            self.part_size = options.get('part_size')
+        if 'skip_unchanged' in options:
+            self.skip_unchanged = options.get('skip_unchanged')
         if 'ssl_enabled' in options:
             self.ssl_enabled = options.get('ssl_enabled')
-        if 'vm_arg' in options:
-            self.vm_arg = options.get('vm_arg')
 
     @property
-    def vm_arg(self):
+    def directory(self):
         """
-            str: Arbitrary JVM arguments can be passed. For example, increase JVM's maximum heap size ``'-Xmx 8192m'``.
+            str: Directory of the source objects that is replaced by ``target_directory`` in the name of the target objects.
         """
-        return self._vm_arg
+        return self._directory
 
-    @vm_arg.setter
-    def vm_arg(self, value):
-        self._vm_arg = value
+    @directory.setter
+    def directory(self, value):
+        self._directory = value
+
+    @property
+    def target_directory(self):
+        """
+            str: Directory of the target objects replacing ``directory`` in the object names. By default the target objects have the names of the source objects.
+        """
+        return self._target_directory
+
+    @target_directory.setter
+    def target_directory(self, value):
+        self._target_directory = value
+
+    @property
+    def width(self):
+        """
+            int: Number of parallel channels copying objects concurrently. Default is 1.
+        """
+        return self._width
+
+    @width.setter
+    def width(self, value):
+        self._width = value
+
+    @property
+    def max_concurrency(self):
+        """
+            int: Maximum number of parts of an object copied concurrently by a channel with multipart copy. Default is 8.
+        """
+        return self._max_concurrency
+
+    @max_concurrency.setter
+    def max_concurrency(self, value):
+        self._max_concurrency = value
+
+    @property
+    def part_size(self):
+        """
+            int: Size in bytes of the parts of a multipart copy, at least 5 MB and at most 5 GB. Default is 128 MB.
+        """
+        return self._part_size
+
+    @part_size.setter
+    def part_size(self, value):
+        self._part_size = value
+
+    @property
+    def skip_unchanged(self):
+        """
+            bool: Set to ``False`` to copy objects even if the target object has the same ETag. Default is ``True``.
+        """
+        return self._skip_unchanged
+
+    @skip_unchanged.setter
+    def skip_unchanged(self, value):
+        self._skip_unchanged = value
 
     @property
     def ssl_enabled(self):
@@ -516,36 +2398,90 @@ class WriteParquet(streamsx.topology.composite.ForEach):
     def ssl_enabled(self, value):
         self._ssl_enabled = value
 
-    def populate(self, topology, stream, name, **options) -> streamsx.topology.topology.Sink:
-        app_config_name = self.credentials
-        # check if it's the credentials for the service
-        if isinstance(self.credentials, dict):
-            app_config_name = None
+    def populate(self, topology, stream, schema, name, **options):
+        part_size = 128 * 1024 * 1024 if self.part_size is None else _check_positive_int(self.part_size, 'part_size')
+        if part_size < 5 * 1024 * 1024 or part_size > 5 * 1024 * 1024 * 1024:
+            raise ValueError("Invalid part_size value. Value must be at least 5 MB and at most 5 GB.")
+        max_concurrency = 8 if self.max_concurrency is None else _check_positive_int(self.max_concurrency, 'max_concurrency')
+        if not is_common(stream.oport.schema):
+            _check_attributes(stream, 'object_name', 'Copy')
+        copier = streamsx.objectstorage._functions._Copier(self.bucket, self.endpoint, self.credentials, self.ssl_enabled, self.target_bucket, self.directory, self.target_directory, part_size, max_concurrency, self.skip_unchanged is not False)
+        if self.width is None or _check_width(self.width) == 1:
+            return stream.map(copier, name=name).as_string()
+        copied = _parallel(self, stream, self.width).map(copier, name=name).as_string()
+        return copied.end_parallel()
 
-        _op = _ObjectStorageSink(stream, objectName = self.object, endpoint = self.endpoint, appConfigName = app_config_name, vmArg = self.vm_arg, name = name)
-        _op.params['storageFormat'] = 'parquet'
-        _op.params['parquetCompression'] = 'SNAPPY'
-        _op.params['parquetEnableDict'] = _op.expression('true')
-        _op.params['objectStorageURI'] = self.protocol+'://'+self.bucket
-        _op.params['timePerObject'] = streamsx.spl.types.float64(_check_time_per_object(self.time_per_object))
 
-        if isinstance(self.credentials, dict):
-            access_key_id, secret_access_key = _read_hmac_credentials(self.credentials)
-            if access_key_id is not None and secret_access_key is not None:
-                _op.params['objectStorageUser'] = access_key_id
-                _op.params['objectStoragePassword'] = secret_access_key
-            else:
-                _op.params['credentials'] = json.dumps(self.credentials)
+class Sync(streamsx.topology.composite.Source):
+    """Synchronize a directory to another bucket with server-side copy.
 
-        if self.ssl_enabled is not None:
-            if self.ssl_enabled is False:
-                _add_toolkit_dependency(topology, '[1.10.0,3.0.0)')
-                _op.params['sslEnabled'] =  _op.expression('false')
+    Scans the directory with :py:class:`Scan` and copies new and modified objects with :py:class:`Copy` to ``target_bucket``. Unchanged objects are skipped by their ETag, so a restarted synchronization copies only the objects that changed.
 
-        return streamsx.topology.topology.Sink(_op)
+    Example synchronizing the directory ``/archive`` including its subdirectories to a backup bucket::
+
+        import streamsx.objectstorage as cos
+
+        copied = topo.source(cos.Sync(bucket='source-bucket', endpoint=endpoint, directory='/archive', target_bucket='backup-bucket', recursive=True, width=4))
+
+    .. versionadded:: 1.6
+
+    Attributes
+    ----------
+    bucket : str
+        Name of the bucket containing the objects to copy.
+    endpoint : str
+        Endpoint for Cloud Object Storage. Select the endpoint for your bucket location and resiliency: `IBM® Cloud Object Storage Endpoints <https://console.bluemix.net/docs/services/cloud-object-storage/basics/endpoints.html>`_. Use a private enpoint when running in IBM cloud Streaming Analytics service.
+    directory : str
+        Name of the directory to synchronize.
+    target_bucket : str
+        Name of the bucket the objects are copied to.
+    target_directory : str
+        Directory of the copied objects in the target bucket, by default the objects keep their names.
+    credentials : str|dict
+        Credentials as dict or name of the application configuration containing the credentials for Cloud Object Storage. When set to ``None`` the application configuration ``cos`` is used.
+    protocol: str
+        Protocol used by the S3 client, only ``cos`` is supported.
+    options : kwargs
+        The additional optional parameters of :py:class:`Scan` (``pattern``, ``recursive``, ``max_depth``, ``sleep_time``, ``max_sleep_time``, ``manifest``) and :py:class:`Copy` (``width``, ``max_concurrency``, ``part_size``, ``skip_unchanged``) as variable keyword arguments.
+
+    Returns:
+        Stream: Names of the copied objects in the target bucket with schema ``CommonSchema.String``.
 
+    .. note:: The copy runs as Python operator and requires the package ``boto3`` (``ibm-cos-sdk`` for IAM authentication) in the Python environment of the Streams instance.
+    """
+    _SCAN_OPTIONS = ['recursive', 'max_depth', 'listing_threads', 'sleep_time', 'init_delay', 'max_sleep_time', 'manifest', 'strict_mode']
+    _COPY_OPTIONS = ['width', 'max_concurrency', 'part_size', 'skip_unchanged']
+
+    def __init__(self, bucket, endpoint, directory, target_bucket, target_directory=None, credentials=None, protocol='cos', **options):
+        self.bucket = bucket
+        self.endpoint = endpoint
+        self.directory = directory
+        self.target_bucket = target_bucket
+        self.target_directory = target_directory
+        self.credentials = credentials
+        # the objects are accessed by a Python operator, there is no s3a client
+        if protocol != 'cos':
+            raise ValueError("Set 'cos' for the protocol parameter.")
+        self.protocol = protocol
+        unknown = [o for o in options if o not in Sync._SCAN_OPTIONS + Sync._COPY_OPTIONS + ['pattern', 'ssl_enabled']]
+        if unknown:
+            raise ValueError("Options " + str(unknown) + " not supported.")
+        self.options = options
 
-def scan(topology, bucket, endpoint, pattern='.*', directory='/', credentials=None, ssl_enabled=None, vm_arg=None, name=None):
+    def populate(self, topology, name, **options):
+        scan_options = {o: v for o, v in self.options.items() if o in Sync._SCAN_OPTIONS}
+        copy_options = {o: v for o, v in self.options.items() if o in Sync._COPY_OPTIONS}
+        ssl_enabled = self.options.get('ssl_enabled')
+        scan = Scan(self.bucket, self.endpoint, self.options.get('pattern', '.*'), self.directory, self.credentials, self.protocol, ssl_enabled=ssl_enabled, schema='tuple<rstring object_name, int64 size, rstring etag>', **scan_options)
+        objects = topology.source(scan, name=name)
+        if copy_options.get('width') is not None:
+            # the parallel region of Copy cannot be nested in a group
+            self.group = False
+        copy = Copy(self.bucket, self.endpoint, self.target_bucket, self.credentials, directory=self.directory, target_directory=self.target_directory, ssl_enabled=ssl_enabled, **copy_options)
+        return objects.map(copy)
+
+
+def scan(topology, bucket, endpoint, pattern='.*', directory='/', credentials=None, ssl_enabled=None, vm_arg=None, name=None, sleep_time=None, init_delay=None, strict_mode=None):
     """Scan a directory in a bucket for object names.
 
     Scans an object storage directory and emits the names of new or modified objects that are found in the directory.
@@ -566,6 +2502,9 @@ def scan(topology, bucket, endpoint, pattern='.*', directory='/', credentials=No
         ssl_enabled(bool): Set to ``False`` if you want to use HTTP instead of HTTPS. Per default SSL is enabled and HTTPS is used.
         vm_arg(str): Arbitrary JVM arguments can be passed. For example, increase JVM's maximum heap size ``'-Xmx 8192m'``.     
         name(str): Sink name in the Streams context, defaults to a generated name.
+        sleep_time(float|datetime.timedelta): Time to wait in seconds between two scans of the directory. Defaults to 5 seconds.
+        init_delay(float|datetime.timedelta): Time to wait in seconds before the first scan of the directory. Defaults to 0.
+        strict_mode(bool): Set to ``True`` to stop with an error when the directory can not be scanned. By default scan errors are ignored and the scan is retried.
 
     Returns:
         Stream: Object names stream with schema ``CommonSchema.String``.
@@ -582,6 +2521,12 @@ def scan(topology, bucket, endpoint, pattern='.*', directory='/', credentials=No
 
     _op = _ObjectStorageScan(topology, CommonSchema.String, pattern=pattern, directory=directory, endpoint=endpoint, appConfigName=appConfigName, vmArg=vm_arg, name=name)
     _op.params['objectStorageURI'] = 'cos://'+bucket
+    if sleep_time is not None:
+        _op.params['sleepTime'] = streamsx.spl.types.float64(_check_seconds(sleep_time, 'sleep_time'))
+    if init_delay is not None:
+        _op.params['initDelay'] = streamsx.spl.types.float64(_check_seconds(init_delay, 'init_delay'))
+    if strict_mode is not None:
+        _op.params['strictMode'] = _op.expression('true' if strict_mode else 'false')
 
     if isinstance(credentials, dict):
         access_key_id, secret_access_key = _read_hmac_credentials(credentials)
@@ -599,7 +2544,7 @@ def scan(topology, bucket, endpoint, pattern='.*', directory='/', credentials=No
     return _op.outputs[0]
 
 
-def read(stream, bucket, endpoint, credentials=None, ssl_enabled=None, vm_arg=None, name=None):
+def read(stream, bucket, endpoint, credentials=None, ssl_enabled=None, vm_arg=None, name=None, block_size=None, encoding=None):
     """Read an object in a bucket.
 
     Reads the object specified in the input stream and emits content of the object.
@@ -618,9 +2563,11 @@ def read(stream, bucket, endpoint, credentials=None, ssl_enabled=None, vm_arg=No
         ssl_enabled(bool): Set to ``False`` if you want to use HTTP instead of HTTPS. Per default SSL is enabled and HTTPS is used.
         vm_arg(str): Arbitrary JVM arguments can be passed. For example, increase JVM's maximum heap size ``'-Xmx 8192m'``.        
         name(str): Sink name in the Streams context, defaults to a generated name.
+        block_size(int): Size in bytes of the blocks emitted in binary mode. When set, the object is emitted in blocks of this size as ``blob`` attribute ``data`` instead of line by line.
+        encoding(str): Character encoding of the objects, for example ``'ISO-8859-1'``. Default is ``UTF-8``.
 
     Returns:
-        :py:class:`topology_ref:streamsx.topology.topology.Stream`: Object content line by line with schema ``CommonSchema.String``.
+        :py:class:`topology_ref:streamsx.topology.topology.Stream`: Object content line by line with schema ``CommonSchema.String``, or in blocks with schema ``tuple<blob data>`` when ``block_size`` is set.
 
 
     .. deprecated:: 1.5.0
@@ -632,8 +2579,12 @@ def read(stream, bucket, endpoint, credentials=None, ssl_enabled=None, vm_arg=No
     if isinstance(credentials, dict):
          appConfigName = None
 
-    _op = _ObjectStorageSource(stream, CommonSchema.String, endpoint=endpoint, appConfigName=appConfigName, vmArg=vm_arg, name=name)
+    _op = _ObjectStorageSource(stream, _read_schema(block_size), endpoint=endpoint, appConfigName=appConfigName, vmArg=vm_arg, name=name)
     _op.params['objectStorageURI'] = 'cos://'+bucket
+    if block_size is not None:
+        _op.params['blockSize'] = streamsx.spl.types.int32(block_size)
+    if encoding is not None:
+        _op.params['encoding'] = encoding
 
     if isinstance(credentials, dict):
         access_key_id, secret_access_key = _read_hmac_credentials(credentials)
@@ -651,7 +2602,7 @@ def read(stream, bucket, endpoint, credentials=None, ssl_enabled=None, vm_arg=No
     return _op.outputs[0]
 
 
-def write(stream, bucket, endpoint, object, time_per_object=10.0, header=None, credentials=None, ssl_enabled=None, vm_arg=None, name=None):
+def write(stream, bucket, endpoint, object, time_per_object=None, header=None, credentials=None, ssl_enabled=None, vm_arg=None, name=None, bytes_per_object=None, tuples_per_object=None, close_on_punct=None):
     """Write strings to an object.
 
     Adds a COS-Writer where each tuple on `stream` is
@@ -669,12 +2620,15 @@ def write(stream, bucket, endpoint, object, time_per_object=10.0, header=None, c
         bucket(str): Bucket name. Bucket must have been created in your Cloud Object Storage service before using this function.
         endpoint(str): Endpoint for Cloud Object Storage. Select the endpoint for your bucket location and resiliency: `IBM® Cloud Object Storage Endpoints <https://console.bluemix.net/docs/services/cloud-object-storage/basics/endpoints.html>`_. Use a private enpoint when running in IBM cloud Streaming Analytics service.
         object(str): Name of the object to be created in your bucket. For example, ``SAMPLE_%OBJECTNUM.text``, %OBJECTNUM is an object number, starting at 0. When a new object is opened for writing the number is incremented.
-        time_per_object(int|float|datetime.timedelta): Specifies the approximate time, in seconds, after which the current output object is closed and a new object is opened for writing.
+        time_per_object(int|float|datetime.timedelta): Specifies the approximate time, in seconds, after which the current output object is closed and a new object is opened for writing. If no rollover policy is set, the object is closed after 10 seconds.
         header(str): Specify the content of the header row. This header is added as first line in the object. Use this parameter when writing strings in CSV format and you like to query the objects with the IBM SQL Query service. By default no header row is generated.
         credentials(str|dict): Credentials as dict or name of the application configuration containing the credentials for Cloud Object Storage. When set to ``None`` the application configuration ``cos`` is used.
         ssl_enabled(bool): Set to ``False`` if you want to use HTTP instead of HTTPS. Per default SSL is enabled and HTTPS is used.
         vm_arg(str): Arbitrary JVM arguments can be passed. For example, increase JVM's maximum heap size ``'-Xmx 8192m'``.
         name(str): Sink name in the Streams context, defaults to a generated name.
+        bytes_per_object(int): Specifies the approximate size of the output object, in bytes. When the object size exceeds the specified number of bytes, the current output object is closed and a new object is opened for writing.
+        tuples_per_object(int): Specifies the maximum number of tuples that can be received for each output object. When the specified number of tuples are received, the current output object is closed and a new object is opened for writing.
+        close_on_punct(bool): Set to ``True`` to close the current output object when a window punctuation marker is received.
 
     Returns:
         :py:class:`topology_ref:streamsx.topology.topology.Sink`: Stream termination.
@@ -692,7 +2646,7 @@ def write(stream, bucket, endpoint, object, time_per_object=10.0, header=None, c
     _op = _ObjectStorageSink(stream, objectName=object, endpoint=endpoint, appConfigName=appConfigName, vmArg=vm_arg, name=name)
     _op.params['storageFormat'] = 'raw'
     _op.params['objectStorageURI'] = 'cos://'+bucket
-    _op.params['timePerObject'] = streamsx.spl.types.float64(_check_time_per_object(time_per_object))
+    _add_rollover_params(_op, time_per_object, bytes_per_object, tuples_per_object, close_on_punct)
 
     if header is not None:
         _op.params['headerRow'] = header
@@ -713,7 +2667,7 @@ def write(stream, bucket, endpoint, object, time_per_object=10.0, header=None, c
     return streamsx.topology.topology.Sink(_op)
     
 
-def write_parquet(stream, bucket, endpoint, object, time_per_object=10.0, credentials=None, ssl_enabled=None, vm_arg=None, name=None):
+def write_parquet(stream, bucket, endpoint, object, time_per_object=None, credentials=None, ssl_enabled=None, vm_arg=None, name=None, bytes_per_object=None, tuples_per_object=None, close_on_punct=None, parquet_compression=None, parquet_block_size=None, parquet_page_size=None, parquet_dict_page_size=None, parquet_enable_dict=None, parquet_writer_version=None, parquet_enable_schema_validation=None):
     """Create objects in parquet format.
 
     Adds a COS-Writer where each tuple on `stream` is
@@ -732,11 +2686,21 @@ def write_parquet(stream, bucket, endpoint, object, time_per_object=10.0, creden
         bucket(str): Bucket name. Bucket must have been created in your Cloud Object Storage service before using this function.
         endpoint(str): Endpoint for Cloud Object Storage. Select the endpoint for your bucket location and resiliency: `IBM® Cloud Object Storage Endpoints <https://console.bluemix.net/docs/services/cloud-object-storage/basics/endpoints.html>`_. Use a private enpoint when running in IBM cloud Streaming Analytics service.
         object(str): Name of the object to be created in your bucket. For example, ``SAMPLE_%OBJECTNUM.parquet``, %OBJECTNUM is an object number, starting at 0. When a new object is opened for writing the number is incremented.
-        time_per_object(int|float|datetime.timedelta): Specifies the approximate time, in seconds, after which the current output object is closed and a new object is opened for writing.
+        time_per_object(int|float|datetime.timedelta): Specifies the approximate time, in seconds, after which the current output object is closed and a new object is opened for writing. If no rollover policy is set, the object is closed after 10 seconds.
         credentials(str|dict): Credentials as dict or name of the application configuration containing the credentials for Cloud Object Storage. When set to ``None`` the application configuration ``cos`` is used.
         ssl_enabled(bool): Set to ``False`` if you want to use HTTP instead of HTTPS. Per default SSL is enabled and HTTPS is used.
         vm_arg(str): Arbitrary JVM arguments can be passed. For example, increase JVM's maximum heap size ``'-Xmx 8192m'``.
         name(str): Sink name in the Streams context, defaults to a generated name.
+        bytes_per_object(int): Specifies the approximate size of the output object, in bytes. When the object size exceeds the specified number of bytes, the current output object is closed and a new object is opened for writing.
+        tuples_per_object(int): Specifies the maximum number of tuples that can be received for each output object. When the specified number of tuples are received, the current output object is closed and a new object is opened for writing.
+        close_on_punct(bool): Set to ``True`` to close the current output object when a window punctuation marker is received.
+        parquet_compression(str): Compression codec of the parquet objects, one of ``UNCOMPRESSED``, ``SNAPPY``, ``GZIP`` or ``LZO``. Default is ``SNAPPY``.
+        parquet_block_size(int): Size of a row group in bytes. Default is 128 MB.
+        parquet_page_size(int): Size of a page in bytes. Default is 1 MB.
+        parquet_dict_page_size(int): Maximum size of the dictionary page in bytes. Default is 1 MB.
+        parquet_enable_dict(bool): Set to ``False`` to disable dictionary encoding. Default is ``True``.
+        parquet_writer_version(str): Parquet writer version, either ``v1`` or ``v2``. Default is ``v1``.
+        parquet_enable_schema_validation(bool): Set to ``True`` to validate the parquet schema when objects are written.
 
     Returns:
         :py:class:`topology_ref:streamsx.topology.topology.Sink`: Stream termination.
@@ -753,10 +2717,9 @@ def write_parquet(stream, bucket, endpoint, object, time_per_object=10.0, creden
 
     _op = _ObjectStorageSink(stream, objectName=object, endpoint=endpoint, appConfigName=appConfigName, vmArg=vm_arg, name=name)
     _op.params['storageFormat'] = 'parquet'
-    _op.params['parquetCompression'] = 'SNAPPY'
-    _op.params['parquetEnableDict'] = _op.expression('true')
+    _add_parquet_params(_op, parquet_compression, parquet_block_size, parquet_page_size, parquet_dict_page_size, parquet_enable_dict, parquet_writer_version, parquet_enable_schema_validation)
     _op.params['objectStorageURI'] = 'cos://'+bucket
-    _op.params['timePerObject'] = streamsx.spl.types.float64(_check_time_per_object(time_per_object))
+    _add_rollover_params(_op, time_per_object, bytes_per_object, tuples_per_object, close_on_punct)
     if isinstance(credentials, dict):
         access_key_id, secret_access_key = _read_hmac_credentials(credentials)
         if access_key_id is not None and secret_access_key is not None:
@@ -896,9 +2859,9 @@ class _ObjectStorageSource(streamsx.spl.op.Invoke):
         if objectStorageURI is not None:
             params['objectStorageURI'] = objectStorageURI
         if blockSize is not None:
-            params['blockSize'] = initDelay
+            params['blockSize'] = blockSize
         if encoding is not None:
-            params['encoding'] = sleepTime
+            params['encoding'] = encoding
         if initDelay is not None:
             params['initDelay'] = initDelay
         if IAMApiKey is not None:
@@ -0,0 +1,182 @@
+# coding=utf-8
+# Licensed Materials - Property of IBM
+# Copyright IBM Corp. 2020
+
+# S3 client used by the composites that run as Python operators.
+# Imported at runtime in the processing element only, the S3 SDK
+# (boto3 or ibm_boto3) is not required to build an application.
+
+import io
+import json
+
+
+def _resolve_credentials(credentials):
+    if isinstance(credentials, dict):
+        return credentials
+    # name of the application configuration, same property as configure_connection creates
+    import streamsx.ec
+    app_config = streamsx.ec.get_application_configuration('cos' if credentials is None else credentials)
+    if app_config is None or 'cos.creds' not in app_config:
+        raise ValueError("Application configuration '" + str(credentials) + "' with property 'cos.creds' not found.")
+    return json.loads(app_config['cos.creds'])
+
+
+def _object_key(object_name):
+    # object names emitted by Scan start with a slash
+    return object_name.lstrip('/')
+
+
+def create_client(endpoint, credentials=None, ssl_enabled=None):
+    """Creates an S3 client for the endpoint.
+
+    HMAC keys are used when present in the credentials (either top level or
+    in ``cos_hmac_keys``), otherwise IAM authentication with ``apikey`` and
+    ``resource_instance_id`` requires the IBM COS SDK (``ibm_boto3``).
+    """
+    creds = _resolve_credentials(credentials)
+    hmac = creds.get('cos_hmac_keys', creds)
+    access_key_id = hmac.get('access_key_id')
+    secret_access_key = hmac.get('secret_access_key')
+    endpoint_url = ('http://' if ssl_enabled is False else 'https://') + endpoint
+    if access_key_id is not None and secret_access_key is not None:
+        import boto3
+        return boto3.client('s3', endpoint_url=endpoint_url, aws_access_key_id=access_key_id, aws_secret_access_key=secret_access_key)
+    import ibm_boto3
+    from ibm_botocore.client import Config
+    return ibm_boto3.client('s3', endpoint_url=endpoint_url, ibm_api_key_id=creds.get('apikey'), ibm_service_instance_id=creds.get('resource_instance_id'), config=Config(signature_version='oauth'))
+
+
+class ObjectFile(io.RawIOBase):
+    """Seekable read-only file over an object, each read is a ranged GET.
+
+    Formats with an index such as parquet fetch only the byte ranges they need.
+    """
+    def __init__(self, client, bucket, object_name, size=None):
+        self._client = client
+        self._bucket = bucket
+        self._key = _object_key(object_name)
+        self._size = size
+        self._pos = 0
+        self.bytes_read = 0
+
+    @property
+    def size(self):
+        if self._size is None:
+            self._size = self._client.head_object(Bucket=self._bucket, Key=self._key)['ContentLength']
+        return self._size
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        elif whence == io.SEEK_END:
+            self._pos = self.size + offset
+        else:
+            raise ValueError(whence)
+        return self._pos
+
+    def readinto(self, buffer):
+        end = min(self._pos + len(buffer), self.size)
+        if end <= self._pos:
+            return 0
+        body = self._client.get_object(Bucket=self._bucket, Key=self._key, Range='bytes=%d-%d' % (self._pos, end - 1))['Body']
+        data = body.read()
+        n = len(data)
+        buffer[:n] = data
+        self._pos += n
+        self.bytes_read += n
+        return n
+
+
+class ObjectWriter(io.RawIOBase):
+    """Writable file creating an object, content is uploaded in parts of ``part_size`` bytes.
+
+    The object becomes visible at once when the writer is closed, the upload
+    is aborted when the ``with`` block exits with an exception. ``metadata``
+    is the user metadata of the object.
+    """
+    def __init__(self, client, bucket, object_name, part_size=8*1024*1024, metadata=None):
+        self._client = client
+        self._metadata = {} if metadata is None else {'Metadata': metadata}
+        self._bucket = bucket
+        self._key = _object_key(object_name)
+        self._part_size = part_size
+        self._buffer = bytearray()
+        self._parts = []
+        self._upload_id = None
+        self._pos = 0
+
+    def writable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def write(self, b):
+        self._buffer += b
+        self._pos += len(b)
+        while len(self._buffer) >= self._part_size:
+            self._upload_part(bytes(self._buffer[:self._part_size]))
+            del self._buffer[:self._part_size]
+        return len(b)
+
+    def _upload_part(self, data):
+        if self._upload_id is None:
+            self._upload_id = self._client.create_multipart_upload(Bucket=self._bucket, Key=self._key, **self._metadata)['UploadId']
+        number = len(self._parts) + 1
+        etag = self._client.upload_part(Bucket=self._bucket, Key=self._key, UploadId=self._upload_id, PartNumber=number, Body=data)['ETag']
+        self._parts.append({'PartNumber': number, 'ETag': etag})
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self._upload_id is None:
+                self._client.put_object(Bucket=self._bucket, Key=self._key, Body=bytes(self._buffer), **self._metadata)
+            else:
+                if self._buffer:
+                    self._upload_part(bytes(self._buffer))
+                self._client.complete_multipart_upload(Bucket=self._bucket, Key=self._key, UploadId=self._upload_id, MultipartUpload={'Parts': self._parts})
+        finally:
+            self._buffer = bytearray()
+            super(ObjectWriter, self).close()
+
+    def abort(self):
+        if self.closed:
+            return
+        try:
+            if self._upload_id is not None:
+                self._client.abort_multipart_upload(Bucket=self._bucket, Key=self._key, UploadId=self._upload_id)
+        finally:
+            self._buffer = bytearray()
+            super(ObjectWriter, self).close()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def delete_objects(client, bucket, object_names, attempts=3):
+    """Deletes objects with a request per 1000 objects, the objects reported as not deleted are retried."""
+    keys = [_object_key(n) for n in object_names]
+    for i in range(0, len(keys), 1000):
+        batch = keys[i:i+1000]
+        for _ in range(attempts):
+            errors = client.delete_objects(Bucket=bucket, Delete={'Objects': [{'Key': k} for k in batch], 'Quiet': True}).get('Errors', [])
+            if not errors:
+                break
+            batch = [e['Key'] for e in errors]
+        else:
+            raise OSError('Deleting objects failed: ' + ', '.join('%s (%s)' % (e['Key'], e.get('Code')) for e in errors))
@@ -0,0 +1,381 @@
+# coding=utf-8
+# Licensed Materials - Property of IBM
+# Copyright IBM Corp. 2020
+
+"""
+Throughput and latency benchmarks for the object storage composites.
+
+All benchmarks run against :py:class:`~streamsx.objectstorage.LocalObjectStorage`, so results
+depend on the local disk and CPU only, not on network latency or request limits.
+
+* ``read``, ``split_read``, ``read_parquet`` and ``scan`` run the Python operators of
+  :py:class:`~streamsx.objectstorage.Read`, :py:class:`~streamsx.objectstorage.ParallelRead`,
+  :py:class:`~streamsx.objectstorage.ReadParquet` and :py:class:`~streamsx.objectstorage.Scan`
+  in process and require ``boto3`` (``pyarrow`` for parquet).
+* ``write`` and ``write_parquet`` submit topologies with :py:class:`~streamsx.objectstorage.Write` and
+  :py:class:`~streamsx.objectstorage.WriteParquet` in standalone mode and require ``STREAMS_INSTALL``,
+  set ``COS_TOOLKIT_HOME`` to use a local toolkit.
+
+Each result reports tuples/s, MB/s, the object size distribution and latency percentiles
+(write: tuple creation until its object is complete, read: per object or split, scan: per listing).
+Results are written as JSON and can be compared with the results of a previous release::
+
+    cd package
+    python3 -u -m streamsx.objectstorage.tests.benchmark --output baseline.json
+    python3 -u -m streamsx.objectstorage.tests.benchmark --compare baseline.json --output results.json
+"""
+
+import argparse
+import concurrent.futures
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+import streamsx.objectstorage as objectstorage
+from streamsx.objectstorage import _s3
+from streamsx.objectstorage import _functions
+
+_BUCKET = 'benchmark'
+_BENCHMARKS = ['read', 'split_read', 'read_parquet', 'scan', 'write', 'write_parquet']
+_PYARROW_CODECS = {'UNCOMPRESSED': 'none', 'SNAPPY': 'snappy', 'GZIP': 'gzip', 'LZO': 'lzo'}
+
+
+def _percentiles(values):
+    if not values:
+        return {}
+    values = sorted(values)
+    result = {'count': len(values), 'min': values[0], 'max': values[-1]}
+    for p in (50, 90, 99):
+        result['p%d' % p] = values[int(round(p / 100.0 * (len(values) - 1)))]
+    return result
+
+
+def _result(benchmark, params, tuples, nbytes, seconds, object_sizes, latencies):
+    seconds = max(seconds, 1e-9)
+    return {
+        'benchmark': benchmark,
+        'params': params,
+        'tuples': tuples,
+        'bytes': nbytes,
+        'seconds': round(seconds, 6),
+        'tuples_per_second': round(tuples / seconds, 1),
+        'mb_per_second': round(nbytes / seconds / 1e6, 3),
+        'object_sizes': _percentiles(object_sizes),
+        'latency_ms': {k: (round(v * 1000, 3) if k != 'count' else v) for k, v in _percentiles(latencies).items()},
+    }
+
+
+def _payload(tuple_size):
+    return ('x' * tuple_size)[:max(tuple_size - 1, 0)]
+
+
+def _put_lines(client, prefix, objects, tuples_per_object, tuple_size):
+    body = ((_payload(tuple_size) + '\n') * tuples_per_object).encode('utf-8')
+    names = []
+    for i in range(objects):
+        key = '%s/data%d.txt' % (prefix, i)
+        client.put_object(Bucket=_BUCKET, Key=key, Body=body)
+        names.append('/' + key)
+    return names, len(body)
+
+
+def _reader_args(local):
+    return (_BUCKET, local.endpoint, local.credentials, False)
+
+
+def bench_read(local, client, args, tuple_size):
+    tuples_per_object = max(args.tuples // args.objects, 1)
+    names, size = _put_lines(client, 'read/%d' % tuple_size, args.objects, tuples_per_object, tuple_size)
+    reader = _functions._LineReader(*_reader_args(local), encoding='UTF-8')
+    latencies = []
+    tuples = 0
+    with reader:
+        start = time.time()
+        for name in names:
+            t = time.time()
+            tuples += sum(1 for _ in reader(name))
+            latencies.append(time.time() - t)
+        seconds = time.time() - start
+    return _result('read', {'tuple_size': tuple_size}, tuples, size * len(names), seconds, [size] * len(names), latencies)
+
+
+def bench_split_read(local, client, args, tuple_size, width):
+    # a single large object, the worst case for a reader per object
+    names, size = _put_lines(client, 'split/%d' % tuple_size, 1, args.tuples, tuple_size)
+    split_size = max(size // (width * 4), 1)
+    splitter = _functions._ObjectSplitter(*_reader_args(local), split_size=split_size)
+    reader = _functions._RangeLineReader(*_reader_args(local), encoding='UTF-8', structured=False)
+
+    def read_split(split):
+        t = time.time()
+        n = sum(1 for _ in reader(split))
+        return n, time.time() - t
+
+    with splitter, reader:
+        start = time.time()
+        splits = list(splitter(names[0]))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=width) as executor:
+            done = list(executor.map(read_split, splits))
+        seconds = time.time() - start
+    return _result('split_read', {'tuple_size': tuple_size, 'width': width, 'split_size': split_size}, sum(n for n, _ in done), size, seconds, [size], [t for _, t in done])
+
+
+def bench_read_parquet(local, client, args, codec):
+    import pyarrow
+    import pyarrow.parquet
+    tuples_per_object = max(args.tuples // args.objects, 1)
+    table = pyarrow.table({'ts': [float(i) for i in range(tuples_per_object)], 'payload': [_payload(args.tuple_sizes[0])] * tuples_per_object})
+    buf = io.BytesIO()
+    pyarrow.parquet.write_table(table, buf, compression=_PYARROW_CODECS[codec])
+    names = []
+    for i in range(args.objects):
+        key = 'parquet/%s/data%d.parquet' % (codec, i)
+        client.put_object(Bucket=_BUCKET, Key=key, Body=buf.getvalue())
+        names.append('/' + key)
+    reader = _functions._ParquetReader(*_reader_args(local), columns=None, filters=None)
+    latencies = []
+    tuples = 0
+    with reader:
+        start = time.time()
+        for name in names:
+            t = time.time()
+            tuples += sum(1 for _ in reader(name))
+            latencies.append(time.time() - t)
+        seconds = time.time() - start
+    size = len(buf.getvalue())
+    return _result('read_parquet', {'codec': codec, 'tuple_size': args.tuple_sizes[0]}, tuples, size * len(names), seconds, [size] * len(names), latencies)
+
+
+def bench_scan(local, client, args):
+    _put_lines(client, 'scan', args.objects, 1, 10)
+    scanner = _functions._ObjectScanner(*_reader_args(local), directory='/scan', pattern='.*', sleep_time=1.0, max_sleep_time=1.0, init_delay=None, strict_mode=True)
+    latencies = []
+    listed = 0
+    with scanner:
+        start = time.time()
+        for _ in range(args.repeat):
+            scanner._seen = {}
+            t = time.time()
+            listed += sum(1 for _ in scanner._scan())
+            latencies.append(time.time() - t)
+        seconds = time.time() - start
+    return _result('scan', {'objects': args.objects}, listed, 0, seconds, [], latencies)
+
+
+class _Generator(object):
+    """Creates lines with their creation time at the given rate, ``0`` is unlimited."""
+    def __init__(self, count, tuple_size, rate, structured):
+        self.count = count
+        self.tuple_size = tuple_size
+        self.rate = rate
+        self.structured = structured
+
+    def __call__(self):
+        payload = _payload(max(self.tuple_size - 18, 1))
+        start = time.time()
+        for i in range(self.count):
+            if self.rate:
+                delay = start + i / float(self.rate) - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+            now = time.time()
+            yield {'ts': now, 'payload': payload} if self.structured else '%.6f %s' % (now, payload)
+
+
+def _rollover(spec):
+    kind, _, value = spec.partition(':')
+    if kind == 'tuples':
+        return {'tuples_per_object': int(value)}
+    if kind == 'bytes':
+        return {'bytes_per_object': int(value)}
+    if kind == 'time':
+        return {'time_per_object': float(value)}
+    raise ValueError('Invalid rollover ' + spec + ', use tuples:N, bytes:N or time:SECONDS.')
+
+
+def _submit(local, args, name, composite, rate, tuple_size, structured):
+    from streamsx.topology.topology import Topology
+    from streamsx.topology.context import submit
+    import streamsx.spl.toolkit
+    topo = Topology(name)
+    if os.environ.get('COS_TOOLKIT_HOME'):
+        streamsx.spl.toolkit.add_toolkit(topo, os.environ['COS_TOOLKIT_HOME'])
+    s = topo.source(_Generator(args.tuples, tuple_size, rate, structured))
+    s = s.map(schema='tuple<float64 ts, rstring payload>') if structured else s.as_string()
+    s.for_each(composite)
+    start = time.time()
+    submit('STANDALONE', topo)
+    return start
+
+
+def _objects(local, prefix):
+    root = os.path.join(local.directory, _BUCKET, prefix)
+    for dirpath, _, filenames in os.walk(root):
+        for f in filenames:
+            path = os.path.join(dirpath, f)
+            yield path, os.stat(path)
+
+
+def bench_write(local, client, args, tuple_size, rate, rollover, width):
+    prefix = 'write/%d_%d_%s_%d' % (tuple_size, rate, rollover.replace(':', ''), width)
+    composite = objectstorage.Write(_BUCKET, local.endpoint, '/' + prefix + '/data%OBJECTNUM.txt', credentials=local.credentials, ssl_enabled=False, width=width, **_rollover(rollover))
+    start = _submit(local, args, 'BenchmarkWrite', composite, rate, tuple_size, False)
+    sizes, latencies, end = [], [], start
+    for path, st in _objects(local, prefix):
+        sizes.append(st.st_size)
+        end = max(end, st.st_mtime)
+        with open(path) as f:
+            latencies.extend(st.st_mtime - float(line.split(' ', 1)[0]) for line in f if line.strip())
+    return _result('write', {'tuple_size': tuple_size, 'rate': rate, 'rollover': rollover, 'width': width}, len(latencies), sum(sizes), end - start, sizes, latencies)
+
+
+def bench_write_parquet(local, client, args, codec, rollover, width):
+    prefix = 'write_parquet/%s_%s_%d' % (codec, rollover.replace(':', ''), width)
+    composite = objectstorage.WriteParquet(_BUCKET, local.endpoint, '/' + prefix + '/data%OBJECTNUM.parquet', credentials=local.credentials, ssl_enabled=False, width=width, parquet_compression=codec, **_rollover(rollover))
+    tuple_size = args.tuple_sizes[0]
+    start = _submit(local, args, 'BenchmarkWriteParquet', composite, 0, tuple_size, True)
+    sizes, latencies, end = [], [], start
+    for path, st in _objects(local, prefix):
+        sizes.append(st.st_size)
+        end = max(end, st.st_mtime)
+        try:
+            import pyarrow.parquet
+            latencies.extend(st.st_mtime - ts for ts in pyarrow.parquet.read_table(path, columns=['ts']).column('ts').to_pylist())
+        except ImportError:
+            pass
+    return _result('write_parquet', {'codec': codec, 'rollover': rollover, 'width': width, 'tuple_size': tuple_size}, args.tuples, sum(sizes), end - start, sizes, latencies)
+
+
+def _runs(args):
+    """The parameter sweep, one tuple of benchmark function and arguments per run."""
+    for b in args.benchmarks:
+        if b == 'read':
+            for tuple_size in args.tuple_sizes:
+                yield bench_read, (tuple_size,)
+        elif b == 'split_read':
+            for tuple_size in args.tuple_sizes:
+                for width in args.widths:
+                    yield bench_split_read, (tuple_size, width)
+        elif b == 'read_parquet':
+            for codec in args.codecs:
+                yield bench_read_parquet, (codec,)
+        elif b == 'scan':
+            yield bench_scan, ()
+        elif b == 'write':
+            for tuple_size in args.tuple_sizes:
+                for rate in args.rates:
+                    for rollover in args.rollovers:
+                        for width in args.widths:
+                            yield bench_write, (tuple_size, rate, rollover, width)
+        elif b == 'write_parquet':
+            for codec in args.codecs:
+                for rollover in args.rollovers:
+                    for width in args.widths:
+                        yield bench_write_parquet, (codec, rollover, width)
+
+
+def _skip_reason(benchmark):
+    if benchmark in ('write', 'write_parquet') and 'STREAMS_INSTALL' not in os.environ:
+        return 'STREAMS_INSTALL required'
+    if benchmark in ('read_parquet',):
+        try:
+            import pyarrow
+        except ImportError:
+            return 'pyarrow required'
+    return None
+
+
+def compare(results, baseline):
+    """Returns the relative change of throughput and p90 latency per matching run."""
+    def key(r):
+        return r['benchmark'], json.dumps(r['params'], sort_keys=True)
+    base = {key(r): r for r in baseline['results']}
+    changes = []
+    for r in results['results']:
+        b = base.get(key(r))
+        if b is None:
+            continue
+        change = {'benchmark': r['benchmark'], 'params': r['params']}
+        if b['tuples_per_second']:
+            change['tuples_per_second'] = round(r['tuples_per_second'] / b['tuples_per_second'] - 1, 4)
+        if b['latency_ms'].get('p90'):
+            change['latency_p90'] = round(r['latency_ms'].get('p90', 0) / b['latency_ms']['p90'] - 1, 4)
+        changes.append(change)
+    return changes
+
+
+def _ints(value):
+    return [int(v) for v in value.split(',') if v]
+
+
+def _strings(value):
+    return [v for v in value.split(',') if v]
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description='Throughput and latency benchmarks against local object storage.')
+    parser.add_argument('--benchmarks', type=_strings, default=_BENCHMARKS, help='Comma separated benchmarks: ' + ', '.join(_BENCHMARKS))
+    parser.add_argument('--tuples', type=int, default=100000, help='Tuples per run.')
+    parser.add_argument('--objects', type=int, default=100, help='Objects read by the read benchmarks and listed by scan.')
+    parser.add_argument('--repeat', type=int, default=10, help='Listings per scan run.')
+    parser.add_argument('--tuple-sizes', type=_ints, default=[100, 1000], help='Comma separated tuple sizes in bytes.')
+    parser.add_argument('--rates', type=_ints, default=[0], help='Comma separated tuple rates per second of the write benchmarks, 0 is unlimited.')
+    parser.add_argument('--rollovers', type=_strings, default=['tuples:10000', 'bytes:1048576'], help='Comma separated rollover policies tuples:N, bytes:N or time:SECONDS.')
+    parser.add_argument('--codecs', type=_strings, default=['UNCOMPRESSED', 'SNAPPY', 'GZIP'], help='Comma separated parquet codecs.')
+    parser.add_argument('--widths', type=_ints, default=[1, 4], help='Comma separated parallel widths.')
+    parser.add_argument('--directory', help='Directory of the local object storage, a temporary directory by default.')
+    parser.add_argument('--output', default='-', help='JSON result file, - for standard output.')
+    parser.add_argument('--compare', help='JSON result file of a previous run to compare with.')
+    args = parser.parse_args(argv)
+    unknown = [b for b in args.benchmarks if b not in _BENCHMARKS]
+    if unknown:
+        parser.error('Unknown benchmarks ' + ', '.join(unknown))
+    return args
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    directory = args.directory or tempfile.mkdtemp(prefix='cos-benchmark-')
+    results = {
+        'version': objectstorage.__version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'results': [],
+        'skipped': [],
+    }
+    try:
+        with objectstorage.LocalObjectStorage(directory, buckets=[_BUCKET]) as local:
+            client = _s3.create_client(local.endpoint, local.credentials, False)
+            for fn, params in _runs(args):
+                name = fn.__name__[len('bench_'):]
+                reason = _skip_reason(name)
+                if reason is not None:
+                    if name not in [s['benchmark'] for s in results['skipped']]:
+                        results['skipped'].append({'benchmark': name, 'reason': reason})
+                    continue
+                r = fn(local, client, args, *params)
+                print('%-14s %-70s %12.1f tuples/s %9.3f MB/s' % (r['benchmark'], json.dumps(r['params'], sort_keys=True), r['tuples_per_second'], r['mb_per_second']), file=sys.stderr)
+                results['results'].append(r)
+    finally:
+        if args.directory is None:
+            shutil.rmtree(directory, ignore_errors=True)
+    if args.compare:
+        with open(args.compare) as f:
+            results['comparison'] = compare(results, json.load(f))
+    if args.output == '-':
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == '__main__':
+    main()
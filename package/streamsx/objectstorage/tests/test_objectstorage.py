@@ -16,8 +16,27 @@ import time
 import json
 import random
 import string
+import io
+import gzip
+import uuid
+import hashlib
+import shutil
+import tempfile
 from subprocess import call, Popen, PIPE
 
+try:
+    import pyarrow
+    import pyarrow.parquet
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
+
+try:
+    import boto3
+    _HAS_BOTO3 = True
+except ImportError:
+    _HAS_BOTO3 = False
+
 ##
 ## Test assumptions
 ##
@@ -65,6 +84,751 @@ class TestParams(TestCase):
         result = context.submit("TOOLKIT", topo.graph) # creates tk* directory
         print(' (TOOLKIT):' + str(result))
 
+    def test_rollover(self):
+        topo = Topology()
+        to_cos = topo.source(['Hello', 'World!']).as_string()
+        sink = to_cos.for_each(objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'hw%OBJECTNUM.txt'))
+        self.assertEqual(['timePerObject'], [p for p in sink._op().params if p.endswith('PerObject')])
+        sink = to_cos.for_each(objectstorage.WriteParquet('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'hw%OBJECTNUM.parquet', time_per_object=datetime.timedelta(minutes=5), bytes_per_object=128*1024*1024))
+        params = sink._op().params
+        self.assertEqual('300.0', str(params['timePerObject']))
+        self.assertEqual('134217728', str(params['bytesPerObject']))
+        sink = objectstorage.write(to_cos, 'streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'hw%OBJECTNUM.txt', tuples_per_object=1000, close_on_punct=True)
+        params = sink._op().params
+        self.assertNotIn('timePerObject', params)
+        self.assertEqual('1000', str(params['tuplesPerObject']))
+        self.assertEqual('true', str(params['closeOnPunct']))
+        self.assertRaises(ValueError, objectstorage.write_parquet, to_cos, 'streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'hw%OBJECTNUM.parquet', bytes_per_object=0)
+        self.assertRaises(TypeError, objectstorage.write_parquet, to_cos, 'streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'hw%OBJECTNUM.parquet', tuples_per_object=1.5)
+
+    def test_parquet_options(self):
+        topo = Topology()
+        to_cos = topo.source(['Hello', 'World!']).as_string()
+        sink = to_cos.for_each(objectstorage.WriteParquet('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'hw%OBJECTNUM.parquet'))
+        params = sink._op().params
+        self.assertEqual('SNAPPY', params['parquetCompression'])
+        self.assertEqual('true', str(params['parquetEnableDict']))
+        sink = to_cos.for_each(objectstorage.WriteParquet('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'hw%OBJECTNUM.parquet', parquet_compression='gzip', parquet_block_size=256*1024*1024, parquet_page_size=64*1024, parquet_enable_dict=False, parquet_writer_version='v2'))
+        params = sink._op().params
+        self.assertEqual('GZIP', params['parquetCompression'])
+        self.assertEqual('false', str(params['parquetEnableDict']))
+        self.assertEqual('268435456', str(params['parquetBlockSize']))
+        self.assertEqual('65536', str(params['parquetPageSize']))
+        self.assertEqual('v2', params['parquetWriterVersion'])
+        sink = objectstorage.write_parquet(to_cos, 'streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'hw%OBJECTNUM.parquet', parquet_compression='UNCOMPRESSED', parquet_dict_page_size=1024, parquet_enable_schema_validation=True)
+        params = sink._op().params
+        self.assertEqual('UNCOMPRESSED', params['parquetCompression'])
+        self.assertEqual('1024', str(params['parquetDictPageSize']))
+        self.assertEqual('true', str(params['parquetEnableSchemaValidation']))
+        self.assertRaises(ValueError, objectstorage.write_parquet, to_cos, 'streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'hw%OBJECTNUM.parquet', parquet_compression='ZSTD')
+        self.assertRaises(ValueError, objectstorage.write_parquet, to_cos, 'streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'hw%OBJECTNUM.parquet', parquet_writer_version='v3')
+        self.assertRaises(ValueError, objectstorage.write_parquet, to_cos, 'streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'hw%OBJECTNUM.parquet', parquet_block_size=4*1024*1024*1024)
+
+    def test_s3a_upload_options(self):
+        topo = Topology()
+        to_cos = topo.source(['Hello', 'World!']).as_string()
+        to_cos.for_each(objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/sample/hw%OBJECTNUM.txt', protocol='s3a', vm_arg='-Xmx2g', s3a_multipart_size=128*1024*1024, s3a_fast_upload_buffer='bytebuffer', s3a_fast_upload_active_blocks=2, s3a_upload_threads=8))
+        self.assertEqual(['-Xmx2g', '-Dfs.s3a.multipart.size=134217728', '-Dfs.s3a.fast.upload=true', '-Dfs.s3a.fast.upload.buffer=bytebuffer', '-Dfs.s3a.fast.upload.active.blocks=2', '-Dfs.s3a.threads.max=8'], topo.graph.operators[-1].params['vmArg'])
+        rows = topo.source([{'a': 'x', 'b': 1}])
+        rows.for_each(objectstorage.WriteParquet('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/sample/hw%OBJECTNUM.parquet', protocol='s3a', schema='tuple<rstring a, int32 b>', s3a_fast_upload_buffer='disk'))
+        self.assertEqual(['-Dfs.s3a.fast.upload=true', '-Dfs.s3a.fast.upload.buffer=disk'], topo.graph.operators[-1].params['vmArg'])
+        self.assertRaises(ValueError, to_cos.for_each, objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/sample/hw%OBJECTNUM.txt', s3a_upload_threads=8))
+        self.assertRaises(ValueError, to_cos.for_each, objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/sample/hw%OBJECTNUM.txt', protocol='s3a', s3a_multipart_size=1024*1024))
+        self.assertRaises(ValueError, to_cos.for_each, objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/sample/hw%OBJECTNUM.txt', protocol='s3a', s3a_fast_upload_buffer='heap'))
+
+    def test_auto_heap(self):
+        topo = Topology()
+        rows = topo.source([{'day': '2020-05-17', 'value': 1.0}])
+        with self.assertWarns(UserWarning):
+            rows.for_each(objectstorage.WriteParquet('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/sample/p%OBJECTNUM.parquet', schema='tuple<rstring day, float64 value>', partition_by=['day'], width=2, auto_heap=True, open_objects=20, memory_limit=2*1024*1024*1024))
+        # ten open objects per channel buffering a row group and a disk upload buffer
+        self.assertEqual(['-Xmx2424m'], topo.graph.operators[-1].params['vmArg'])
+        rows.for_each(objectstorage.WriteParquet('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/sample/p%OBJECTNUM.parquet', time_per_object=60, schema='tuple<rstring day, float64 value>', auto_heap=True, tuple_rate=1000, tuple_size=100))
+        self.assertEqual(['-Xmx402m'], topo.graph.operators[-1].params['vmArg'])
+        lines = topo.source(['Hello']).as_string()
+        lines.for_each(objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/sample/hw%OBJECTNUM.txt', protocol='s3a', bytes_per_object=20*1024*1024, s3a_multipart_size=16*1024*1024, s3a_fast_upload_buffer='bytebuffer', s3a_fast_upload_active_blocks=2, auto_heap=True))
+        self.assertEqual(['-Dfs.s3a.multipart.size=16777216', '-Dfs.s3a.fast.upload=true', '-Dfs.s3a.fast.upload.buffer=bytebuffer', '-Dfs.s3a.fast.upload.active.blocks=2', '-Xmx384m', '-XX:MaxDirectMemorySize=20m'], topo.graph.operators[-1].params['vmArg'])
+        self.assertRaises(ValueError, lines.for_each, objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/sample/hw%OBJECTNUM.txt', vm_arg='-Xmx1g', auto_heap=True))
+        self.assertRaises(ValueError, lines.for_each, objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/sample/hw%OBJECTNUM.txt', auto_heap=True, tuple_rate=0))
+
+    def test_parquet_schema(self):
+        topo = Topology()
+        readings = topo.source([{'id': 'sensor1', 'ts': 1589712000, 'value': 20.5}])
+        self.assertRaises(ValueError, readings.for_each, objectstorage.WriteParquet('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'r%OBJECTNUM.parquet'))
+        schema = StreamSchema('tuple<rstring id, int64 ts, float64 value, tuple<float64 lat, float64 lon> location, list<rstring> tags>')
+        ops = len(topo.graph.operators)
+        readings.for_each(objectstorage.WriteParquet('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'r%OBJECTNUM.parquet', schema=schema))
+        # conversion to the schema and sink
+        self.assertEqual(ops + 2, len(topo.graph.operators))
+        self.assertEqual(schema.schema(), topo.graph.operators[-2].outputPorts[0].schema.schema())
+        structured = readings.map(schema=schema)
+        ops = len(topo.graph.operators)
+        structured.for_each(objectstorage.WriteParquet('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'r%OBJECTNUM.parquet', schema=schema))
+        # no conversion of a structured stream with the schema
+        self.assertEqual(ops + 1, len(topo.graph.operators))
+        # schemas with a different tuple style
+        named = StreamSchema('tuple<rstring id, int64 ts, float64 value>').as_tuple(named=True)
+        structured = readings.map(schema='tuple<rstring id, int64 ts, float64 value>')
+        ops = len(topo.graph.operators)
+        structured.for_each(objectstorage.WriteParquet('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'r%OBJECTNUM.parquet', schema=named))
+        self.assertEqual(ops + 1, len(topo.graph.operators))
+        # a single conversion before the parallel region
+        ops = len(topo.graph.operators)
+        readings.for_each(objectstorage.WriteParquet('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'r%OBJECTNUM.parquet', schema=named, width=2, partition_by='id'))
+        self.assertEqual(['com.ibm.streamsx.topology.functional.python::Map', '$Parallel$', 'com.ibm.streamsx.objectstorage::ObjectStorageSink'], [o.kind for o in topo.graph.operators[ops:]])
+
+    def test_partition_by(self):
+        topo = Topology()
+        events = topo.source([{'date': '2020-05-17', 'region': 'eu', 'value': 1.5}]).map(schema='tuple<rstring date, rstring region, float64 value>')
+        sink = events.for_each(objectstorage.WriteParquet('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'events%OBJECTNUM.parquet', partition_by=['date', 'region'], skip_partition_attributes=True, width=4))
+        params = sink._op().params
+        self.assertEqual(['date', 'region'], params['partitionValueAttributes'])
+        self.assertEqual('true', str(params['skipPartitionAttributes']))
+        lines = topo.source([{'tenant': 'a', 'line': 'x'}]).map(schema='tuple<rstring tenant, rstring line>')
+        sink = lines.for_each(objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'lines%OBJECTNUM.txt', partition_by='tenant'))
+        self.assertEqual(['tenant'], sink._op().params['partitionValueAttributes'])
+        self.assertRaises(ValueError, events.for_each, objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'lines%OBJECTNUM.txt', partition_by='date'))
+        self.assertRaises(ValueError, events.for_each, objectstorage.WriteParquet('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'events%OBJECTNUM.parquet', partition_by=['day']))
+        to_cos = topo.source(['Hello']).as_string()
+        self.assertRaises(ValueError, to_cos.for_each, objectstorage.WriteParquet('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'events%OBJECTNUM.parquet', partition_by=['date']))
+
+    def test_object_name_attribute(self):
+        topo = Topology()
+        lines = topo.source([{'tenant': 'a', 'line': 'x'}]).map(schema='tuple<rstring tenant, rstring line>')
+        sink = lines.for_each(objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', None, object_name_attribute='tenant', width=4))
+        params = sink._op().params
+        self.assertNotIn('objectName', params)
+        self.assertEqual('tenant', str(params['objectNameAttribute']))
+        self.assertEqual('line', str(params['dataAttribute']))
+        events = topo.source([{}]).map(schema='tuple<rstring target, int64 ts, float64 value>')
+        self.assertRaises(ValueError, events.for_each, objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', None, object_name_attribute='target'))
+        self.assertRaises(ValueError, events.for_each, objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'x.txt', object_name_attribute='target', data_attribute='value'))
+        self.assertRaises(ValueError, events.for_each, objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', None))
+        sink = events.for_each(objectstorage.WriteParquet('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', None, object_name_attribute='target'))
+        self.assertEqual('target', str(sink._op().params['objectNameAttribute']))
+
+    def test_write_width(self):
+        topo = Topology()
+        to_cos = topo.source(['Hello', 'World!']).as_string()
+        sink = to_cos.for_each(objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/sample/hw%OBJECTNUM.txt', width=3))
+        self.assertEqual('"/sample/hw" + (rstring)getChannel() + "_%OBJECTNUM.txt"', str(sink._op().params['objectName']))
+        sink = to_cos.for_each(objectstorage.WriteParquet('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/sample/hw.parquet', width=2))
+        self.assertEqual('"/sample/hw_" + (rstring)getChannel() + ".parquet"', str(sink._op().params['objectName']))
+        sink = to_cos.for_each(objectstorage.WriteParquet('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/sample/hw.parquet', width=1))
+        self.assertEqual('/sample/hw.parquet', sink._op().params['objectName'])
+        self.assertRaises(ValueError, to_cos.for_each, objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'hw.txt', width=0))
+        self.assertRaises(TypeError, to_cos.for_each, objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'hw.txt', width='2'))
+
+    def test_read_blocks(self):
+        topo = Topology()
+        scanned = topo.source(['/sample/image.jpg']).as_string()
+        blocks = scanned.map(objectstorage.Read('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', block_size=1024*1024))
+        self.assertEqual(StreamSchema('tuple<blob data>'), blocks.oport.schema)
+        self.assertEqual('1048576', str(topo.graph.operators[-1].params['blockSize']))
+        blocks = objectstorage.read(scanned, 'streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', block_size=4096)
+        self.assertEqual(StreamSchema('tuple<blob data>'), blocks.oport.schema)
+        lines = scanned.map(objectstorage.Read('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud'))
+        self.assertEqual(CommonSchema.String, lines.oport.schema)
+        self.assertRaises(ValueError, scanned.map, objectstorage.Read('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', block_size=0))
+
+    def test_read_provenance(self):
+        topo = Topology()
+        scanned = topo.source(['/sample/hw0.txt']).as_string()
+        lines = scanned.map(objectstorage.Read('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', schema='tuple<rstring object_name, int64 offset, rstring line>', encoding='ISO-8859-1'))
+        self.assertEqual(StreamSchema('tuple<rstring object_name, int64 offset, rstring line>'), lines.oport.schema)
+        self.assertRaises(ValueError, scanned.map, objectstorage.Read('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', schema='tuple<rstring name, rstring line>'))
+        self.assertRaises(ValueError, scanned.map, objectstorage.Read('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', schema='tuple<rstring line>', block_size=1024))
+        objectstorage.read(scanned, 'streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', encoding='ISO-8859-1')
+        self.assertEqual('ISO-8859-1', topo.graph.operators[-1].params['encoding'])
+
+    def test_line_reader(self):
+        from streamsx.objectstorage._functions import _LineReader, _iter_lines
+        self.assertEqual([(0, b'ab'), (3, b'c'), (6, b''), (7, b'def')], list(_iter_lines(io.BytesIO(b'ab\nc\r\n\ndef'), chunk_size=2)))
+        reader = _LineReader('b', 'e', {}, None, 'ISO-8859-1')
+        reader._client = _BytesClient({'sample/hw0.txt': 'Hello\nW\xf6rld!\n'.encode('ISO-8859-1')})
+        self.assertEqual([{'object_name': '/sample/hw0.txt', 'line_number': 1, 'offset': 0, 'line': 'Hello'}, {'object_name': '/sample/hw0.txt', 'line_number': 2, 'offset': 6, 'line': 'W\xf6rld!'}], list(reader('/sample/hw0.txt')))
+
+    def test_read_batches(self):
+        topo = Topology()
+        scanned = topo.source(['/sample/hw0.txt']).as_string()
+        batches = scanned.map(objectstorage.Read('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', batch_lines=1000))
+        self.assertEqual(CommonSchema.Python, batches.oport.schema)
+        batches = scanned.map(objectstorage.Read('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', batch_bytes=1024*1024, batch_lines=1000))
+        self.assertEqual(StreamSchema('tuple<rstring object_name, blob data, list<int64> offsets>'), batches.oport.schema)
+        self.assertRaises(ValueError, scanned.map, objectstorage.Read('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', batch_lines=0))
+        self.assertRaises(ValueError, scanned.map, objectstorage.Read('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', batch_lines=10, block_size=1024))
+        self.assertRaises(ValueError, scanned.map, objectstorage.ParallelRead('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 4, batch_bytes=1024, split_size=1024))
+
+        from streamsx.objectstorage._functions import _BatchReader
+        client = _BytesClient({'sample/hw0.txt': b'a\nbb\r\nccc\ndddd\ne'})
+        reader = _BatchReader('b', 'e', {}, None, 'UTF-8', 2, None)
+        reader._client = client
+        self.assertEqual([['a', 'bb'], ['ccc', 'dddd'], ['e']], list(reader('/sample/hw0.txt')))
+        reader = _BatchReader('b', 'e', {}, None, 'UTF-8', None, 7)
+        reader._client = client
+        self.assertEqual([{'object_name': '/sample/hw0.txt', 'data': b'a\nbb', 'offsets': [0, 2]}, {'object_name': '/sample/hw0.txt', 'data': b'ccc', 'offsets': [0]}, {'object_name': '/sample/hw0.txt', 'data': b'dddd\ne', 'offsets': [0, 5]}], list(reader('/sample/hw0.txt')))
+
+    def test_scan_polling(self):
+        topo = Topology()
+        s = topo.source(objectstorage.Scan('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', directory='/sample', sleep_time=datetime.timedelta(seconds=30), init_delay=2, strict_mode=True))
+        params = topo.graph.operators[0].params
+        self.assertEqual('30.0', str(params['sleepTime']))
+        self.assertEqual('true', str(params['strictMode']))
+        s = topo.source(objectstorage.Scan('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', directory='/sample', sleep_time=1, max_sleep_time=60))
+        self.assertEqual(CommonSchema.String, s.oport.schema)
+        self.assertRaises(ValueError, topo.source, objectstorage.Scan('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', sleep_time=10, max_sleep_time=5))
+        self.assertRaises(ValueError, objectstorage.scan, topo, 'streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', sleep_time=-1)
+
+    def test_scanner(self):
+        from streamsx.objectstorage._functions import _ObjectScanner
+        scanner = _ObjectScanner('b', 'e', {}, None, '/sample', '.*\\.txt', 1.0, 8.0, None, None)
+        scanner._client = _BytesClient({'sample/a.txt': b'a', 'sample/b.csv': b'b', 'sample/sub/c.txt': b'c'})
+        self.assertEqual(['sample/a.txt'], [o['Key'] for o in scanner._scan()])
+        self.assertEqual([], list(scanner._scan()))
+        scanner._client.objects['sample/a.txt'] = b'modified'
+        scanner._client.objects['sample/d.txt'] = b'd'
+        self.assertEqual(['sample/a.txt', 'sample/d.txt'], [o['Key'] for o in scanner._scan()])
+        self.assertEqual([2.0, 4.0, 8.0, 8.0], [scanner._next_sleep_time(t, False) for t in (1.0, 2.0, 4.0, 8.0)])
+        self.assertEqual(1.0, scanner._next_sleep_time(8.0, True))
+
+    def test_recursive_scanner(self):
+        from streamsx.objectstorage._functions import _ObjectScanner
+        objects = {'logs/a.json': b'a', 'logs/2020/01/b.json': b'b', 'logs/2020/02/c.json': b'c', 'logs/2020/02/03/d.json': b'd', 'other/e.json': b'e'}
+        scanner = _ObjectScanner('b', 'e', {}, None, '/logs/', '.*\\.json', 1.0, 1.0, None, None, True, 2, 4)
+        scanner._client = _BytesClient(objects)
+        self.assertEqual(['logs/a.json', 'logs/2020/01/b.json', 'logs/2020/02/c.json'], [o['Key'] for o in scanner._scan()])
+        scanner.max_depth = None
+        self.assertEqual(['logs/2020/02/03/d.json'], [o['Key'] for o in scanner._scan()])
+        topo = Topology()
+        s = topo.source(objectstorage.Scan('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', directory='/logs', recursive=True, max_depth=4, listing_threads=16))
+        self.assertEqual(CommonSchema.String, s.oport.schema)
+        self.assertRaises(ValueError, topo.source, objectstorage.Scan('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', recursive=True, max_depth=-1))
+
+    def test_delete_objects(self):
+        from streamsx.objectstorage import _s3
+        client = _BytesClient({'a': b'a', 'b': b'b', 'c': b'c'})
+        client.failed_deletes = 2
+        _s3.delete_objects(client, 'b', ['/a', '/b'])
+        self.assertEqual(['c'], list(client.objects))
+        client.failed_deletes = 3
+        self.assertRaises(OSError, _s3.delete_objects, client, 'b', ['/c'])
+        self.assertEqual(['c'], list(client.objects))
+
+    def test_scanner_manifest(self):
+        from streamsx.objectstorage._functions import _ObjectScanner
+        client = _BytesClient({'sample/a.txt': b'a', 'sample/b.txt': b'b'})
+        scanner = _ObjectScanner('b', 'e', {}, None, '/sample', '.*', 1.0, 1.0, None, None, manifest='/sample/manifest.json.gz')
+        scanner._client = client
+        scanner._load_manifest()
+        self.assertEqual(['sample/a.txt', 'sample/b.txt'], [o['Key'] for o in scanner._scan()])
+        self.assertIn('sample/manifest.json.gz', client.objects)
+        # restart
+        client.objects['sample/c.txt'] = b'c'
+        scanner = _ObjectScanner('b', 'e', {}, None, '/sample', '.*', 1.0, 1.0, None, None, manifest='/sample/manifest.json.gz')
+        scanner._client = client
+        scanner._load_manifest()
+        client.listed = 0
+        self.assertEqual(['sample/c.txt'], [o['Key'] for o in scanner._scan()])
+        self.assertEqual(1, client.listed)
+        self.assertEqual(['sample/a.txt', 'sample/b.txt', 'sample/c.txt'], sorted(scanner._seen))
+        self.assertEqual([], list(scanner._scan()))
+        # only a missing manifest starts a scan of all objects
+        client.objects['sample/manifest.json.gz'] = b'corrupt'
+        self.assertRaises(ValueError, scanner._load_manifest)
+        scanner._client = None
+        self.assertRaises(AttributeError, scanner._load_manifest)
+
+    def test_scan_metadata(self):
+        from streamsx.objectstorage._functions import _ObjectScanner
+        scanner = _ObjectScanner('b', 'e', {}, None, '/sample', '.*', 1.0, 1.0, None, None, metadata=True)
+        scanner._client = _BytesClient({'sample/a.txt': b'abc'})
+        o = scanner._object(next(scanner._scan()))
+        self.assertEqual('/sample/a.txt', o['object_name'])
+        self.assertEqual(3, o['size'])
+        self.assertEqual(hashlib.md5(b'abc').hexdigest(), o['etag'])
+        self.assertEqual('STANDARD', o['storage_class'])
+        self.assertIsInstance(o['last_modified'], float)
+        topo = Topology()
+        s = topo.source(objectstorage.Scan('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', schema='tuple<rstring object_name, int64 size, float64 last_modified>'))
+        self.assertEqual(['object_name', 'size', 'last_modified'], list(s.oport.schema.as_tuple(named=True).style._fields))
+        self.assertRaises(ValueError, topo.source, objectstorage.Scan('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', schema='tuple<rstring object_name, rstring owner>'))
+
+    def test_write_batches(self):
+        from streamsx.objectstorage._functions import _join_lines
+        self.assertEqual('a\nb', _join_lines(['a', 'b']))
+        self.assertEqual('a', _join_lines('a'))
+        self.assertIsNone(_join_lines([]))
+        topo = Topology()
+        batches = topo.source([['Hello', 'World!'], ['Hi']])
+        batches.for_each(objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/sample/hw%OBJECTNUM.txt', tuples_per_object=100))
+        sink = topo.graph.operators[-1]
+        self.assertEqual('com.ibm.streamsx.objectstorage::ObjectStorageSink', sink.kind)
+        self.assertEqual(CommonSchema.String, sink.inputPorts[0].schema)
+
+    def test_write_compression(self):
+        topo = Topology()
+        lines = topo.source(['Hello', 'World!']).as_string()
+        lines.for_each(objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/logs/l%OBJECTNUM.txt', compression='gzip', width=2))
+        writer = topo.graph.operators[-1]
+        self.assertNotEqual('com.ibm.streamsx.objectstorage::ObjectStorageSink', writer.kind)
+        self.assertEqual('/logs/l%CHANNEL_%OBJECTNUM.txt.gz', writer.function.object)
+        self.assertEqual(10.0, writer.function.time_per_object)
+        lines.for_each(objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/logs/l%OBJECTNUM.zst', compression='zstd', bytes_per_object=1024))
+        self.assertEqual('/logs/l%OBJECTNUM.zst', topo.graph.operators[-1].function.object)
+        self.assertIsNone(topo.graph.operators[-1].function.time_per_object)
+        self.assertRaises(ValueError, lines.for_each, objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/logs/l%OBJECTNUM.txt', compression='lz4'))
+        self.assertRaises(ValueError, lines.for_each, objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/logs/l%OBJECTNUM.txt', compression='gzip', close_on_punct=True))
+        for option in [{'vm_arg': '-Xmx2G'}, {'auto_heap': True}, {'memory_limit': 1024}, {'tuple_rate': 100}, {'tuple_size': 100}, {'open_objects': 2}, {'s3a_multipart_size': 8*1024*1024}, {'s3a_fast_upload_buffer': 'bytebuffer'}, {'s3a_fast_upload_active_blocks': 2}, {'s3a_upload_threads': 4}]:
+            self.assertRaises(ValueError, lines.for_each, objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/logs/l%OBJECTNUM.txt', compression='gzip', **option))
+        self.assertRaises(ValueError, lines.for_each, objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/logs/l%OBJECTNUM.txt', protocol='s3a', compression='gzip'))
+        compressed = lines.map(objectstorage.Read('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', compression='auto'))
+        self.assertEqual(CommonSchema.String, compressed.oport.schema)
+        self.assertRaises(ValueError, lines.map, objectstorage.Read('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', compression='zip'))
+        self.assertRaises(ValueError, lines.map, objectstorage.ParallelRead('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 4, compression='gzip', split_size=1024))
+
+    def test_consistent_region(self):
+        from streamsx.topology.state import ConsistentRegionConfig
+        topo = Topology()
+        lines = topo.source(['Hello', 'World!']).set_consistent(ConsistentRegionConfig.periodic(60)).as_string()
+        lines.for_each(objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/sample/hw%OBJECTNUM.txt', protocol='s3a'))
+        self.assertNotIn('timePerObject', topo.graph.operators[-1].params)
+        lines.for_each(objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/sample/hw%OBJECTNUM.txt', compression='gzip'))
+        self.assertTrue(topo.graph.operators[-1].function.consistent)
+        self.assertIsNone(topo.graph.operators[-1].function.time_per_object)
+        rows = lines.map(lambda l: {'line': l}, schema='tuple<rstring line>')
+        rows.for_each(objectstorage.WriteParquet('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/sample/hw%OBJECTNUM.parquet'))
+        self.assertNotIn('timePerObject', topo.graph.operators[-1].params)
+        self.assertRaises(ValueError, lines.for_each, objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/sample/hw%OBJECTNUM.txt', time_per_object=60))
+        self.assertRaises(ValueError, rows.for_each, objectstorage.WriteParquet('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/sample/hw%OBJECTNUM.parquet', tuples_per_object=1000))
+        # outside of the region
+        other = topo.source(['Hi']).as_string()
+        other.for_each(objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/sample/hw%OBJECTNUM.txt'))
+        self.assertEqual('10.0', str(topo.graph.operators[-1].params['timePerObject']))
+        lines.autonomous().for_each(objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/sample/hw%OBJECTNUM.txt'))
+        self.assertEqual('10.0', str(topo.graph.operators[-1].params['timePerObject']))
+        # objects hold the tuples of a checkpoint period of 60 seconds
+        lines.for_each(objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/sample/hw%OBJECTNUM.txt', auto_heap=True, tuple_rate=1000, tuple_size=100))
+        self.assertEqual(['-Xmx393m'], topo.graph.operators[-1].params['vmArg'])
+        other.for_each(objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/sample/hw%OBJECTNUM.txt', auto_heap=True, tuple_rate=1000, tuple_size=100))
+        self.assertEqual(['-Xmx386m'], topo.graph.operators[-1].params['vmArg'])
+        # a checkpoint period of less than a second is not a rollover policy
+        fast = topo.source(['Hello']).set_consistent(ConsistentRegionConfig.periodic(0.5)).as_string()
+        fast.for_each(objectstorage.Write('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/sample/hw%OBJECTNUM.txt', auto_heap=True, tuple_rate=1000, tuple_size=100))
+        self.assertIn('vmArg', topo.graph.operators[-1].params)
+
+    def test_compact_composite(self):
+        topo = Topology()
+        s = topo.source(objectstorage.Compact('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/logs', 128*1024*1024, recursive=True))
+        self.assertEqual(CommonSchema.String, s.oport.schema)
+        s = topo.source(objectstorage.Compact('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/parquet', 128*1024*1024, format='parquet', parquet_compression='gzip'))
+        self.assertRaises(ValueError, topo.source, objectstorage.Compact('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/logs', 1024, format='csv'))
+        self.assertRaises(ValueError, topo.source, objectstorage.Compact('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/parquet', 1024, format='parquet', parquet_compression='lzo'))
+        self.assertRaises(TypeError, topo.source, objectstorage.Compact('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/parquet', 1024, format='parquet', parquet_compression=1))
+        self.assertRaises(ValueError, topo.source, objectstorage.Compact('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/logs', 0))
+        s = topo.source(objectstorage.Compact('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/logs', 1024, max_age=datetime.timedelta(minutes=10)))
+        self.assertRaises(ValueError, topo.source, objectstorage.Compact('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/logs', 1024, max_age=-1))
+        self.assertRaises(ValueError, objectstorage.Compact, 'streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/logs', 1024, protocol='s3a')
+
+    def test_copy_composite(self):
+        topo = Topology()
+        scanned = topo.source(objectstorage.Scan('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', schema='tuple<rstring object_name, int64 size, rstring etag>'))
+        r = scanned.map(objectstorage.Copy('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'backup-bucket', width=4, max_concurrency=16))
+        self.assertEqual(CommonSchema.String, r.oport.schema)
+        self.assertRaises(ValueError, scanned.map, objectstorage.Copy('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'backup-bucket', part_size=1024))
+        self.assertRaises(ValueError, scanned.map, objectstorage.Copy('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'backup-bucket', part_size=6*1024*1024*1024))
+        s = topo.source(objectstorage.Sync('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/archive', 'backup-bucket', recursive=True, width=2))
+        self.assertEqual(CommonSchema.String, s.oport.schema)
+        self.assertRaises(ValueError, objectstorage.Sync, 'streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/archive', 'backup-bucket', block_size=1)
+        self.assertRaises(ValueError, objectstorage.Sync, 'streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', '/archive', 'backup-bucket', protocol='s3a')
+
+    def test_copy_part_limit(self):
+        from streamsx.objectstorage._functions import _Copier
+
+        class _CopyClient(object):
+            ranges = []
+
+            def create_multipart_upload(self, **kwargs):
+                return {'UploadId': 'u'}
+
+            def upload_part_copy(self, CopySourceRange, **kwargs):
+                self.ranges.append(CopySourceRange)
+                return {'CopyPartResult': {'ETag': 'e'}}
+
+            def complete_multipart_upload(self, **kwargs):
+                pass
+
+        copier = _Copier('b', 'e', {}, None, 'target', None, None, 5 * 1024 * 1024, 4, False)
+        copier._client = _CopyClient()
+        # 20000 parts of 5 MB, copied with 10000 parts of 10 MB
+        size = 20000 * 5 * 1024 * 1024
+        copier._copy_multipart({'Bucket': 'b', 'Key': 'big'}, 'big', size, 'etag', {})
+        self.assertEqual(10000, len(copier._client.ranges))
+        self.assertEqual('bytes=0-%d' % (10 * 1024 * 1024 - 1), sorted(copier._client.ranges)[0])
+
+    def test_parallel_read(self):
+        topo = Topology()
+        scanned = topo.source(['/sample/hw0.txt', '/sample/hw1.txt']).as_string()
+        r = scanned.map(objectstorage.ParallelRead('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', width=4, encoding='UTF-8'))
+        self.assertEqual(CommonSchema.String, r.oport.schema)
+        kinds = [op.kind for op in topo.graph.operators]
+        self.assertEqual(1, kinds.count('com.ibm.streamsx.objectstorage::ObjectStorageSource'))
+        self.assertEqual(2, kinds.count('$Parallel$') + kinds.count('$EndParallel$'))
+        r = scanned.map(objectstorage.ParallelRead('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 2, schema='tuple<rstring object_name, rstring line>', grouped=True))
+        r.for_each(lambda t: None)
+        r.end_parallel()
+        self.assertRaises(ValueError, scanned.map, objectstorage.ParallelRead('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', width=0))
+
+    def test_split_read(self):
+        from streamsx.objectstorage._functions import _ObjectSplitter, _RangeLineReader
+        data = b''.join(b'line %d %s\n' % (i, b'x' * (i % 7)) for i in range(1000))
+        client = _BytesClient({'big/a.txt': data})
+        splitter = _ObjectSplitter('b', 'e', {}, None, 1000)
+        splitter._client = client
+        splits = list(splitter('/big/a.txt'))
+        self.assertEqual(len(splits), len(list(splitter({'object_name': '/big/a.txt', 'size': len(data)}))))
+        reader = _RangeLineReader('b', 'e', {}, None, 'UTF-8', False)
+        reader._client = client
+        lines = [line for split in splits for line in reader(split)]
+        self.assertEqual(data.decode('UTF-8').splitlines(), lines)
+        # ranges are bounded, a line crossing the end of a split is read with further ranges
+        self.assertTrue(all(not r.endswith('-') for r in client.ranges))
+        self.assertTrue(client.requested < 2 * len(data) + len(splits) * reader._SLACK)
+        reader._SLACK = 4
+        client = _BytesClient({'big/b.txt': b'a\n' + b'x' * 100 + b'\nb\nc'})
+        reader._client = client
+        splits = [{'object_name': '/big/b.txt', 'start': start, 'end': start + 10} for start in range(0, 106, 10)]
+        self.assertEqual(['a', 'x' * 100, 'b', 'c'], [line for split in splits for line in reader(split)])
+        client.ranges = []
+        self.assertEqual(['a', 'x' * 100], list(reader(splits[0])))
+        self.assertEqual(['bytes=0-13', 'bytes=14-17'], client.ranges[:2])
+        self.assertEqual('bytes=102-105', client.ranges[-1])
+        topo = Topology()
+        scanned = topo.source(objectstorage.Scan('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', schema='tuple<rstring object_name, int64 size>'))
+        r = scanned.map(objectstorage.ParallelRead('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', width=4, split_size=64*1024*1024))
+        self.assertEqual(CommonSchema.String, r.oport.schema)
+        r = scanned.map(objectstorage.ParallelRead('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', width=4, split_size=64*1024*1024, schema='tuple<rstring object_name, int64 offset, rstring line>'))
+        self.assertRaises(ValueError, scanned.map, objectstorage.ParallelRead('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', width=4, split_size=1024, schema='tuple<int64 line_number>'))
+
+    def test_read_parquet(self):
+        topo = Topology()
+        scanned = topo.source(['/sample/test0.parquet']).as_string()
+        r = scanned.map(objectstorage.ReadParquet('streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', schema='tuple<rstring a, int32 b>', filters=[('b', '>', 1)]))
+        self.assertRaises(ValueError, objectstorage.ReadParquet, 'streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'tuple<rstring a>', filters=[('a', 'like', 'x')])
+        self.assertRaises(TypeError, objectstorage.ReadParquet, 'streams-bucket', 's3.private.us-south.cloud-object-storage.appdomain.cloud', 'tuple<rstring a>', filters=['a'])
+
+
+class _NoSuchKey(Exception):
+    response = {'Error': {'Code': 'NoSuchKey'}}
+
+
+class _BytesClient(object):
+    # minimal S3 client serving objects from a dict
+    def __init__(self, objects):
+        self.objects = objects
+        self.requested = 0
+        self.ranges = []
+        self.listed = 0
+        self.failed_deletes = 0
+
+    def put_object(self, Bucket, Key, Body):
+        self.objects[Key] = Body
+
+    def delete_objects(self, Bucket, Delete):
+        keys = [o['Key'] for o in Delete['Objects']]
+        if self.failed_deletes:
+            # the first object is not deleted
+            self.failed_deletes -= 1
+            keys, errors = keys[1:], [{'Key': keys[0], 'Code': 'InternalError'}]
+        else:
+            errors = []
+        for key in keys:
+            self.objects.pop(key, None)
+        return {'Errors': errors} if errors else {}
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise _NoSuchKey(Key)
+        return {'ContentLength': len(self.objects[Key])}
+
+    def list_objects_v2(self, Bucket, Prefix='', Delimiter=None, ContinuationToken=None, StartAfter=''):
+        self.listed += 1
+        contents = []
+        prefixes = set()
+        for key in sorted(self.objects):
+            if not key.startswith(Prefix) or key <= StartAfter:
+                continue
+            sep = key.find(Delimiter, len(Prefix)) if Delimiter else -1
+            if sep >= 0:
+                prefixes.add(key[:sep+1])
+            else:
+                contents.append({'Key': key, 'Size': len(self.objects[key]), 'ETag': '"%s"' % hashlib.md5(self.objects[key]).hexdigest(), 'LastModified': datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc), 'StorageClass': 'STANDARD'})
+        return {'Contents': contents, 'CommonPrefixes': [{'Prefix': p} for p in sorted(prefixes)], 'IsTruncated': False}
+
+    def get_object(self, Bucket, Key, Range=None):
+        if Key not in self.objects:
+            raise _NoSuchKey(Key)
+        data = self.objects[Key]
+        if Range is not None:
+            self.ranges.append(Range)
+            start, end = Range[len('bytes='):].split('-')
+            data = data[int(start):int(end)+1] if end else data[int(start):]
+        self.requested += len(data)
+        return {'Body': io.BytesIO(data)}
+
+
+@unittest.skipUnless(_HAS_PYARROW, "pyarrow required")
+class TestParquetReader(TestCase):
+    def setUp(self):
+        table = pyarrow.table({'day': [d for d in range(10) for _ in range(1000)], 'value': [float(i) for i in range(10000)], 'payload': [str(i) * 20 for i in range(10000)]})
+        buf = io.BytesIO()
+        pyarrow.parquet.write_table(table, buf, row_group_size=1000)
+        self.data = buf.getvalue()
+
+    def _read(self, columns, filters):
+        from streamsx.objectstorage._functions import _ParquetReader
+        reader = _ParquetReader('b', 'e', {}, None, columns, filters)
+        reader._client = _BytesClient({'data/day.parquet': self.data})
+        return list(reader('/data/day.parquet')), reader._client.requested
+
+    def test_projection_and_pushdown(self):
+        rows, requested = self._read(['day', 'value'], [('day', '=', 3)])
+        self.assertEqual(1000, len(rows))
+        self.assertEqual({'day': 3, 'value': 3000.0}, rows[0])
+        # footer and one row group of the two projected columns
+        self.assertLess(requested, len(self.data) / 2)
+
+    def test_filter_in(self):
+        rows, _ = self._read(['value'], [('day', 'in', [1, 2]), ('value', '<', 1500.0)])
+        self.assertEqual(500, len(rows))
+        self.assertEqual([{'value': 1000.0}], rows[:1])
+
+
+@unittest.skipUnless(_HAS_BOTO3, "boto3 required")
+class TestLocalObjectStorage(TestCase):
+    def setUp(self):
+        self.local = objectstorage.LocalObjectStorage(tempfile.mkdtemp(), buckets=['streams-bucket']).start()
+        from streamsx.objectstorage import _s3
+        self.client = _s3.create_client(self.local.endpoint, self.local.credentials, False)
+
+    def tearDown(self):
+        self.local.stop()
+        shutil.rmtree(self.local.directory)
+
+    def test_scan_read(self):
+        from streamsx.objectstorage._functions import _ObjectScanner, _LineReader, _ObjectSplitter, _RangeLineReader
+        self.client.put_object(Bucket='streams-bucket', Key='sample/hw0.txt', Body=b'Hello\nWorld!\n')
+        self.client.put_object(Bucket='streams-bucket', Key='sample/2020/01/hw1.txt', Body=b'Hi')
+        self.assertTrue(os.path.isfile(os.path.join(self.local.directory, 'streams-bucket', 'sample', 'hw0.txt')))
+        scanner = _ObjectScanner('streams-bucket', self.local.endpoint, self.local.credentials, False, '/sample', '.*\\.txt', 1.0, 1.0, None, True, True, None, 2, None, True)
+        with scanner:
+            scanned = sorted((scanner._object(o) for o in scanner._scan()), key=lambda o: o['object_name'])
+        self.assertEqual(['/sample/2020/01/hw1.txt', '/sample/hw0.txt'], [o['object_name'] for o in scanned])
+        self.assertEqual([2, 13], [o['size'] for o in scanned])
+        reader = _LineReader('streams-bucket', self.local.endpoint, self.local.credentials, False, 'UTF-8')
+        with reader:
+            self.assertEqual(['Hello', 'World!'], [t['line'] for t in reader('/sample/hw0.txt')])
+        splitter = _ObjectSplitter('streams-bucket', self.local.endpoint, self.local.credentials, False, 4)
+        reader = _RangeLineReader('streams-bucket', self.local.endpoint, self.local.credentials, False, 'UTF-8', False)
+        with splitter, reader:
+            self.assertEqual(['Hello', 'World!'], [line for split in splitter('/sample/hw0.txt') for line in reader(split)])
+
+    def test_multipart_copy_delete(self):
+        c = self.client
+        upload = c.create_multipart_upload(Bucket='streams-bucket', Key='big.bin')
+        part1 = c.upload_part(Bucket='streams-bucket', Key='big.bin', UploadId=upload['UploadId'], PartNumber=1, Body=b'a' * 10)
+        part2 = c.upload_part(Bucket='streams-bucket', Key='big.bin', UploadId=upload['UploadId'], PartNumber=2, Body=b'b' * 5)
+        c.complete_multipart_upload(Bucket='streams-bucket', Key='big.bin', UploadId=upload['UploadId'], MultipartUpload={'Parts': [{'PartNumber': 1, 'ETag': part1['ETag']}, {'PartNumber': 2, 'ETag': part2['ETag']}]})
+        c.copy_object(Bucket='streams-bucket', Key='copy/big.bin', CopySource={'Bucket': 'streams-bucket', 'Key': 'big.bin'})
+        self.assertEqual(b'a' * 10 + b'b' * 5, c.get_object(Bucket='streams-bucket', Key='copy/big.bin')['Body'].read())
+        self.assertEqual(b'ab', c.get_object(Bucket='streams-bucket', Key='big.bin', Range='bytes=9-10')['Body'].read())
+        c.delete_objects(Bucket='streams-bucket', Delete={'Objects': [{'Key': 'big.bin'}, {'Key': 'copy/big.bin'}]})
+        self.assertEqual(0, c.list_objects_v2(Bucket='streams-bucket')['KeyCount'])
+        self.assertRaises(c.exceptions.NoSuchKey, c.get_object, Bucket='streams-bucket', Key='big.bin')
+
+    def _compact(self, compactor):
+        with compactor:
+            self.assertEqual([], [t for t in map(compactor._object, compactor._scan()) if t is not None])
+            return list(compactor._scanned())
+
+    def test_compact(self):
+        from streamsx.objectstorage._functions import _Compactor
+        for i in range(5):
+            self.client.put_object(Bucket='streams-bucket', Key='logs/a/data%d.txt' % i, Body=b'line %d\n' % i)
+        self.client.put_object(Bucket='streams-bucket', Key='logs/b/data.txt', Body=b'other')
+        names = self._compact(_Compactor('streams-bucket', self.local.endpoint, self.local.credentials, False, '/logs', '.*', 1.0, 1.0, True, 1, 21, 3600.0, 'raw', None))
+        self.assertEqual(1, len(names))
+        self.assertRegex(names[0], '^/logs/a/compacted-[0-9]+-[0-9a-f]+\\.txt$')
+        keys = [o['Key'] for o in self.client.list_objects_v2(Bucket='streams-bucket', Prefix='logs/')['Contents']]
+        self.assertEqual(sorted(['logs/b/data.txt', names[0][1:]]), keys)
+        self.assertEqual(b'line 0\nline 1\nline 2\nline 3\nline 4\n', self.client.get_object(Bucket='streams-bucket', Key=names[0][1:])['Body'].read())
+        compacted = names[0]
+        # small objects not reaching target_size are compacted after max_age
+        for i in range(2):
+            self.client.put_object(Bucket='streams-bucket', Key='logs/a/new%d.txt' % i, Body=b'new %d' % i)
+        names = self._compact(_Compactor('streams-bucket', self.local.endpoint, self.local.credentials, False, '/logs', '.*', 1.0, 1.0, True, 1, 21, 0.0, 'raw', None))
+        self.assertEqual(1, len(names))
+        keys = [o['Key'] for o in self.client.list_objects_v2(Bucket='streams-bucket', Prefix='logs/')['Contents']]
+        self.assertEqual(sorted(['logs/b/data.txt', compacted[1:], names[0][1:]]), keys)
+        self.assertEqual(b'new 0\nnew 1\n', self.client.get_object(Bucket='streams-bucket', Key=names[0][1:])['Body'].read())
+
+    def test_compact_failed_delete(self):
+        from streamsx.objectstorage._functions import _Compactor, _encode_sources
+        for i in range(3):
+            self.client.put_object(Bucket='streams-bucket', Key='logs/data%d.txt' % i, Body=b'line %d\n' % i)
+        compactor = _Compactor('streams-bucket', self.local.endpoint, self.local.credentials, False, '/logs', '.*', 1.0, 1.0, False, 1, 10, 3600.0, 'raw', None)
+        with compactor:
+            def delete_objects(**kwargs):
+                raise OSError('failed')
+            compactor._client.delete_objects = delete_objects
+            list(map(compactor._object, compactor._scan()))
+            names = list(compactor._scanned())
+        self.assertEqual(1, len(names))
+        self.assertEqual(4, len(self.client.list_objects_v2(Bucket='streams-bucket', Prefix='logs/')['Contents']))
+        # after a restart the originals are found with the compacted object and deleted, not compacted again
+        self.assertEqual([], self._compact(_Compactor('streams-bucket', self.local.endpoint, self.local.credentials, False, '/logs', '.*', 1.0, 1.0, False, 1, 10, 0.0, 'raw', None)))
+        keys = [o['Key'] for o in self.client.list_objects_v2(Bucket='streams-bucket', Prefix='logs/')['Contents']]
+        self.assertEqual([names[0][1:]], keys)
+        self.assertEqual(b'line 0\nline 1\nline 2\n', self.client.get_object(Bucket='streams-bucket', Key=keys[0])['Body'].read())
+        # the names of the merged objects fit into the user metadata
+        names = _Compactor._sources(['/logs/%s.txt' % uuid.uuid4().hex for i in range(1000)])
+        self.assertTrue(1 < len(names) < 1000)
+        self.assertTrue(len(_encode_sources([n[6:] for n in names])) <= 1800)
+
+    def test_compression(self):
+        from streamsx.objectstorage._functions import _CompressedWriter, _LineReader, _BatchReader
+        for compression in ['gzip', 'bz2']:
+            writer = _CompressedWriter('streams-bucket', self.local.endpoint, self.local.credentials, False, '/logs/%s/l%%OBJECTNUM.txt.%s' % (compression, compression), compression, 'header', None, None, 3)
+            with writer:
+                for i in range(5):
+                    writer('line %d' % i)
+            keys = [o['Key'] for o in self.client.list_objects_v2(Bucket='streams-bucket', Prefix='logs/' + compression)['Contents']]
+            self.assertEqual(['logs/%s/l0.txt.%s' % (compression, compression), 'logs/%s/l1.txt.%s' % (compression, compression)], keys)
+            reader = _LineReader('streams-bucket', self.local.endpoint, self.local.credentials, False, 'UTF-8', 'auto', structured=False)
+            with reader:
+                self.assertEqual(['header', 'line 0', 'line 1', 'line 2'], list(reader('/' + keys[0])))
+                self.assertEqual(['header', 'line 3', 'line 4'], list(reader('/' + keys[1])))
+        # objects created by appends hold several gzip members
+        self.client.put_object(Bucket='streams-bucket', Key='logs/appended.gz', Body=gzip.compress(b'a\nb\n') + gzip.compress(b'c\n'))
+        self.client.put_object(Bucket='streams-bucket', Key='logs/plain.txt', Body=b'BZh\nd\n')
+        reader = _BatchReader('streams-bucket', self.local.endpoint, self.local.credentials, False, 'UTF-8', 10, None, 'auto')
+        with reader:
+            self.assertEqual([['a', 'b', 'c']], list(reader('/logs/appended.gz')))
+            self.assertEqual([['BZh', 'd']], list(reader('/logs/plain.txt')))
+
+    def test_compressed_writer_reset(self):
+        import pickle
+        from streamsx.objectstorage._functions import _CompressedWriter
+        writer = _CompressedWriter('streams-bucket', self.local.endpoint, self.local.credentials, False, '/logs/c%OBJECTNUM.txt.gz', 'gzip', None, None, None, None, True)
+        writer.__enter__()
+        writer('a')
+        writer('b')
+        # checkpoint after the region is drained
+        checkpoint = pickle.dumps(writer)
+        writer('c')
+        upload = self.client.create_multipart_upload(Bucket='streams-bucket', Key='logs/c1.txt.gz')
+        self.client.upload_part(Bucket='streams-bucket', Key='logs/c1.txt.gz', UploadId=upload['UploadId'], PartNumber=1, Body=b'staged')
+        self.assertEqual(1, len(self.client.list_multipart_uploads(Bucket='streams-bucket')['Uploads']))
+        # reset to the checkpoint, the tuple c is replayed
+        writer = pickle.loads(checkpoint)
+        writer.__enter__()
+        self.assertNotIn('Uploads', self.client.list_multipart_uploads(Bucket='streams-bucket'))
+        writer('c')
+        pickle.dumps(writer)
+        keys = [o['Key'] for o in self.client.list_objects_v2(Bucket='streams-bucket', Prefix='logs/')['Contents']]
+        self.assertEqual(['logs/c0.txt.gz', 'logs/c1.txt.gz'], keys)
+        self.assertEqual(b'a\nb\n', gzip.decompress(self.client.get_object(Bucket='streams-bucket', Key=keys[0])['Body'].read()))
+        self.assertEqual(b'c\n', gzip.decompress(self.client.get_object(Bucket='streams-bucket', Key=keys[1])['Body'].read()))
+
+    def test_compressed_writer_exit(self):
+        import pickle
+        from streamsx.objectstorage._functions import _CompressedWriter
+        writer = _CompressedWriter('streams-bucket', self.local.endpoint, self.local.credentials, False, '/logs/e%OBJECTNUM.txt.gz', 'gzip', None, None, None, None, True)
+        writer.__enter__()
+        writer('a')
+        checkpoint = pickle.dumps(writer)
+        writer('b')
+        # the operator is closed on a reset, the object written after the checkpoint is not created
+        writer.__exit__(None, None, None)
+        keys = [o['Key'] for o in self.client.list_objects_v2(Bucket='streams-bucket', Prefix='logs/').get('Contents', [])]
+        self.assertEqual(['logs/e0.txt.gz'], keys)
+        self.assertNotIn('Uploads', self.client.list_multipart_uploads(Bucket='streams-bucket'))
+        # reset to the checkpoint, the object is completed on shutdown
+        writer = pickle.loads(checkpoint)
+        writer.__enter__()
+        writer('b')
+        import streamsx.ec
+        streamsx.ec._prepare_shutdown()
+        try:
+            writer.__exit__(None, None, None)
+        finally:
+            streamsx.ec._SHUTDOWN.clear()
+        keys = [o['Key'] for o in self.client.list_objects_v2(Bucket='streams-bucket', Prefix='logs/')['Contents']]
+        self.assertEqual(['logs/e0.txt.gz', 'logs/e1.txt.gz'], keys)
+
+    @unittest.skipUnless(_HAS_PYARROW, "pyarrow required")
+    def test_compact_parquet(self):
+        from streamsx.objectstorage._functions import _Compactor
+        for i in range(2):
+            buf = io.BytesIO()
+            pyarrow.parquet.write_table(pyarrow.table({'a': [i, i]}), buf)
+            self.client.put_object(Bucket='streams-bucket', Key='p/data%d.parquet' % i, Body=buf.getvalue())
+        compactor = _Compactor('streams-bucket', self.local.endpoint, self.local.credentials, False, '/p', '.*', 1.0, 1.0, False, 1, 1024 * 1024, 0.0, 'parquet', 'snappy')
+        name = self._compact(compactor)[0]
+        table = pyarrow.parquet.read_table(os.path.join(self.local.directory, 'streams-bucket', name[1:]))
+        self.assertEqual([0, 0, 1, 1], table.column('a').to_pylist())
+
+    def test_copy(self):
+        from streamsx.objectstorage._functions import _Copier
+        self.local.create_bucket('backup-bucket')
+        self.client.put_object(Bucket='streams-bucket', Key='archive/2020/small.txt', Body=b'small')
+        self.client.put_object(Bucket='streams-bucket', Key='archive/big.bin', Body=b'b' * (12 * 1024 * 1024 + 1))
+        copier = _Copier('streams-bucket', self.local.endpoint, self.local.credentials, False, 'backup-bucket', '/archive', '/backup', 5 * 1024 * 1024, 2, True)
+        with copier:
+            self.assertEqual('/backup/2020/small.txt', copier('/archive/2020/small.txt'))
+            self.assertEqual('/backup/big.bin', copier({'object_name': '/archive/big.bin', 'size': None, 'etag': None}))
+            # unchanged
+            self.assertIsNone(copier('/archive/2020/small.txt'))
+            self.assertIsNone(copier('/archive/big.bin'))
+            self.client.put_object(Bucket='streams-bucket', Key='archive/2020/small.txt', Body=b'modified')
+            self.assertEqual('/backup/2020/small.txt', copier('/archive/2020/small.txt'))
+            self.assertRaises(ValueError, copier, '/other/x.txt')
+        self.assertEqual(b'modified', self.client.get_object(Bucket='backup-bucket', Key='backup/2020/small.txt')['Body'].read())
+        self.assertEqual(12 * 1024 * 1024 + 1, self.client.head_object(Bucket='backup-bucket', Key='backup/big.bin')['ContentLength'])
+
+    def test_copy_metadata(self):
+        from streamsx.objectstorage._functions import _Copier
+        self.local.create_bucket('backup-bucket')
+        attributes = {'ContentType': 'text/csv', 'ContentEncoding': 'gzip', 'CacheControl': 'no-cache', 'Metadata': {'owner': 'streams'}}
+        self.client.put_object(Bucket='streams-bucket', Key='small.csv', Body=b'small', **attributes)
+        upload = self.client.create_multipart_upload(Bucket='streams-bucket', Key='big.csv', **attributes)
+        parts = [{'PartNumber': n, 'ETag': self.client.upload_part(Bucket='streams-bucket', Key='big.csv', UploadId=upload['UploadId'], PartNumber=n, Body=b'b' * (5 * 1024 * 1024))['ETag']} for n in (1, 2)]
+        self.client.complete_multipart_upload(Bucket='streams-bucket', Key='big.csv', UploadId=upload['UploadId'], MultipartUpload={'Parts': parts})
+        copier = _Copier('streams-bucket', self.local.endpoint, self.local.credentials, False, 'backup-bucket', None, None, 5 * 1024 * 1024, 2, True)
+        with copier:
+            for name in ['small.csv', 'big.csv']:
+                head = self.client.head_object(Bucket='streams-bucket', Key=name)
+                self.assertEqual('/' + name, copier({'object_name': '/' + name, 'size': head['ContentLength'], 'etag': head['ETag'].strip('"')}))
+                target = self.client.head_object(Bucket='backup-bucket', Key=name)
+                for attribute in ['ContentType', 'ContentEncoding', 'CacheControl']:
+                    self.assertEqual(attributes[attribute], target[attribute])
+                self.assertEqual({'owner': 'streams', 'source-etag': head['ETag'].strip('"')}, target['Metadata'])
+            # the ETag of the multipart copy differs, the source ETag in the metadata skips the second copy
+            self.client.put_object(Bucket='backup-bucket', Key='big.csv', Body=b'other', Metadata=target['Metadata'])
+            self.assertIsNone(copier('/big.csv'))
+            self.assertIsNone(copier('/small.csv'))
+
+    def test_benchmark(self):
+        from streamsx.objectstorage.tests import benchmark
+        output = os.path.join(self.local.directory, 'results.json')
+        results = benchmark.main(['--benchmarks', 'read,split_read,scan', '--tuples', '200', '--objects', '4', '--repeat', '2', '--widths', '2', '--tuple-sizes', '50', '--output', output])
+        self.assertEqual(['read', 'split_read', 'scan'], [r['benchmark'] for r in results['results']])
+        self.assertEqual(200, results['results'][0]['tuples'])
+        self.assertEqual(200, results['results'][1]['tuples'])
+        self.assertIn('p90', results['results'][0]['latency_ms'])
+        with open(output) as f:
+            changes = benchmark.compare(results, json.load(f))
+        self.assertEqual(0.0, changes[0]['tuples_per_second'])
+
 
 def _run_shell_command_line(command):
     process = Popen(command, universal_newlines=True, shell=True, stdout=PIPE, stderr=PIPE)
@@ -220,6 +984,26 @@ class TestDistributed(TestCase):
         tester.tuple_count(scanned_objects, 1, exact=False)
         tester.test(self.test_ctxtype, self.test_config, always_collect_logs=True)
 
+    @unittest.skipUnless(_cos_iam_env_var(), "COS_IAM_CREDENTIALS required")
+    def test_parquet_schema(self):
+        print ('\n---------'+str(self))
+        name = 'test_parquet_schema'
+        credentials=self._get_credentials()
+        topo = Topology(name)
+        if self.objectstorage_toolkit_home is not None:
+            streamsx.spl.toolkit.add_toolkit(topo, self.objectstorage_toolkit_home)
+        rnd=''.join(random.choice(string.digits) for _ in range(10))
+        readings = topo.source([{'id': 'sensor'+str(i), 'ts': i, 'value': i * 0.5} for i in range(100)])
+        readings.for_each(objectstorage.WriteParquet(self.bucket, self.endpoint, '/parquet'+rnd+'/r%OBJECTNUM.parquet', schema='tuple<rstring id, int64 ts, float64 value>', time_per_object=5, credentials=credentials))
+
+        scanned_objects = topo.source(objectstorage.Scan(self.bucket, self.endpoint, directory='/parquet'+rnd, credentials=credentials))
+        scanned_objects.print()
+
+        tester = Tester(topo)
+        tester.run_for(60)
+        tester.tuple_count(scanned_objects, 1, exact=False)
+        tester.test(self.test_ctxtype, self.test_config, always_collect_logs=True)
+
     @unittest.skipUnless(_cos_iam_env_var(), "COS_IAM_CREDENTIALS required")
     def test_functions(self):
         print ('\n---------'+str(self))
@@ -280,6 +1064,33 @@ class TestDistributed(TestCase):
             self.skipTest("TestDistributed is supported for tests with local minIO only")
 
 
+@unittest.skipUnless(_streams_install_env_var() and _HAS_BOTO3, "STREAMS_INSTALL and boto3 required")
+class TestStandalone(TestCase):
+    """Runs the composites in standalone mode against local object storage."""
+    def setUp(self):
+        Tester.setup_standalone(self)
+        self.objectstorage_toolkit_home = os.environ.get("COS_TOOLKIT_HOME")
+        self.local = objectstorage.LocalObjectStorage(tempfile.mkdtemp(), buckets=['streams-bucket']).start()
+
+    def tearDown(self):
+        self.local.stop()
+        shutil.rmtree(self.local.directory)
+
+    def test_write_scan_read(self):
+        topo = Topology('test_write_scan_read')
+        if self.objectstorage_toolkit_home is not None:
+            streamsx.spl.toolkit.add_toolkit(topo, self.objectstorage_toolkit_home)
+        to_cos = topo.source(['Hello', 'World!']).as_string()
+        to_cos.for_each(objectstorage.Write('streams-bucket', self.local.endpoint, '/sample/hw%OBJECTNUM.txt', credentials=self.local.credentials, ssl_enabled=False))
+        scanned = topo.source(objectstorage.Scan('streams-bucket', self.local.endpoint, directory='/sample', credentials=self.local.credentials, ssl_enabled=False))
+        r = scanned.map(objectstorage.Read('streams-bucket', self.local.endpoint, credentials=self.local.credentials, ssl_enabled=False))
+
+        tester = Tester(topo)
+        tester.run_for(30)
+        tester.tuple_count(r, 2, exact=False)
+        tester.test(self.test_ctxtype, self.test_config)
+
+
 class TestICPRemote(TestDistributed):
 
     @classmethod